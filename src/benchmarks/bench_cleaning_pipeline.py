@@ -0,0 +1,58 @@
+import argparse
+import random
+import time
+import pandas as pd
+from modules.data_manager import DataManager, STRING_DTYPE
+
+OPERATIONS = ["normalize_case", "remove_special_chars", "remove_numbers"]
+FRAGMENTS = ["Order #1234", "was", "DELAYED!!", "by", "3 days", "--", "refund?", "  ", "Thanks :)", "ticket/42"]
+
+
+def build_frame(rows, columns, dtype, seed=1):
+    rng = random.Random(seed)
+    return pd.DataFrame({
+        f"text_{i}": [" ".join(rng.choices(FRAGMENTS, k=12)) for _ in range(rows)]
+        for i in range(columns)
+    }).astype(dtype)
+
+
+def run_sequential(frame):
+    manager = DataManager()
+    manager.data = frame.copy()
+    start = time.perf_counter()
+    for col in manager.data.columns:
+        manager.normalize_case(col)
+        manager.remove_special_chars(col)
+        manager.remove_numbers(col)
+    return time.perf_counter() - start, manager.data
+
+
+def run_pipeline(frame, max_workers):
+    manager = DataManager()
+    manager.data = frame.copy()
+    start = time.perf_counter()
+    manager.apply_cleaning_pipeline(list(manager.data.columns), OPERATIONS, max_workers=max_workers)
+    return time.perf_counter() - start, manager.data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare sequential cleaning calls with the fused pipeline.")
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--columns", type=int, default=4)
+    parser.add_argument("--dtype", default=STRING_DTYPE)
+    args = parser.parse_args()
+
+    frame = build_frame(args.rows, args.columns, args.dtype)
+    sequential_time, sequential_data = run_sequential(frame)
+    fused_time, fused_data = run_pipeline(frame, max_workers=1)
+    parallel_time, parallel_data = run_pipeline(frame, max_workers=None)
+
+    print(f"Rows: {args.rows}, columns: {args.columns}, operations: {', '.join(OPERATIONS)}")
+    print(f"Sequential calls:          {sequential_time:.2f} s")
+    print(f"Fused pipeline (1 worker): {fused_time:.2f} s ({sequential_time / fused_time:.1f}x)")
+    print(f"Fused pipeline (parallel): {parallel_time:.2f} s ({sequential_time / parallel_time:.1f}x)")
+    print(f"Identical output: {sequential_data.equals(fused_data) and fused_data.equals(parallel_data)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import argparse
+import random
+import time
+import pandas as pd
+from modules.data_manager import DataManager
+
+WORDS = [
+    "the", "customers", "were", "asking", "about", "refunds", "and", "tickets", "running",
+    "late", "orders", "shipped", "boxes", "arrived", "damaged", "agents", "replied", "quickly"
+]
+
+
+def build_frame(rows, seed=1):
+    rng = random.Random(seed)
+    return pd.DataFrame({"text": [rng.choices(WORDS, k=rng.randint(5, 20)) for _ in range(rows)]})
+
+
+def time_mode(frame, mode):
+    manager = DataManager()
+    manager.data = frame.copy()
+    start = time.perf_counter()
+    manager.lemmatize_column("text", mode=mode)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-token and contextual lemmatization.")
+    parser.add_argument("--rows", type=int, default=2000)
+    args = parser.parse_args()
+
+    frame = build_frame(args.rows)
+    per_token = time_mode(frame, "per_token")
+    contextual = time_mode(frame, "contextual")
+
+    print(f"Rows: {args.rows}")
+    print(f"per_token:  {per_token:.2f} s ({args.rows / per_token:,.0f} rows/s)")
+    print(f"contextual: {contextual:.2f} s ({args.rows / contextual:,.0f} rows/s)")
+    print(f"Speedup: {per_token / contextual:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import argparse
+import time
+from modules.fasttext_manager import FastTextManager, available_cores
+
+
+def read_texts(file_path, rows):
+    texts = []
+    with open(file_path, encoding="utf-8") as file:
+        for line in file:
+            words = [word for word in line.split() if not word.startswith("__label__")]
+            texts.append(" ".join(words))
+            if len(texts) >= rows:
+                break
+    return texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-line and batched fastText prediction.")
+    parser.add_argument("model")
+    parser.add_argument("input")
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--k", type=int, default=1)
+    parser.add_argument("--processes", type=int, default=available_cores())
+    args = parser.parse_args()
+
+    manager = FastTextManager()
+    manager.load_model(args.model)
+    texts = read_texts(args.input, args.rows)
+
+    start = time.perf_counter()
+    for text in texts:
+        manager.predict(text)
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    manager.predict_batch(texts, k=args.k)
+    batch_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    manager.predict_batch(texts, k=args.k, chunk_size=max(1, len(texts) // (args.processes * 4)),
+                          processes=args.processes)
+    pool_time = time.perf_counter() - start
+
+    print(f"rows: {len(texts)}")
+    print(f"per-line predict: {loop_time:.3f}s ({len(texts) / loop_time:,.0f} docs/s)")
+    print(f"predict_batch: {batch_time:.3f}s ({len(texts) / batch_time:,.0f} docs/s)")
+    print(f"predict_batch, {args.processes} processes: {pool_time:.3f}s ({len(texts) / pool_time:,.0f} docs/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+LAZY_STARTUP = "from modules.data_manager import DataManager; DataManager()"
+EAGER_STARTUP = "from modules.data_manager import DataManager; DataManager().nlp_engine.load()"
+
+
+def time_startup(code, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True, stdout=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare startup time with lazy and eager spaCy loading.")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    lazy = time_startup(LAZY_STARTUP, args.repeats)
+    eager = time_startup(EAGER_STARTUP, args.repeats)
+
+    print(f"Median of {args.repeats} runs")
+    print(f"Lazy model loading:  {lazy:.2f} s")
+    print(f"Eager model loading: {eager:.2f} s")
+    print(f"Saved at startup:    {eager - lazy:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,12 @@
 import customtkinter as ctk
+import pandas as pd
 from ui.main_window import MainWindow
 
 def main():
+    # Undo snapshots are shallow references to the frame, which is only
+    # safe when in-place changes copy instead of writing through.
+    pd.set_option("mode.copy_on_write", True)
+
     ctk.set_appearance_mode("dark")
     ctk.set_default_color_theme("green")
 
@@ -11,6 +16,7 @@ def main():
 
     main_window = MainWindow(master=app)
     main_window.pack(fill="both", expand=True)
+    app.protocol("WM_DELETE_WINDOW", main_window.close)
 
     app.mainloop()
 
@@ -1,29 +1,101 @@
+import gzip
+import importlib.util
+import inspect
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
+import numpy as np
 import pandas as pd
-import spacy
-from spacy.lang.en.stop_words import STOP_WORDS
 import re
-
-nlp = spacy.load("en_core_web_sm")
+import threading
+from modules.dataset_stats import DatasetStats
+from modules.fingerprints import read_file_fingerprint, with_fingerprint
+from modules.near_duplicates import NearDuplicateDetector, cluster_sizes, split_leakage
+from modules.nlp_engine import DEFAULT_MODEL, get_shared_engine
+from modules.operation_journal import OperationJournal, journaled, load_recipe
+from modules.splitting import kfold_indices, split_indices
+from modules.task_executor import TaskCancelled, step_progress
+from modules.text_pipeline import apply_pipeline, compile_pipeline
+
+DEFAULT_CHUNKSIZE = 100000
+PROGRESS_CHUNK_ROWS = 10000
+PARALLEL_CLEANING_MIN_VALUES = 2000000
+WRITE_BUFFER_BYTES = 1024 * 1024
+SPLIT_SPECIAL_CHARS_PATTERN = re.compile(r'[^a-zA-Z0-9_\s]')
+SPLIT_EXCESS_SPACES_PATTERN = re.compile(r'\s{2,}')
+JSON_EXTENSIONS = ('.json', '.jsonl')
+PARQUET_EXTENSIONS = ('.parquet', '.pq')
+FEATHER_EXTENSIONS = ('.feather', '.arrow')
+PYARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+STRING_DTYPE = "string[pyarrow]" if PYARROW_AVAILABLE else "string"
+CHUNKABLE_OPERATIONS = {
+    "drop_missing_values",
+    "normalize_case",
+    "remove_excess_spaces",
+    "remove_special_chars",
+    "remove_numbers",
+    "remove_column",
+    "tokenize",
+    "remove_stopwords",
+    "lemmatize_column",
+    "convert_tokenized_to_string",
+    "convert_non_string_columns_to_string",
+    "apply_cleaning_pipeline",
+    "add_fasttext_prefix",
+}
 
 class DataManager:
-    def __init__(self):
+    def __init__(self, nlp_model=DEFAULT_MODEL):
         self.data = None
-        self.train_data = None
-        self.test_data = None
-
-    def load_data(self, file_path):
+        self.train_indices = None
+        self.validation_indices = None
+        self.test_indices = None
+        self.folds = []
+        self.stats = DatasetStats()
+        self.saved_fingerprint = None
+        self.journal = OperationJournal()
+        self.nlp_engine = get_shared_engine(nlp_model)
+
+    def set_nlp_model(self, model_name):
+        self.nlp_engine = get_shared_engine(model_name)
+
+    def warm_up_nlp(self):
+        return self.nlp_engine.warm_up()
+
+    def load_data(self, file_path, chunksize=None, progress=None):
         try:
-            if file_path.endswith('.csv'):
-                self.data = pd.read_csv(file_path)
-            elif file_path.endswith('.json'):
-                self.data = pd.read_json(file_path, lines=True)
+            saved_fingerprint = None
+            if chunksize:
+                chunks = self.iter_chunks(file_path, chunksize, progress)
+                if chunks is None:
+                    return False
+                self.data = self.concat_chunks(chunks)
             else:
-                print("Unsupported file format. Only CSV and JSON files are supported.")
-                return False
-            self.data = self.data.convert_dtypes()
-            self.data.replace("", None, inplace=True)
+                self._report(progress, 0, 1, "Reading file...")
+                if file_path.endswith('.csv'):
+                    self.data = self._read_csv(file_path)
+                elif file_path.endswith(JSON_EXTENSIONS):
+                    self.data = pd.read_json(file_path, lines=True)
+                elif file_path.endswith(PARQUET_EXTENSIONS):
+                    self.data = self._restore_token_lists(pd.read_parquet(file_path))
+                    saved_fingerprint = read_file_fingerprint(file_path)
+                elif file_path.endswith(FEATHER_EXTENSIONS):
+                    self.data = self._restore_token_lists(pd.read_feather(file_path))
+                    saved_fingerprint = read_file_fingerprint(file_path)
+                else:
+                    print("Unsupported file format. Only CSV, JSON, Parquet and Feather files are supported.")
+                    return False
+                self.data = self._normalize_frame(self.data)
+            self._reset_splits()
+            self.stats.invalidate()
+            self.saved_fingerprint = saved_fingerprint
+            self.journal.clear(source=file_path)
+            self._report(progress, 1, 1, f"{len(self.data)} rows loaded")
             print("Data loaded successfully.")
             return True
+        except TaskCancelled:
+            raise
         except ValueError as ve:
             print(f"ValueError loading data: {ve}")
             return False
@@ -34,75 +106,392 @@ class DataManager:
             print(f"Unexpected error loading data: {e}")
             return False
 
+    def iter_chunks(self, file_path, chunksize=DEFAULT_CHUNKSIZE, progress=None):
+        if file_path.endswith('.csv'):
+            open_reader = lambda handle: pd.read_csv(handle, chunksize=chunksize)
+        elif file_path.endswith(JSON_EXTENSIONS):
+            open_reader = lambda handle: pd.read_json(handle, lines=True, chunksize=chunksize)
+        else:
+            print("Unsupported file format. Only CSV and JSON files can be streamed.")
+            return None
+        return self._normalized_chunks(file_path, open_reader, progress)
+
+    def concat_chunks(self, chunks):
+        schema = {}
+        frames = [self._reconcile_chunk(chunk, schema) for chunk in chunks]
+        if not frames:
+            return pd.DataFrame()
+        # A column widened by a later chunk is cast on the chunks read before
+        # it, one chunk at a time, so concat never falls back to object.
+        frames = [self._cast_to_schema(frame, schema) for frame in frames]
+        return pd.concat(frames, ignore_index=True)
+
+    def _normalized_chunks(self, file_path, open_reader, progress=None):
+        # The file is opened here so the byte offset of the handle can be
+        # reported as progress; the parser reads ahead, so it is approximate.
+        total_bytes = os.path.getsize(file_path)
+        rows = 0
+        schema = {}
+        with open(file_path, "rb") as handle, open_reader(handle) as reader:
+            for chunk in reader:
+                rows += len(chunk)
+                self._report(progress, handle.tell(), total_bytes, f"{rows} rows loaded")
+                yield self._reconcile_chunk(self._normalize_frame(chunk), schema)
+
+    def _reconcile_chunk(self, chunk, schema):
+        # Each chunk is normalized on its own, so the same column can come
+        # out as Int64 in one chunk and Float64 or string in the next, or as
+        # Int64 when it is all missing. The schema keeps the widest dtype seen
+        # with values, and every chunk is cast to it.
+        for col, dtype in chunk.dtypes.items():
+            known = schema.get(col)
+            if dtype == known:
+                continue
+            if not chunk[col].isna().all():
+                schema[col] = dtype if known is None else self._common_dtype(known, dtype)
+        return self._cast_to_schema(chunk, schema)
+
+    def _cast_to_schema(self, frame, schema):
+        casts = {col: schema[col] for col, dtype in frame.dtypes.items() if col in schema and dtype != schema[col]}
+        return frame.astype(casts) if casts else frame
+
+    def _common_dtype(self, left, right):
+        if left == right:
+            return left
+        if pd.api.types.is_object_dtype(left) or pd.api.types.is_object_dtype(right):
+            return np.dtype(object)
+        if pd.api.types.is_integer_dtype(left) and pd.api.types.is_integer_dtype(right):
+            return pd.Int64Dtype()
+        if all(pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype) for dtype in (left, right)):
+            return pd.Float64Dtype()
+        return pd.api.types.pandas_dtype(STRING_DTYPE)
+
+    def _report(self, progress, done, total, message=None):
+        if progress is not None:
+            progress(done / total if total else 1.0, message)
+
+    def _read_csv(self, file_path):
+        if PYARROW_AVAILABLE:
+            try:
+                return pd.read_csv(file_path, engine="pyarrow")
+            except Exception as e:
+                print(f"pyarrow CSV engine failed, falling back to the default parser: {e}")
+        return pd.read_csv(file_path)
+
+    def _normalize_frame(self, frame):
+        frame = frame.convert_dtypes()
+        frame.replace("", None, inplace=True)
+        if STRING_DTYPE != "string":
+            string_columns = frame.select_dtypes(include='string').columns
+            if len(string_columns) > 0:
+                frame = frame.astype({col: STRING_DTYPE for col in string_columns})
+        return frame
+
+    def _restore_token_lists(self, frame):
+        for col in frame.select_dtypes(include='object').columns:
+            first_valid = frame[col].first_valid_index()
+            if first_valid is not None and isinstance(frame[col].loc[first_valid], np.ndarray):
+                frame[col] = frame[col].map(lambda value: value.tolist() if isinstance(value, np.ndarray) else value)
+        return frame
+
+    def save_data(self, file_path, progress=None):
+        if self.data is None:
+            print("Error: No data to save.")
+            return False
+        if not PYARROW_AVAILABLE:
+            print("Error: Saving the working dataset requires pyarrow.")
+            return False
+        try:
+            self._report(progress, 0, 1, "Writing dataset...")
+            fingerprint = self.dataset_fingerprint()
+            if file_path.endswith(PARQUET_EXTENSIONS):
+                import pyarrow.parquet as pq
+                pq.write_table(with_fingerprint(self.data, fingerprint), file_path)
+            elif file_path.endswith(FEATHER_EXTENSIONS):
+                from pyarrow import feather
+                feather.write_feather(with_fingerprint(self.data, fingerprint), file_path)
+            else:
+                print("Unsupported file format. The working dataset can be saved as Parquet or Feather.")
+                return False
+            self.saved_fingerprint = fingerprint
+            print(f"Working dataset saved to: {file_path}")
+            return True
+        except TaskCancelled:
+            raise
+        except Exception as e:
+            print(f"Error saving working dataset: {e}")
+            return False
+
+    def undo(self, progress=None):
+        return self.journal.undo(self)
+
+    def redo(self, progress=None):
+        return self.journal.redo(self)
+
+    def save_recipe(self, file_path):
+        self.journal.save_recipe(file_path)
+
+    def replay_recipe(self, recipe, file_path=None, chunksize=None, progress=None):
+        if isinstance(recipe, str):
+            recipe = load_recipe(recipe)
+        file_path = file_path or recipe.get("source")
+        if not file_path:
+            print("Error: The recipe has no source file. Pass the file to replay it on.")
+            return False
+
+        steps = recipe.get("steps", [])
+        if not self.load_data(file_path, chunksize=chunksize, progress=step_progress(progress, 0, len(steps) + 1)):
+            return False
+        for index, step in enumerate(steps, start=1):
+            self._report(progress, index, len(steps) + 1, f"Replaying {step['operation']}...")
+            operation = getattr(self, step["operation"])
+            params = dict(step["params"])
+            if "progress" in inspect.signature(operation).parameters:
+                params["progress"] = step_progress(progress, index, len(steps) + 1)
+            operation(**params)
+        self._report(progress, 1, 1, f"Replayed {len(steps)} steps on {file_path}")
+        return True
+
+    def dataset_fingerprint(self):
+        if self.data is None:
+            return None
+        return self.stats.dataset_fingerprint(self.data)
+
+    def has_unsaved_changes(self):
+        return self.data is not None and self.dataset_fingerprint() != self.saved_fingerprint
+
+    def matches_saved_file(self, file_path):
+        try:
+            return self.dataset_fingerprint() == read_file_fingerprint(file_path)
+        except Exception as e:
+            print(f"Error reading dataset fingerprint: {e}")
+            return False
+
+    def process_chunks(self, chunks, operations):
+        for name, _ in operations:
+            if name not in CHUNKABLE_OPERATIONS:
+                raise ValueError(f"Operation '{name}' cannot be applied chunk by chunk.")
+
+        worker = DataManager(self.nlp_engine.model_name)
+        worker.journal.enabled = False
+        for chunk in chunks:
+            worker.data = chunk
+            for name, kwargs in operations:
+                getattr(worker, name)(**kwargs)
+            yield worker.data
+
+    def write_chunks(self, chunks, file_path):
+        rows = 0
+        first = True
+        for chunk in chunks:
+            if file_path.endswith('.csv'):
+                chunk.to_csv(file_path, mode="w" if first else "a", header=first, index=False)
+            elif file_path.endswith(JSON_EXTENSIONS):
+                with open(file_path, "w" if first else "a", encoding="utf-8") as output_file:
+                    chunk.to_json(output_file, orient="records", lines=True, force_ascii=False)
+            else:
+                print("Unsupported file format. Only CSV and JSON files can be written in chunks.")
+                return 0
+            rows += len(chunk)
+            first = False
+        print(f"{rows} rows written to: {file_path}")
+        return rows
+
     def get_data(self):
         return self.data
 
+    def set_data(self, frame):
+        self.data = self._restore_token_lists(frame)
+        self._reset_splits()
+        self.stats.invalidate()
+        self.journal.clear(source=self.journal.source)
+
     def get_basic_info(self):
         if self.data is not None:
             return {
                 "Number of records": len(self.data),
                 "Number of columns": len(self.data.columns),
                 "Columns": list(self.data.columns),
-                "Data Types": self.data.dtypes.to_dict()
+                "Data Types": self.stats.column_dtypes(self.data)
             }
         return {}
     
     def are_all_columns_strings(self):
         if self.data is not None and not self.data.empty:
-            return all(self.data.dtypes == 'string')
+            return all(dtype == 'string' for dtype in self.stats.column_dtypes(self.data).values())
         return False
 
     def get_missing_values(self):
         if self.data is not None:
-            return self.data.isnull().sum().to_dict()
+            return self.stats.missing_counts(self.data)
         return {}
     
     def get_missing_values_count(self):
         if self.data is not None:
-            return self.data.isnull().any(axis=1).sum()
+            return int(self.stats.row_missing_mask(self.data).sum())
         return 0
 
-    def fill_missing_from_above(self):
+    def get_missing_rows(self):
         if self.data is not None:
+            return self.data[self.stats.row_missing_mask(self.data)]
+        return pd.DataFrame()
+
+    @journaled()
+    def fill_missing_from_above(self, progress=None):
+        if self.data is not None:
+            self._report(progress, 0, 1, "Filling missing values...")
             self.data.ffill(inplace=True)
+            self.stats.invalidate()
 
-    def fill_missing_from_below(self):
+    @journaled()
+    def fill_missing_from_below(self, progress=None):
         if self.data is not None:
+            self._report(progress, 0, 1, "Filling missing values...")
             self.data.bfill(inplace=True)
+            self.stats.invalidate()
 
+    @journaled("column")
     def fill_manual(self, column, index, value):
         if self.data is not None:
-            if column in self.data.columns and index < len(self.data):
+            # index is a row label: after rows are dropped the labels have
+            # gaps, and .at would append a new row for a missing label.
+            if column in self.data.columns and index in self.data.index:
                 self.data.at[index, column] = value
                 print(self.data.at[index, column])
+                position = self.data.index.get_loc(index)
+                if isinstance(position, (int, np.integer)):
+                    self.stats.update_cell(self.data, column, position)
+                else:
+                    self.stats.invalidate([column])
 
-    def drop_missing_values(self):
+    @journaled()
+    def drop_missing_values(self, progress=None):
         if self.data is not None:
-            self.data.dropna(inplace=True)
+            self._report(progress, 0, 1, "Removing missing values...")
+            self._keep_rows(~self.stats.row_missing_mask(self.data))
 
     def get_duplicates(self):
         if self.data is not None:
-            return self.data[self.data.duplicated(keep=False)]
+            return self.data[self.stats.duplicate_mask(self.data)]
         return pd.DataFrame()
 
     def get_duplicates_count(self):
         if self.data is not None:
-            return self.data.duplicated().sum()
+            return int(self.stats.duplicate_mask(self.data, keep="first").sum())
         return 0
     
-    def remove_duplicates(self):
+    @journaled()
+    def remove_duplicates(self, progress=None):
         if self.data is not None:
-            self.data.drop_duplicates(inplace=True)
-
+            self._report(progress, 0, 1, "Removing duplicate records...")
+            self._keep_rows(~self.stats.duplicate_mask(self.data, keep="first"))
+            self.stats.duplicates = {False: np.zeros(len(self.data), dtype=bool), "first": np.zeros(len(self.data), dtype=bool)}
+
+    def _keep_rows(self, keep):
+        # Same result as dropna/drop_duplicates with inplace=True, but the row
+        # mask is reused to filter the cached statistics instead of
+        # recomputing them on the smaller frame.
+        if keep.all():
+            return
+        self.data = self.data[keep]
+        self.stats.take_rows(self.data, keep)
+        self._remap_splits(keep)
+
+    def _remap_splits(self, keep):
+        # Splits hold row positions, so they are moved to the positions of
+        # the surviving rows and the removed rows are dropped from them.
+        kept = np.flatnonzero(keep)
+
+        def remap(indices):
+            if indices is None:
+                return None
+            indices = indices[keep[indices]]
+            return np.searchsorted(kept, indices)
+
+        self.train_indices = remap(self.train_indices)
+        self.validation_indices = remap(self.validation_indices)
+        self.test_indices = remap(self.test_indices)
+        self.folds = [(remap(train), remap(test)) for train, test in self.folds]
+
+    def find_near_duplicates(self, column, threshold=0.8, progress=None, **options):
+        if self.data is None or column not in self.data.columns:
+            print(f"Error: Column '{column}' not found in the data.")
+            return None
+        detector = NearDuplicateDetector(threshold=threshold, **options)
+        return detector.find_clusters(self.data[column], progress)
+
+    def get_near_duplicates(self, column, threshold=0.8, progress=None, **options):
+        labels = self.find_near_duplicates(column, threshold, progress, **options)
+        if labels is None:
+            return pd.DataFrame()
+        in_cluster = cluster_sizes(labels) > 1
+        clusters = self.data.assign(near_duplicate_cluster=self.data.index[labels])[in_cluster]
+        return clusters.sort_values("near_duplicate_cluster", kind="stable")
+
+    @journaled()
+    def remove_near_duplicates(self, column, threshold=0.8, progress=None, **options):
+        labels = self.find_near_duplicates(column, threshold, progress, **options)
+        if labels is None:
+            return 0
+        keep = labels == np.arange(len(labels))
+        self._keep_rows(keep)
+        return int((~keep).sum())
+
+    @journaled("flag_column")
+    def flag_near_duplicates(self, column, threshold=0.8, flag_column="near_duplicate_cluster", progress=None,
+                             **options):
+        labels = self.find_near_duplicates(column, threshold, progress, **options)
+        if labels is None:
+            return 0
+        in_cluster = cluster_sizes(labels) > 1
+        cluster_ids = pd.Series(self.data.index[labels], index=self.data.index).astype(object)
+        self.data[flag_column] = cluster_ids.where(in_cluster, None)
+        self.stats.invalidate([flag_column])
+        return int(in_cluster.sum())
+
+    def check_split_leakage(self, column, threshold=0.8, remove=False, progress=None, **options):
+        if self.train_indices is None or self.test_indices is None:
+            print("Error: Train or test data is not available. Make sure to split the data first.")
+            return {}
+        labels = self.find_near_duplicates(column, threshold, progress, **options)
+        if labels is None:
+            return {}
+
+        leaking, clusters = split_leakage(labels, self.train_indices, self.test_indices)
+        if self.validation_indices is not None:
+            leaking_validation, validation_clusters = split_leakage(labels, self.train_indices, self.validation_indices)
+        else:
+            leaking_validation, validation_clusters = np.empty(0, dtype=np.int64), 0
+        results = {
+            "Test rows": len(self.test_indices),
+            "Leaking test rows": len(leaking),
+            "Leaking test clusters": clusters,
+            "Leaking validation rows": len(leaking_validation),
+            "Leaking validation clusters": validation_clusters
+        }
+        if remove:
+            self.test_indices = np.setdiff1d(self.test_indices, leaking, assume_unique=True)
+            if self.validation_indices is not None:
+                self.validation_indices = np.setdiff1d(self.validation_indices, leaking_validation, assume_unique=True)
+            results["Removed rows"] = len(leaking) + len(leaking_validation)
+        return results
+
+    @journaled("column")
     def remove_column(self, column):
         if self.data is not None and column in self.data.columns:
             self.data = self.data.drop(columns=[column])
+            self.stats.drop_column(self.data, column)
             return True
         return False
 
-    def get_text_column_stats(self, column):
+    def get_text_lengths(self, column):
         if self.data is not None and column in self.data.columns and pd.api.types.is_string_dtype(self.data[column]):
-            text_lengths = self.data[column].str.len()
+            return self.stats.text_lengths(self.data, column)
+        return None
+
+    def get_text_column_stats(self, column):
+        text_lengths = self.get_text_lengths(column)
+        if text_lengths is not None:
             return {
                 "Analyzed Column": column,
                 "Average Length": text_lengths.mean(),
@@ -112,25 +501,84 @@ class DataManager:
             }
         return {}
     
+    @journaled("column")
     def normalize_case(self, column):
         if self.data is not None and column in self.data.columns and pd.api.types.is_string_dtype(self.data[column]):
             self.data[column] = self.data[column].str.lower()
+            self.stats.invalidate([column])
 
+    @journaled("column")
     def remove_excess_spaces(self, column):
         if self.data is not None and column in self.data.columns and pd.api.types.is_string_dtype(self.data[column]):
             self.data[column] = self.data[column].str.replace(r'\s{2,}', ' ', regex=True)
+            self.stats.invalidate([column])
 
 
+    @journaled("column")
     def remove_special_chars(self, column):
         if self.data is not None and column in self.data.columns and pd.api.types.is_string_dtype(self.data[column]):
             self.data[column] = self.data[column].str.replace(r'[^a-zA-Z0-9\s]', '', regex=True)
+            self.stats.invalidate([column])
             self.remove_excess_spaces(column)
         
+    @journaled("column")
     def remove_numbers(self, column):
         if self.data is not None and column in self.data.columns and pd.api.types.is_string_dtype(self.data[column]):
             self.data[column] = self.data[column].str.replace(r'\d+', '', regex=True)
+            self.stats.invalidate([column])
             self.remove_excess_spaces(column)
 
+    @journaled("columns")
+    def apply_cleaning_pipeline(self, columns, operations, max_workers=None, progress=None):
+        if self.data is None:
+            return
+        columns = [
+            col for col in columns
+            if col in self.data.columns and pd.api.types.is_string_dtype(self.data[col])
+        ]
+        if not columns or not operations:
+            return
+
+        steps = compile_pipeline(operations)
+        # With a progress callback each column is cleaned in row slices, so
+        # progress can be reported (and a cancel picked up) between slices.
+        # Results are only assigned once every column is done.
+        chunk_rows = PROGRESS_CHUNK_ROWS if progress is not None else max(len(self.data), 1)
+        parts = [
+            (col, self.data[col].iloc[start:start + chunk_rows])
+            for col in columns for start in range(0, max(len(self.data), 1), chunk_rows)
+        ]
+        total_rows = len(self.data) * len(columns)
+        self._report(progress, 0, total_rows, "Cleaning text...")
+
+        results = {col: [] for col in columns}
+        done = 0
+        # The fused pipeline cleans about a million values a second, while a
+        # spawned worker re-imports the app (customtkinter, matplotlib) before
+        # it does anything, so the pool only pays off on large frames.
+        if len(columns) > 1 and max_workers != 1 and total_rows >= PARALLEL_CLEANING_MIN_VALUES:
+            workers = min(len(columns), max_workers or os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+                cleaned = executor.map(apply_pipeline, [part for _, part in parts], repeat(steps))
+                try:
+                    for (col, part), result in zip(parts, cleaned):
+                        results[col].append(result)
+                        done += len(part)
+                        self._report(progress, done, total_rows, f"{done}/{total_rows} values cleaned")
+                except TaskCancelled:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise
+        else:
+            for col, part in parts:
+                results[col].append(apply_pipeline(part, steps))
+                done += len(part)
+                self._report(progress, done, total_rows, f"{done}/{total_rows} values cleaned")
+
+        for col in columns:
+            self.data[col] = results[col][0] if len(results[col]) == 1 else pd.concat(results[col])
+        self.stats.invalidate(columns)
+
+    @journaled()
     def convert_non_string_columns_to_string(self):
         if self.data is not None:
             datetime_columns = self.data.select_dtypes(include=['datetime64[ns]', 'datetime64']).columns
@@ -140,105 +588,269 @@ class DataManager:
                     format_str = '%Y-%m-%d %H:%M:%S'
                 else:
                     format_str = '%Y-%m-%d'
-                self.data[col] = self.data[col].dt.strftime(format_str).astype('string')
+                self.data[col] = self.data[col].dt.strftime(format_str).astype(STRING_DTYPE)
             non_string_columns = self.data.select_dtypes(exclude=['string']).columns
-            self.data[non_string_columns] = self.data[non_string_columns].astype('string')
+            self.data[non_string_columns] = self.data[non_string_columns].astype(STRING_DTYPE)
+            self.stats.invalidate(list(datetime_columns) + list(non_string_columns))
 
-    def tokenize(self, column):
+    @journaled("column")
+    def tokenize(self, column, batch_size=1000, n_process=1, progress=None):
         if self.data is not None and column in self.data.columns:
             if pd.api.types.is_string_dtype(self.data[column]):
-                self.data[column] = self.data[column].apply(
-                    lambda x: [token.text for token in nlp(x)] if pd.notnull(x) else x
-                ).astype('object')
-
-    def remove_stopwords(self, column):
+                values = self.data[column].tolist()
+                positions = [i for i, value in enumerate(values) if pd.notnull(value)]
+                for start, stop in self._progress_slices(len(positions), progress):
+                    tokenized = self.nlp_engine.tokenize(
+                        (values[i] for i in positions[start:stop]), batch_size=batch_size, n_process=n_process
+                    )
+                    for i, tokens in zip(positions[start:stop], tokenized):
+                        values[i] = tokens
+                    self._report(progress, stop, len(positions), f"{stop}/{len(positions)} rows tokenized")
+                self.data[column] = pd.Series(values, index=self.data.index, dtype='object')
+                self.stats.invalidate([column])
+
+    @journaled("column")
+    def remove_stopwords(self, column, progress=None):
         if self.data is not None and column in self.data.columns:
+            from spacy.lang.en.stop_words import STOP_WORDS
             stopwords = STOP_WORDS
-            self.data[column] = self.data[column].apply(
-                lambda tokens: [token for token in tokens if token.lower() not in stopwords] if isinstance(tokens, list) else tokens
-            )
+            series = self.data[column]
+            parts = []
+            for start, stop in self._progress_slices(len(series), progress):
+                parts.append(series.iloc[start:stop].apply(
+                    lambda tokens: [token for token in tokens if token.lower() not in stopwords] if isinstance(tokens, list) else tokens
+                ))
+                self._report(progress, stop, len(series), f"{stop}/{len(series)} rows processed")
+            if parts:
+                self.data[column] = parts[0] if len(parts) == 1 else pd.concat(parts)
+                self.stats.invalidate([column])
     
-    def lemmatize_column(self, column):
+    @journaled("column")
+    def lemmatize_column(self, column, mode="contextual", batch_size=1000, n_process=1, progress=None):
         if self.data is not None and column in self.data.columns:
-            self.data[column] = self.data[column].apply(
-                    lambda tokens: [nlp(token)[0].lemma_ for token in tokens] if tokens else tokens
+            if mode == "per_token":
+                nlp = self.nlp_engine.nlp
+                self.data[column] = self.data[column].apply(
+                        lambda tokens: [nlp(token)[0].lemma_ for token in tokens] if tokens else tokens
+                    )
+                self.stats.invalidate([column])
+                return
+
+            values = self.data[column].tolist()
+            positions = [i for i, tokens in enumerate(values) if isinstance(tokens, list) and tokens]
+            for start, stop in self._progress_slices(len(positions), progress):
+                lemmatized = self.nlp_engine.lemmatize(
+                    (values[i] for i in positions[start:stop]), batch_size=batch_size, n_process=n_process
                 )
-
-    def add_fasttext_prefix(self, label_column):
+                for i, lemmas in zip(positions[start:stop], lemmatized):
+                    values[i] = lemmas
+                self._report(progress, stop, len(positions), f"{stop}/{len(positions)} rows lemmatized")
+            self.data[column] = pd.Series(values, index=self.data.index, dtype='object')
+            self.stats.invalidate([column])
+
+    def _progress_slices(self, total, progress):
+        # Without a progress callback the whole column goes through in one
+        # call, which keeps spaCy's batching identical to the plain method.
+        step = PROGRESS_CHUNK_ROWS if progress is not None else max(total, 1)
+        return [(start, min(start + step, total)) for start in range(0, total, step)]
+
+    @journaled("label_column", extra_columns=("fasttext_line",))
+    def add_fasttext_prefix(self, label_column, progress=None):
         if self.data is not None and label_column in self.data.columns:
-            self.data[label_column] = self.data[label_column].apply(
-                lambda x: f"__label__{str(x).replace(' ', '_')}" if x is not None and not str(x).startswith("__label__") else x
+            steps = len(self.data.columns) + 1
+            self._report(progress, 0, steps, "Prefixing labels...")
+            labels = self._element_values(self.data[label_column])
+            label_text, label_present = self._cell_text(labels)
+            needs_prefix = label_present & ~label_text.str.startswith("__label__").to_numpy(dtype=bool)
+            if isinstance(self.data[label_column].dtype, pd.CategoricalDtype):
+                needs_prefix &= self.data[label_column].notna().to_numpy()
+            prefixed = ("__label__" + label_text.str.replace(" ", "_", regex=False)).to_numpy(dtype=object)
+            prefixed_labels = pd.Series(
+                np.where(needs_prefix, prefixed, labels.to_numpy(dtype=object)), index=self.data.index, dtype=object
             )
 
-            def create_fasttext_line(row):
-                label = row[label_column] if row[label_column] is not None else ""
-                other_columns = " ".join(
-                    str(row[col]) for col in self.data.columns 
-                    if col != label_column and row[col] is not None
-                )
-                return f"{label} {other_columns}".strip()
-
-            self.data["fasttext_line"] = self.data.apply(create_fasttext_line, axis=1)
+            label_text, label_present = self._cell_text(prefixed_labels)
+            lines = np.where(label_present, label_text.to_numpy(dtype=object), "").astype(object)
+
+            other_columns = np.full(len(self.data), "", dtype=object)
+            has_other = np.zeros(len(self.data), dtype=bool)
+            for step, col in enumerate(self.data.columns, start=1):
+                self._report(progress, step, steps, "Building fastText lines...")
+                if col == label_column:
+                    continue
+                text, present = self._cell_text(self.data[col])
+                text = text.to_numpy(dtype=object)
+                joined = np.where(has_other, other_columns + " " + text, text)
+                other_columns = np.where(present, joined, other_columns)
+                has_other |= present
+
+            lines = pd.Series(lines + " " + other_columns, index=self.data.index, dtype=object).str.strip()
+            self.data[label_column] = prefixed_labels
+            self.data["fasttext_line"] = lines
+            self.stats.invalidate([label_column, "fasttext_line"])
             print("FastText lines created successfully. Check the 'fasttext_line' column.")
 
-
-    def split_data(self, split_ratio):
-        train_data = self.data.sample(frac=split_ratio, random_state=1)
-        test_data = self.data.drop(train_data.index)
-        self.train_data = train_data
-        self.test_data = test_data
-
-    def get_train_data(self):
-        return self.train_data
-
-    def get_test_data(self):
-        return self.test_data
+    def _element_values(self, series):
+        # Mirrors the scalars Series.apply passes to a function, so the
+        # vectorized label prefixing matches the element-wise version.
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            return pd.Series(np.asarray(series), index=series.index, dtype=object)
+        if pd.api.types.is_extension_array_dtype(series.dtype) and series.dtype.kind in "iuf" and series.hasnans:
+            return pd.Series(series.to_numpy(), index=series.index).astype(object)
+        return series.astype(object)
+
+    def _cell_text(self, series):
+        values = series.astype(object)
+        present = np.ones(len(values), dtype=bool)
+        null_positions = np.flatnonzero(values.isna().to_numpy())
+        if len(null_positions) > 0:
+            raw = values.to_numpy()
+            present[null_positions] = [raw[i] is not None for i in null_positions]
+        return values.astype(str), present
+
+    def split_data(self, split_ratio, validation_ratio=0.0, stratify_column=None, seed=1, progress=None):
+        self._report(progress, 0, 1, "Splitting data...")
+        labels = self.data[stratify_column] if stratify_column else None
+        if validation_ratio:
+            parts = split_indices(len(self.data), [split_ratio, validation_ratio], labels, seed)
+            self.train_indices, self.validation_indices, self.test_indices = parts
+        else:
+            self.train_indices, self.test_indices = split_indices(len(self.data), [split_ratio], labels, seed)
+            self.validation_indices = None
+
+    def create_folds(self, k, stratify_column=None, seed=1):
+        labels = self.data[stratify_column] if stratify_column else None
+        self.folds = kfold_indices(len(self.data), k, labels, seed)
+        return len(self.folds)
+
+    def select_fold(self, fold):
+        self.train_indices, self.test_indices = self.folds[fold]
+        self.validation_indices = None
+
+    def _reset_splits(self):
+        self.train_indices = None
+        self.validation_indices = None
+        self.test_indices = None
+        self.folds = []
+
+    def _take(self, indices, limit=None):
+        if self.data is None or indices is None:
+            return None
+        if limit is not None:
+            indices = indices[:limit]
+        return self.data.iloc[indices]
+
+    def get_train_data(self, limit=None):
+        return self._take(self.train_indices, limit)
+
+    def get_validation_data(self, limit=None):
+        return self._take(self.validation_indices, limit)
+
+    def get_test_data(self, limit=None):
+        return self._take(self.test_indices, limit)
     
+    @journaled("column")
     def convert_tokenized_to_string(self, column):
         if self.data is not None and column in self.data.columns:
             try:
                 self.data[column] = self.data[column].apply(
                     lambda x: " ".join(x) if isinstance(x, list) else str(x)
                 )
+                self.stats.invalidate([column])
                 print(f"Column '{column}' has been converted to strings.")
             except Exception as e:
                 print(f"Error converting tokenized data to strings: {e}")
         else:
             print(f"Error: Column '{column}' not found in the data.")
 
-    def save_splits(self, train_file_path, test_file_path, text_column="fasttext_line"):
-        if self.train_data is not None and self.test_data is not None:
+    def save_splits(self, train_file_path, test_file_path, text_column="fasttext_line", chunk_size=DEFAULT_CHUNKSIZE,
+                    compress=False, validation_file_path=None, progress=None):
+        if self.data is not None and self.train_indices is not None and self.test_indices is not None:
             try:
-                if text_column not in self.train_data.columns or text_column not in self.test_data.columns:
+                if text_column not in self.data.columns:
                     print(f"Error: Column '{text_column}' not found. Run 'add_fasttext_prefix' first.")
-                    return
-                
-                def clean_text(text):
-                    if isinstance(text, list):
-                        text = " ".join(text)
-                    text = str(text)
-                    text = re.sub(r'[^a-zA-Z0-9_\s]', '', text)
-                    text = re.sub(r'\s{2,}', ' ', text)
-                    return text.strip()
-
-                self.train_data[text_column] = self.train_data[text_column].apply(clean_text)
-                self.test_data[text_column] = self.test_data[text_column].apply(clean_text)
-
-                with open(train_file_path, "w", encoding="utf-8") as train_file:
-                    train_file.write("\n".join(self.train_data[text_column].dropna()))
-                
-                with open(test_file_path, "w", encoding="utf-8") as test_file:
-                    test_file.write("\n".join(self.test_data[text_column].dropna()))
+                    return False
+
+                outputs = [(self.train_indices, train_file_path), (self.test_indices, test_file_path)]
+                if validation_file_path and self.validation_indices is not None:
+                    outputs.append((self.validation_indices, validation_file_path))
+
+                lines = self.data[text_column]
+                if progress is not None:
+                    chunk_size = min(chunk_size, PROGRESS_CHUNK_ROWS)
+                    progress = self._shared_row_progress(progress, sum(len(indices) for indices, _ in outputs), "written")
+                with ThreadPoolExecutor(max_workers=len(outputs)) as executor:
+                    futures = [
+                        executor.submit(self._write_split, lines, indices, file_path, chunk_size, compress, progress)
+                        for indices, file_path in outputs
+                    ]
+                    try:
+                        for future in futures:
+                            future.result()
+                    except TaskCancelled:
+                        for future in futures:
+                            future.cancel()
+                        executor.shutdown(wait=True)
+                        for _, file_path in outputs:
+                            if os.path.exists(file_path):
+                                os.remove(file_path)
+                        raise
 
                 print(f"Train data saved to: {train_file_path}")
                 print(f"Test data saved to: {test_file_path}")
+                if len(outputs) > 2:
+                    print(f"Validation data saved to: {validation_file_path}")
+                return True
+            except TaskCancelled:
+                raise
             except Exception as e:
                 print(f"Error saving splits: {e}")
+                return False
         else:
             print("Error: Train or test data is not available. Make sure to split the data first.")
+            return False
 
+    def _shared_row_progress(self, progress, total_rows, verb):
+        # Several writer threads add to one row count, so the reported
+        # fraction covers every split file together.
+        lock = threading.Lock()
+        done = [0]
 
+        def report(rows):
+            with lock:
+                done[0] += rows
+                self._report(progress, done[0], total_rows, f"{done[0]}/{total_rows} rows {verb}")
 
+        return report
 
-
-
+    def _write_split(self, lines, indices, file_path, chunk_size, compress, progress=None):
+        if compress or file_path.endswith(".gz"):
+            output_file = gzip.open(file_path, "wt", encoding="utf-8")
+        else:
+            output_file = open(file_path, "w", encoding="utf-8", buffering=WRITE_BUFFER_BYTES)
+
+        with output_file:
+            for start in range(0, len(indices), chunk_size):
+                chunk = self._clean_split_lines(lines.iloc[indices[start:start + chunk_size]])
+                if start > 0:
+                    output_file.write("\n")
+                output_file.write("\n".join(chunk))
+                if progress is not None:
+                    progress(len(chunk))
+
+    def _clean_split_lines(self, lines):
+        values = lines.astype(object)
+        raw = values.to_numpy()
+        list_positions = [i for i, value in enumerate(raw) if isinstance(value, list)]
+        if list_positions:
+            raw = raw.copy()
+            for i in list_positions:
+                raw[i] = " ".join(raw[i])
+            values = pd.Series(raw, index=values.index, dtype=object)
+
+        return (
+            values.astype(str)
+            .str.replace(SPLIT_SPECIAL_CHARS_PATTERN, '', regex=True)
+            .str.replace(SPLIT_EXCESS_SPACES_PATTERN, ' ', regex=True)
+            .str.strip()
+        )
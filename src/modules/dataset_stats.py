@@ -0,0 +1,142 @@
+import numpy as np
+import pandas as pd
+from modules.fingerprints import combine_hashes, dataset_digest, duplicated, hash_column
+
+
+class DatasetStats:
+    # Caches the statistics the exploration and cleaning views ask for on
+    # every refresh. Per-column results are dropped when DataManager changes
+    # that column; whole-frame results (row missing mask, duplicates, dtypes)
+    # are dropped whenever any column changes. Row filtering and single cell
+    # edits update the cached arrays in place instead of rescanning.
+    # Rows are identified by a 64-bit fingerprint combined from per-column
+    # hashes, so duplicate checks are integer operations and only the
+    # columns that changed are hashed again.
+    def __init__(self):
+        self.frame = None
+        self.missing = {}
+        self.lengths = {}
+        self.hashes = {}
+        self.row_missing = None
+        self.fingerprints = None
+        self.duplicates = {}
+        self.dtypes = None
+
+    def bind(self, frame):
+        if frame is not self.frame:
+            self.invalidate()
+            self.frame = frame
+        return frame
+
+    def invalidate(self, columns=None):
+        if columns is None:
+            self.missing.clear()
+            self.lengths.clear()
+            self.hashes.clear()
+        else:
+            for column in columns:
+                self.missing.pop(column, None)
+                self.lengths.pop(column, None)
+                self.hashes.pop(column, None)
+        self.row_missing = None
+        self.fingerprints = None
+        self.duplicates.clear()
+        self.dtypes = None
+
+    def missing_mask(self, frame, column):
+        self.bind(frame)
+        if column not in self.missing:
+            self.missing[column] = frame[column].isna().to_numpy(dtype=bool, copy=True)
+        return self.missing[column]
+
+    def missing_counts(self, frame):
+        return {column: int(self.missing_mask(frame, column).sum()) for column in frame.columns}
+
+    def row_missing_mask(self, frame):
+        self.bind(frame)
+        if self.row_missing is None:
+            mask = np.zeros(len(frame), dtype=bool)
+            for column in frame.columns:
+                mask |= self.missing_mask(frame, column)
+            self.row_missing = mask
+        return self.row_missing
+
+    def column_hashes(self, frame, column):
+        self.bind(frame)
+        if column not in self.hashes:
+            self.hashes[column] = hash_column(frame[column])
+        return self.hashes[column]
+
+    def row_fingerprints(self, frame):
+        self.bind(frame)
+        if self.fingerprints is None:
+            self.fingerprints = combine_hashes(
+                (self.column_hashes(frame, column) for column in frame.columns), len(frame)
+            )
+        return self.fingerprints
+
+    def dataset_fingerprint(self, frame):
+        return dataset_digest(frame.columns, self.row_fingerprints(frame))
+
+    def duplicate_mask(self, frame, keep=False):
+        self.bind(frame)
+        if keep not in self.duplicates:
+            self.duplicates[keep] = duplicated(self.row_fingerprints(frame), keep)
+        return self.duplicates[keep]
+
+    def text_lengths(self, frame, column):
+        self.bind(frame)
+        if column not in self.lengths:
+            self.lengths[column] = frame[column].str.len()
+        return self.lengths[column]
+
+    def column_dtypes(self, frame):
+        self.bind(frame)
+        if self.dtypes is None:
+            self.dtypes = frame.dtypes.to_dict()
+        return self.dtypes
+
+    def update_cell(self, frame, column, position):
+        if frame is not self.frame:
+            return self.bind(frame)
+
+        value = frame[column].iloc[position]
+        if column in self.missing:
+            is_missing = bool(frame[column].iloc[position:position + 1].isna().iloc[0])
+            if self.missing[column][position] != is_missing:
+                self.missing[column][position] = is_missing
+                if self.row_missing is not None:
+                    self.row_missing[position] = any(self.missing_mask(frame, col)[position] for col in frame.columns)
+        if column in self.lengths:
+            self.lengths[column].iloc[position] = len(value) if isinstance(value, str) else pd.NA
+        if column in self.hashes:
+            self.hashes[column][position] = hash_column(frame[column].iloc[position:position + 1])[0]
+            if self.fingerprints is not None:
+                self.fingerprints[position] = combine_hashes(
+                    (self.column_hashes(frame, col)[position:position + 1] for col in frame.columns), 1
+                )[0]
+        else:
+            self.fingerprints = None
+        self.duplicates.clear()
+        self.dtypes = None
+
+    def take_rows(self, frame, keep):
+        # Called after rows were removed from the frame; keep is the boolean
+        # mask of surviving rows in the previous frame.
+        if self.frame is None:
+            return self.bind(frame)
+        self.missing = {column: mask[keep] for column, mask in self.missing.items()}
+        self.lengths = {column: lengths[keep] for column, lengths in self.lengths.items()}
+        self.hashes = {column: hashes[keep] for column, hashes in self.hashes.items()}
+        if self.row_missing is not None:
+            self.row_missing = self.row_missing[keep]
+        if self.fingerprints is not None:
+            self.fingerprints = self.fingerprints[keep]
+        self.duplicates.clear()
+        self.frame = frame
+
+    def drop_column(self, frame, column):
+        if self.frame is None:
+            return self.bind(frame)
+        self.invalidate([column])
+        self.frame = frame
@@ -0,0 +1,168 @@
+import os
+import threading
+import numpy as np
+import pandas as pd
+from modules.prediction import predict_arrays
+
+DEFAULT_EVALUATION_CHUNKSIZE = 50000
+DEFAULT_THRESHOLDS = tuple(np.round(np.arange(0.0, 1.0, 0.05), 2))
+MAX_CACHED_SETS = 4
+
+_evaluation_sets = {}
+_evaluation_sets_lock = threading.Lock()
+
+
+class EvaluationSet:
+    def __init__(self, file_path, label_prefix="__label__"):
+        self.file_path = file_path
+        self.label_prefix = label_prefix
+        self.texts = []
+        self.labels = []
+        self.load()
+
+    def load(self):
+        with open(self.file_path, encoding="utf-8") as file:
+            for line in file:
+                tokens = line.split()
+                labels = [token for token in tokens if token.startswith(self.label_prefix)]
+                words = [token for token in tokens if not token.startswith(self.label_prefix)]
+                if labels:
+                    self.texts.append(" ".join(words))
+                    self.labels.append(labels)
+
+    def __len__(self):
+        return len(self.texts)
+
+    def encode_labels(self, label_index, start, stop):
+        # Flattened gold labels of the rows in [start, stop): row number and
+        # label code for every label the model knows. Unknown labels are
+        # dropped, as fastText's own test() does.
+        flat_labels = [label for labels in self.labels[start:stop] for label in labels]
+        rows = np.repeat(np.arange(start, stop), [len(labels) for labels in self.labels[start:stop]])
+        codes = label_index.get_indexer(flat_labels)
+        known = codes >= 0
+        return rows[known], codes[known]
+
+
+def get_evaluation_set(file_path, label_prefix="__label__"):
+    stat = os.stat(file_path)
+    key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size, label_prefix)
+    with _evaluation_sets_lock:
+        evaluation_set = _evaluation_sets.pop(key, None)
+        if evaluation_set is None:
+            for cached_key in [cached_key for cached_key in _evaluation_sets if cached_key[0] == key[0]]:
+                del _evaluation_sets[cached_key]
+            evaluation_set = EvaluationSet(file_path, label_prefix)
+        _evaluation_sets[key] = evaluation_set
+        while len(_evaluation_sets) > MAX_CACHED_SETS:
+            del _evaluation_sets[next(iter(_evaluation_sets))]
+        return evaluation_set
+
+
+def clear_evaluation_cache():
+    with _evaluation_sets_lock:
+        _evaluation_sets.clear()
+
+
+def _ratio(numerator, denominator):
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    return np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator > 0)
+
+
+def _f1(precision, recall):
+    return _ratio(2 * precision * recall, precision + recall)
+
+
+def evaluate(model, evaluation_set, k=1, threshold=0.0, thresholds=DEFAULT_THRESHOLDS,
+             chunk_size=DEFAULT_EVALUATION_CHUNKSIZE):
+    labels = list(model.labels)
+    label_index = pd.Index(labels)
+    label_count = len(labels)
+    k = k if k > 0 else label_count
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+
+    examples = 0
+    gold_per_label = np.zeros(label_count, dtype=np.int64)
+    predicted_per_label = np.zeros(label_count, dtype=np.int64)
+    correct_per_label = np.zeros(label_count, dtype=np.int64)
+    predicted_at_k = np.zeros(k, dtype=np.int64)
+    correct_at_k = np.zeros(k, dtype=np.int64)
+    predicted_at_threshold = np.zeros(len(thresholds), dtype=np.int64)
+    correct_at_threshold = np.zeros(len(thresholds), dtype=np.int64)
+    confusion = np.zeros(label_count * label_count, dtype=np.int64)
+
+    for start in range(0, len(evaluation_set), chunk_size):
+        stop = min(start + chunk_size, len(evaluation_set))
+        gold_rows, gold_codes = evaluation_set.encode_labels(label_index, start, stop)
+        if len(gold_rows) == 0:
+            continue
+
+        rows, first_gold_index = np.unique(gold_rows, return_index=True)
+        texts = [evaluation_set.texts[row] for row in rows]
+        predicted_labels, probs = predict_arrays(model, texts, k=k, threshold=0.0)
+        predicted_codes = label_index.get_indexer(predicted_labels.ravel()).reshape(predicted_labels.shape)
+        probs = np.nan_to_num(probs.astype(np.float64), nan=-1.0)
+
+        gold_keys = np.unique(gold_rows.astype(np.int64) * label_count + gold_codes)
+        predicted_keys = rows[:, None].astype(np.int64) * label_count + predicted_codes
+        valid = predicted_codes >= 0
+        correct = valid & np.isin(predicted_keys, gold_keys)
+
+        examples += len(rows)
+        gold_per_label += np.bincount(gold_codes, minlength=label_count)
+
+        selected = valid & (probs >= threshold)
+        predicted_per_label += np.bincount(predicted_codes[selected], minlength=label_count)
+        correct_per_label += np.bincount(predicted_codes[selected & correct], minlength=label_count)
+
+        predicted_at_k += np.cumsum(selected.sum(axis=0))
+        correct_at_k += np.cumsum((selected & correct).sum(axis=0))
+
+        top_probs = np.where(valid, probs, -1.0)
+        above = top_probs[:, :, None] >= thresholds[None, None, :]
+        predicted_at_threshold += above.sum(axis=(0, 1))
+        correct_at_threshold += (above & correct[:, :, None]).sum(axis=(0, 1))
+
+        # The confusion matrix compares each row's first known gold label with
+        # its top prediction.
+        first_gold = gold_codes[first_gold_index]
+        top_prediction = predicted_codes[:, 0]
+        matched = top_prediction >= 0
+        confusion += np.bincount(first_gold[matched] * label_count + top_prediction[matched],
+                                 minlength=label_count * label_count)
+
+    gold_total = gold_per_label.sum()
+    precision_at_k = _ratio(correct_at_k, predicted_at_k)
+    recall_at_k = _ratio(correct_at_k, gold_total)
+    label_precision = _ratio(correct_per_label, predicted_per_label)
+    label_recall = _ratio(correct_per_label, gold_per_label)
+    label_f1 = _f1(label_precision, label_recall)
+    curve_precision = _ratio(correct_at_threshold, predicted_at_threshold)
+    curve_recall = _ratio(correct_at_threshold, gold_total)
+
+    precision = float(precision_at_k[-1]) if k else 0.0
+    recall = float(recall_at_k[-1]) if k else 0.0
+    return {
+        "Number of examples": examples,
+        "Precision": precision,
+        "Recall": recall,
+        "F1": float(_f1(precision, recall)),
+        "Labels": labels,
+        "Per Label": pd.DataFrame({
+            "Label": labels,
+            "Precision": label_precision,
+            "Recall": label_recall,
+            "F1": label_f1,
+            "Support": gold_per_label
+        }),
+        "Confusion Matrix": pd.DataFrame(confusion.reshape(label_count, label_count), index=labels, columns=labels),
+        "Precision at k": {rank + 1: float(value) for rank, value in enumerate(precision_at_k)},
+        "Recall at k": {rank + 1: float(value) for rank, value in enumerate(recall_at_k)},
+        "Threshold Curve": pd.DataFrame({
+            "Threshold": thresholds,
+            "Precision": curve_precision,
+            "Recall": curve_recall,
+            "F1": _f1(curve_precision, curve_recall)
+        })
+    }
@@ -1,10 +1,68 @@
+import gzip
+import itertools
+import multiprocessing
+import os
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 import fasttext
+import numpy as np
+from modules.evaluation import evaluate, get_evaluation_set
+from modules.prediction import predict_arrays
+from modules.task_executor import TaskCancelled
+from modules.training_jobs import COMPLETED, TrainingJobQueue
+from modules.training_runner import run_training
+
+INT_PARAMS = ["epoch", "wordNgrams", "dim", "minCount", "minCountLabel", "ws", "minn", "maxn", "neg",
+              "bucket", "thread", "lrUpdateRate", "seed", "verbose"]
+FLOAT_PARAMS = ["lr", "t"]
+AUTOTUNED_PARAMS = ["lr", "dim", "ws", "epoch", "minCount", "minn", "maxn", "neg", "wordNgrams", "loss", "bucket",
+                    "lrUpdateRate", "t"]
+DEFAULT_PREDICT_CHUNKSIZE = 100000
+
+_worker_model = None
+
+
+def available_cores():
+    if hasattr(os, "sched_getaffinity"):
+        return max(1, len(os.sched_getaffinity(0)))
+    return max(1, os.cpu_count() or 1)
+
+
+def _init_predict_worker(model_path):
+    global _worker_model
+    _worker_model = fasttext.load_model(model_path)
+
+
+def _predict_in_worker(texts, k, threshold):
+    return predict_arrays(_worker_model, texts, k, threshold)
+
+
+def _open_text(file_path, mode):
+    if file_path.endswith(".gz"):
+        return gzip.open(file_path, mode + "t", encoding="utf-8")
+    return open(file_path, mode, encoding="utf-8")
+
+
+def _read_line_chunks(file_path, chunk_size):
+    with _open_text(file_path, "r") as file:
+        while True:
+            lines = [line.rstrip("\r\n") for line in itertools.islice(file, chunk_size)]
+            if not lines:
+                return
+            yield lines
+
 
 class FastTextManager:
     def __init__(self):
         self.train_file = None
         self.test_file = None
+        self.validation_file = None
         self.model = None
+        self.model_path = None
+        self.quantized_model = None
+        self.job_queue = None
 
         self.params = {
             "lr": 0.1,
@@ -12,16 +70,41 @@ class FastTextManager:
             "wordNgrams": 1,
             "dim": 100,
             "loss": "softmax",
-            "minCount": 1
+            "minCount": 1,
+            "minCountLabel": 0,
+            "ws": 5,
+            "minn": 0,
+            "maxn": 0,
+            "neg": 5,
+            "bucket": 2000000,
+            "thread": available_cores(),
+            "lrUpdateRate": 100,
+            "t": 1e-4,
+            "label": "__label__",
+            "verbose": 2
         }
 
+        self.autotune = False
+        self.autotune_duration = 300
+        self.autotune_metric = "f1"
+
         self.param_key_map = {
             "Epochs": "epoch",
             "Learning Rate": "lr",
             "Dimension": "dim",
             "Word N-Grams": "wordNgrams",
             "Loss Function": "loss",
-            "Min Count": "minCount"
+            "Min Count": "minCount",
+            "Min Label Count": "minCountLabel",
+            "Context Window": "ws",
+            "Min Char N-Gram": "minn",
+            "Max Char N-Gram": "maxn",
+            "Negatives Sampled": "neg",
+            "Buckets": "bucket",
+            "Threads": "thread",
+            "LR Update Rate": "lrUpdateRate",
+            "Sampling Threshold": "t",
+            "Label Prefix": "label"
         }
 
     def set_train_file(self, train_file_path):
@@ -30,6 +113,9 @@ class FastTextManager:
     def set_test_file(self, test_file_path):
         self.test_file = test_file_path
 
+    def set_validation_file(self, validation_file_path):
+        self.validation_file = validation_file_path
+
     def set_params(self, params):
         for user_key, value in params.items():
             if user_key in self.param_key_map:
@@ -37,44 +123,136 @@ class FastTextManager:
             else:
                 internal_key = user_key
 
-            if internal_key in ["lr"]:
+            if internal_key in FLOAT_PARAMS:
                 self.params[internal_key] = float(value)
-            elif internal_key in ["epoch", "wordNgrams", "dim", "minCount"]:
+            elif internal_key in INT_PARAMS:
                 self.params[internal_key] = int(value)
             else:
                 self.params[internal_key] = value
 
         print("Parameters saved:", self.params)
 
-    def train_model(self, lr=None, epoch=None, wordNgrams=None, dim=None, loss=None, minCount=None):
+    def set_autotune(self, enabled, duration=None, metric=None):
+        self.autotune = enabled
+        if duration is not None:
+            self.autotune_duration = int(duration)
+        if metric is not None:
+            self.autotune_metric = metric
+
+    def get_training_args(self, **overrides):
+        args = dict(self.params)
+        args.update({key: value for key, value in overrides.items() if value is not None})
+        args["input"] = self.train_file
+
+        if self.autotune:
+            # Tuning on the test file would make the reported test scores
+            # optimistic, so autotune only runs against a validation split.
+            if self.validation_file is None:
+                raise ValueError("Autotune needs a validation file. Create a validation split and select its file.")
+            for key in AUTOTUNED_PARAMS:
+                if overrides.get(key) is None:
+                    args.pop(key, None)
+            args["autotuneValidationFile"] = self.validation_file
+            args["autotuneDuration"] = self.autotune_duration
+            args["autotuneMetric"] = self.autotune_metric
+        return args
+
+    def train_model(self, **overrides):
         if self.train_file is None:
             print("Train file not set. Please provide a train file path.")
             return False
 
-        lr = lr if lr is not None else self.params["lr"]
-        epoch = epoch if epoch is not None else self.params["epoch"]
-        wordNgrams = wordNgrams if wordNgrams is not None else self.params["wordNgrams"]
-        dim = dim if dim is not None else self.params["dim"]
-        loss = loss if loss is not None else self.params["loss"]
-        minCount = minCount if minCount is not None else self.params["minCount"]
+        try:
+            self.model = fasttext.train_supervised(**self.get_training_args(**overrides))
+            self.model_path = None
+            self.quantized_model = None
+            if not self._has_labels():
+                return False
+            print("Model trained successfully.")
+            return True
+        except Exception as e:
+            print(f"Error training model: {e}")
+            return False
+
+    def train_with_progress(self, on_event=None, should_stop=None, **overrides):
+        if self.train_file is None:
+            print("Train file not set. Please provide a train file path.")
+            return False
 
         try:
-            self.model = fasttext.train_supervised(
-                input=self.train_file,
-                lr=lr,
-                epoch=epoch,
-                wordNgrams=wordNgrams,
-                dim=dim,
-                loss=loss,
-                minCount=minCount
-            )
+            args = self.get_training_args(**overrides)
+            with tempfile.TemporaryDirectory() as temp_dir:
+                model_path = os.path.join(temp_dir, "model.bin")
+                status, message = run_training(args, model_path, on_event=on_event, should_stop=should_stop)
+                print(message)
+                if status != "completed":
+                    return False
+                self.model = fasttext.load_model(model_path)
+                self.model_path = None
+                self.quantized_model = None
+            if not self._has_labels():
+                return False
             print("Model trained successfully.")
             return True
         except Exception as e:
             print(f"Error training model: {e}")
             return False
 
-    def evaluate_model(self, training=False):
+    def _has_labels(self):
+        # fastText trains without complaint on a file with no label prefixes
+        # (or a gzip file read as text) and produces a model with no labels.
+        if self.model.get_labels():
+            return True
+        label_prefix = self.params.get("label", "__label__")
+        print(f"Error training model: no '{label_prefix}' labels were found in {self.train_file}.")
+        self.model = None
+        return False
+
+    def submit_training_job(self, evaluate=True, label=None, **overrides):
+        if self.train_file is None:
+            print("Train file not set. Please provide a train file path.")
+            return None
+
+        try:
+            args = self.get_training_args(**overrides)
+        except ValueError as e:
+            print(f"Error preparing training job: {e}")
+            return None
+
+        evaluation_files = {}
+        if evaluate:
+            evaluation_files["train"] = self.train_file
+            if self.test_file is not None:
+                evaluation_files["test"] = self.test_file
+
+        if self.job_queue is None:
+            self.job_queue = TrainingJobQueue()
+        return self.job_queue.submit(args, evaluation_files=evaluation_files, label=label)
+
+    def load_job_model(self, job):
+        if job.status != COMPLETED:
+            print(f"{job.label} did not complete, there is no model to load.")
+            return False
+        try:
+            self.model = fasttext.load_model(job.model_path)
+            # The model is in memory now, so the job's file in the queue's
+            # temporary directory is not needed anymore.
+            self.model_path = None
+            self.quantized_model = None
+            print(f"Model from {job.label} loaded.")
+            return True
+        except Exception as e:
+            print(f"Error loading model from {job.label}: {e}")
+            return False
+        finally:
+            self.job_queue.discard_model(job)
+
+    def shutdown(self):
+        if self.job_queue is not None:
+            self.job_queue.shutdown()
+            self.job_queue = None
+
+    def evaluate_model(self, training=False, k=1, threshold=0.0):
         if self.model is None:
             print("No model found. Please train the model before evaluating.")
             return None
@@ -85,20 +263,18 @@ class FastTextManager:
             return None
 
         try:
-            result = self.model.test(file_path)
-            number_of_examples = result[0]
-            accuracy = result[1]
-            recall = result[2]
+            evaluation_set = get_evaluation_set(file_path, self.params.get("label", "__label__"))
+            results = evaluate(self.model, evaluation_set, k=k, threshold=threshold)
+            # test() reports precision at k, which this app has always shown as accuracy.
+            results["Accuracy"] = results["Precision"]
 
             print(f"{'Training' if training else 'Test'} evaluation results:")
-            print(f"Number of examples: {number_of_examples}")
-            print(f"Accuracy: {accuracy:.4f}")
-
-            return {
-                "Number of examples": number_of_examples,
-                "Accuracy": accuracy,
-                "Recall": recall
-            }
+            print(f"Number of examples: {results['Number of examples']}")
+            print(f"Accuracy: {results['Accuracy']:.4f}")
+            print(f"Recall: {results['Recall']:.4f}")
+            print(f"F1: {results['F1']:.4f}")
+
+            return results
         except Exception as e:
             print(f"Error evaluating model: {e}")
             return None
@@ -107,22 +283,173 @@ class FastTextManager:
         if self.model is None:
             print("No model found. Please train the model before predicting.")
             return None
-        return self.model.predict(text)
+        labels, probs = self.model.predict([text.replace("\n", " ")])
+        return tuple(labels[0]), probs[0]
+
+    def predict_batch(self, texts, k=1, threshold=0.0, chunk_size=DEFAULT_PREDICT_CHUNKSIZE, processes=1):
+        if self.model is None:
+            print("No model found. Please train the model before predicting.")
+            return None
+
+        texts = list(texts)
+        chunks = (texts[start:start + chunk_size] for start in range(0, len(texts), chunk_size))
+        results = list(self.iter_predictions(chunks, k, threshold, processes))
+        if not results:
+            return predict_arrays(self.model, [], k, threshold)
+        return np.concatenate([labels for labels, _ in results]), np.concatenate([probs for _, probs in results])
+
+    def predict_file(self, input_path, output_path, k=1, threshold=0.0, chunk_size=DEFAULT_PREDICT_CHUNKSIZE,
+                     processes=1):
+        if self.model is None:
+            print("No model found. Please train the model before predicting.")
+            return None
+
+        predicted = 0
+        with _open_text(output_path, "w") as output_file:
+            chunks = _read_line_chunks(input_path, chunk_size)
+            for labels, probs in self.iter_predictions(chunks, k, threshold, processes):
+                lines = []
+                for row_labels, row_probs in zip(labels.tolist(), probs.tolist()):
+                    lines.append(" ".join(
+                        f"{label} {prob:.6f}" for label, prob in zip(row_labels, row_probs) if label is not None
+                    ))
+                output_file.write("\n".join(lines) + "\n")
+                predicted += len(lines)
+
+        print(f"Predicted {predicted} lines from {input_path} into {output_path}")
+        return predicted
+
+    def predict_dataframe(self, data, column, k=1, threshold=0.0, prefix="predicted",
+                          chunk_size=DEFAULT_PREDICT_CHUNKSIZE, processes=1):
+        if column not in data.columns:
+            print(f"Column '{column}' not found in the data.")
+            return None
+
+        texts = data[column].astype(object).where(data[column].notna(), "").tolist()
+        predictions = self.predict_batch(texts, k, threshold, chunk_size, processes)
+        if predictions is None:
+            return None
+
+        labels, probs = predictions
+        if labels.shape[1] == 1:
+            columns = {f"{prefix}_label": labels[:, 0], f"{prefix}_probability": probs[:, 0]}
+        else:
+            columns = {}
+            for rank in range(labels.shape[1]):
+                columns[f"{prefix}_label_{rank + 1}"] = labels[:, rank]
+                columns[f"{prefix}_probability_{rank + 1}"] = probs[:, rank]
+        return data.assign(**columns)
+
+    def iter_predictions(self, text_chunks, k=1, threshold=0.0, processes=1):
+        if processes <= 1:
+            for texts in text_chunks:
+                yield predict_arrays(self.model, texts, k, threshold)
+            return
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            model_path = self.model_path
+            if model_path is None or not os.path.exists(model_path):
+                model_path = os.path.join(temp_dir, "model.bin")
+                self.model.save_model(model_path)
+
+            with ProcessPoolExecutor(max_workers=processes, initializer=_init_predict_worker, initargs=(model_path,),
+                                     mp_context=multiprocessing.get_context("spawn")) as executor:
+                pending = deque()
+                for texts in text_chunks:
+                    pending.append(executor.submit(_predict_in_worker, texts, k, threshold))
+                    if len(pending) >= processes * 2:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+
+    def quantize_preview(self, cutoff=0, qnorm=False, retrain=False, dsub=2, qout=False, progress=None):
+        if self.model is None:
+            print("No model found. Please train the model before quantizing.")
+            return None
+        if self.model.is_quantized():
+            print("The model is already quantized.")
+            return None
+        if retrain and self.train_file is None:
+            print("Retraining during quantization needs the train file.")
+            return None
+
+        try:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                original_path = os.path.join(temp_dir, "model.bin")
+                quantized_path = os.path.join(temp_dir, "model.ftz")
+                self.model.save_model(original_path)
+
+                start = time.perf_counter()
+                quantized = fasttext.load_model(original_path)
+                original_load_time = time.perf_counter() - start
+
+                self._report(progress, 0.1, "Retraining and quantizing the model..." if retrain else "Quantizing the model...")
+                quantized.quantize(
+                    input=self.train_file if retrain else None,
+                    qout=qout,
+                    cutoff=cutoff,
+                    retrain=retrain,
+                    thread=self.params["thread"],
+                    dsub=dsub,
+                    qnorm=qnorm
+                )
+                quantized.save_model(quantized_path)
+
+                start = time.perf_counter()
+                fasttext.load_model(quantized_path)
+                quantized_load_time = time.perf_counter() - start
+
+                report = {
+                    "Original": {"Size": os.path.getsize(original_path), "Load Time": original_load_time},
+                    "Quantized": {"Size": os.path.getsize(quantized_path), "Load Time": quantized_load_time}
+                }
+
+            if self.test_file is not None:
+                for step, (name, model) in enumerate((("Original", self.model), ("Quantized", quantized))):
+                    self._report(progress, 0.6 + 0.2 * step, f"Evaluating the {name.lower()} model...")
+                    number_of_examples, accuracy, recall = model.test(self.test_file)
+                    report[name].update({"Number of examples": number_of_examples, "Accuracy": accuracy,
+                                         "Recall": recall})
+
+            self.quantized_model = quantized
+            print(f"Quantized model: {report['Original']['Size']} -> {report['Quantized']['Size']} bytes")
+            return report
+        except TaskCancelled:
+            raise
+        except Exception as e:
+            print(f"Error quantizing model: {e}")
+            return None
+
+    def _report(self, progress, fraction, message):
+        if progress is not None:
+            progress(fraction, message)
+
+    def save_quantized_model(self, file_path):
+        if self.quantized_model is None:
+            raise ValueError("No quantized model to save. Please run the quantization preview first.")
+        try:
+            self.quantized_model.save_model(file_path)
+            print(f"Quantized model saved to {file_path}")
+        except Exception as e:
+            raise ValueError(f"Error saving quantized model: {e}")
 
     def save_model(self, file_path):
         if self.model is None:
             raise ValueError("No model to save. Please train the model first.")
         try:
             self.model.save_model(file_path)
+            self.model_path = file_path
             print(f"Model saved to {file_path}")
         except Exception as e:
             raise ValueError(f"Error saving model: {e}")
-        
+
     def load_model(self, file_path):
         if not file_path:
             raise ValueError("No file path provided for loading the model.")
         try:
             self.model = fasttext.load_model(file_path)
+            self.model_path = file_path
+            self.quantized_model = None
             print(f"Model loaded successfully from {file_path}")
         except Exception as e:
             raise ValueError(f"Error loading model: {e}")
@@ -0,0 +1,64 @@
+import hashlib
+import numpy as np
+import pandas as pd
+from pandas.util import hash_pandas_object
+
+FINGERPRINT_METADATA_KEY = b"fasttext_project.fingerprint"
+ROW_HASH_SEED = np.uint64(0x9E3779B97F4A7C15)
+ROW_HASH_MULTIPLIER = np.uint64(1099511628211)
+TOKEN_LIST_MARKER = "\x1e"
+TOKEN_SEPARATOR = "\x1f"
+
+
+def hash_column(series):
+    try:
+        return hash_pandas_object(series, index=False).to_numpy(dtype=np.uint64, copy=True)
+    except TypeError:
+        # Token lists are not hashable; hash them as one delimited string
+        # with a marker so ["a b"] and "a b" do not collide.
+        values = series.map(
+            lambda value: TOKEN_LIST_MARKER + TOKEN_SEPARATOR.join(map(str, value))
+            if isinstance(value, (list, tuple, np.ndarray)) else value
+        )
+        return hash_pandas_object(values.astype(object), index=False).to_numpy(dtype=np.uint64, copy=True)
+
+
+def combine_hashes(column_hashes, rows):
+    fingerprints = np.full(rows, ROW_HASH_SEED, dtype=np.uint64)
+    for hashes in column_hashes:
+        fingerprints = (fingerprints * ROW_HASH_MULTIPLIER) ^ hashes
+    return fingerprints
+
+
+def dataset_digest(columns, row_fingerprints):
+    digest = hashlib.blake2b(digest_size=16)
+    for column in columns:
+        digest.update(str(column).encode("utf-8") + b"\0")
+    digest.update(np.asarray(row_fingerprints, dtype=np.uint64).tobytes())
+    return digest.hexdigest()
+
+
+def read_file_fingerprint(file_path):
+    import pyarrow.parquet as pq
+    from pyarrow import ipc
+
+    if file_path.endswith(('.parquet', '.pq')):
+        metadata = pq.read_schema(file_path).metadata
+    else:
+        with ipc.open_file(file_path) as reader:
+            metadata = reader.schema.metadata
+    value = (metadata or {}).get(FINGERPRINT_METADATA_KEY)
+    return value.decode("ascii") if value else None
+
+
+def with_fingerprint(frame, fingerprint):
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(frame)
+    metadata = dict(table.schema.metadata or {})
+    metadata[FINGERPRINT_METADATA_KEY] = fingerprint.encode("ascii")
+    return table.replace_schema_metadata(metadata)
+
+
+def duplicated(fingerprints, keep=False):
+    return pd.Series(fingerprints).duplicated(keep=keep).to_numpy(dtype=bool)
@@ -0,0 +1,311 @@
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import sqlite3
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import fasttext
+from modules.fasttext_manager import available_cores
+
+DEFAULT_SEARCH_SPACE = {
+    "lr": [0.05, 0.1, 0.25, 0.5, 1.0],
+    "epoch": [5, 10, 25],
+    "dim": [50, 100],
+    "wordNgrams": [1, 2, 3],
+    "loss": ["softmax", "ova"],
+    "minCount": [1, 2, 5]
+}
+SEARCH_STRATEGIES = ["grid", "random", "successive_halving"]
+SEARCH_METRICS = ["f1", "precision", "recall"]
+DEFAULT_RESULTS_PATH = os.path.join(os.path.expanduser("~"), ".fasttext_project", "search_results.sqlite")
+SEARCH_COLUMNS_ADDED = {"validation_file": "TEXT", "test_precision": "REAL", "test_recall": "REAL", "test_f1": "REAL"}
+
+
+def grid_trials(space):
+    keys = list(space)
+    return [dict(zip(keys, values)) for values in itertools.product(*(space[key] for key in keys))]
+
+
+def random_trials(space, count, seed=1):
+    rng = random.Random(seed)
+    # Repeated values would make the grid look larger than the number of
+    # distinct trials, and the loop below would never finish.
+    space = {key: list(dict.fromkeys(values)) for key, values in space.items()}
+    grid_size = 1
+    for values in space.values():
+        grid_size *= len(values)
+
+    trials = []
+    seen = set()
+    while len(trials) < min(count, grid_size):
+        trial = {key: rng.choice(values) for key, values in space.items()}
+        key = tuple(sorted(trial.items()))
+        if key not in seen:
+            seen.add(key)
+            trials.append(trial)
+    return trials
+
+
+def halving_schedule(min_epoch, max_epoch, eta):
+    epochs = [max_epoch]
+    while epochs[-1] / eta >= min_epoch:
+        epochs.append(max(min_epoch, int(round(epochs[-1] / eta))))
+    return epochs[::-1]
+
+
+def run_trial(args, evaluation_file):
+    start = time.perf_counter()
+    model = fasttext.train_supervised(**args)
+    examples, precision, recall = model.test(evaluation_file)
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall > 0 else 0.0
+    return {
+        "examples": examples,
+        "precision": precision,
+        "recall": recall,
+        "f1": f1,
+        "duration": time.perf_counter() - start
+    }
+
+
+class SearchResultsStore:
+    def __init__(self, path=DEFAULT_RESULTS_PATH):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.lock = threading.Lock()
+        with self.connect() as connection:
+            connection.executescript("""
+                CREATE TABLE IF NOT EXISTS searches (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    started_at REAL NOT NULL,
+                    strategy TEXT NOT NULL,
+                    metric TEXT NOT NULL,
+                    train_file TEXT,
+                    test_file TEXT,
+                    validation_file TEXT,
+                    test_precision REAL,
+                    test_recall REAL,
+                    test_f1 REAL
+                );
+                CREATE TABLE IF NOT EXISTS trials (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    search_id INTEGER NOT NULL REFERENCES searches(id),
+                    rung INTEGER NOT NULL,
+                    params TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    examples INTEGER,
+                    precision REAL,
+                    recall REAL,
+                    f1 REAL,
+                    duration REAL,
+                    error TEXT
+                );
+                CREATE INDEX IF NOT EXISTS trials_by_search ON trials (search_id);
+            """)
+            # Result stores created before trials were scored on a
+            # validation file lack these columns.
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(searches)")}
+            for column, column_type in SEARCH_COLUMNS_ADDED.items():
+                if column not in columns:
+                    connection.execute(f"ALTER TABLE searches ADD COLUMN {column} {column_type}")
+
+    def connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def create_search(self, strategy, metric, train_file, validation_file, test_file=None):
+        with self.lock, self.connect() as connection:
+            cursor = connection.execute(
+                "INSERT INTO searches (started_at, strategy, metric, train_file, validation_file, test_file) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (time.time(), strategy, metric, train_file, validation_file, test_file)
+            )
+            return cursor.lastrowid
+
+    def set_test_result(self, search_id, result):
+        with self.lock, self.connect() as connection:
+            connection.execute(
+                "UPDATE searches SET test_precision = ?, test_recall = ?, test_f1 = ? WHERE id = ?",
+                (result["precision"], result["recall"], result["f1"], search_id)
+            )
+
+    def test_result(self, search_id):
+        with self.connect() as connection:
+            row = connection.execute(
+                "SELECT test_precision, test_recall, test_f1 FROM searches WHERE id = ?", (search_id,)
+            ).fetchone()
+        if row is None or row[2] is None:
+            return None
+        return {"precision": row[0], "recall": row[1], "f1": row[2]}
+
+    def add_trial(self, search_id, rung, params, status, result=None, error=None):
+        result = result or {}
+        with self.lock, self.connect() as connection:
+            connection.execute(
+                "INSERT INTO trials (search_id, rung, params, status, examples, precision, recall, f1, duration, error) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (search_id, rung, json.dumps(params, sort_keys=True), status, result.get("examples"),
+                 result.get("precision"), result.get("recall"), result.get("f1"), result.get("duration"), error)
+            )
+
+    def latest_search_id(self):
+        with self.connect() as connection:
+            row = connection.execute("SELECT MAX(id) FROM searches").fetchone()
+        return row[0]
+
+    def leaderboard(self, search_id=None, metric="f1", limit=20):
+        if metric not in SEARCH_METRICS:
+            raise ValueError(f"Unknown search metric '{metric}'.")
+        search_id = search_id if search_id is not None else self.latest_search_id()
+        if search_id is None:
+            return []
+
+        with self.connect() as connection:
+            rows = connection.execute(
+                f"SELECT rung, params, precision, recall, f1, duration FROM trials "
+                f"WHERE search_id = ? AND status = 'completed' ORDER BY rung DESC, {metric} DESC LIMIT ?",
+                (search_id, limit)
+            ).fetchall()
+
+        return [{
+            "rung": rung,
+            "params": json.loads(params),
+            "precision": precision,
+            "recall": recall,
+            "f1": f1,
+            "duration": duration
+        } for rung, params, precision, recall, f1, duration in rows]
+
+
+class HyperparameterSearch:
+    def __init__(self, fasttext_manager, strategy="random", space=None, trials=20, parallel=None,
+                 threads_per_trial=None, metric="f1", seed=1, eta=3, min_epoch=1, store=None):
+        if strategy not in SEARCH_STRATEGIES:
+            raise ValueError(f"Unknown search strategy '{strategy}'.")
+        if metric not in SEARCH_METRICS:
+            raise ValueError(f"Unknown search metric '{metric}'.")
+
+        self.fasttext_manager = fasttext_manager
+        self.strategy = strategy
+        self.space = space or DEFAULT_SEARCH_SPACE
+        self.trials = trials
+        self.metric = metric
+        self.seed = seed
+        self.eta = eta
+        self.min_epoch = min_epoch
+        self.store = store or SearchResultsStore()
+
+        cores = available_cores()
+        self.parallel = max(1, parallel or cores)
+        self.threads_per_trial = max(1, threads_per_trial or cores // self.parallel)
+        self.search_id = None
+
+    def initial_trials(self):
+        if self.strategy == "grid":
+            return grid_trials(self.space)
+        if self.strategy == "random":
+            return random_trials(self.space, self.trials, self.seed)
+        space = {key: values for key, values in self.space.items() if key != "epoch"}
+        return random_trials(space, self.trials, self.seed)
+
+    def epoch_schedule(self):
+        max_epoch = max(self.space.get("epoch", [self.fasttext_manager.params["epoch"]]))
+        return halving_schedule(self.min_epoch, max_epoch, self.eta)
+
+    def trial_args(self, params):
+        args = dict(self.fasttext_manager.params)
+        args.update(params)
+        args.update({"input": self.fasttext_manager.train_file, "thread": self.threads_per_trial, "verbose": 0})
+        return args
+
+    def run(self, on_trial=None, should_stop=None):
+        # Trials are ranked on the validation file; the test file is only
+        # used once, to report the score of the winning parameters.
+        if self.fasttext_manager.train_file is None or self.fasttext_manager.validation_file is None:
+            print("Hyperparameter search needs both a train and a validation file.")
+            return None
+
+        self.search_id = self.store.create_search(
+            self.strategy, self.metric, self.fasttext_manager.train_file, self.fasttext_manager.validation_file,
+            self.fasttext_manager.test_file
+        )
+        candidates = self.initial_trials()
+
+        with ProcessPoolExecutor(max_workers=self.parallel, mp_context=multiprocessing.get_context("spawn")) as executor:
+            self.search_rungs(executor, candidates, on_trial, should_stop)
+            if not (should_stop is not None and should_stop()):
+                self.report_test(executor, on_trial)
+        return self.search_id
+
+    def search_rungs(self, executor, candidates, on_trial, should_stop):
+        if self.strategy != "successive_halving":
+            self.run_rung(executor, 0, candidates, on_trial, should_stop)
+            return
+
+        # Successive halving: every rung trains the survivors for more
+        # epochs and keeps the best 1/eta of them for the next rung.
+        for rung, epoch in enumerate(self.epoch_schedule()):
+            trials = [dict(params, epoch=epoch) for params in candidates]
+            results = self.run_rung(executor, rung, trials, on_trial, should_stop)
+            if should_stop is not None and should_stop():
+                break
+            ranked = sorted(results, key=lambda item: item[1][self.metric], reverse=True)
+            keep = max(1, len(ranked) // self.eta)
+            candidates = [{key: value for key, value in params.items() if key != "epoch"}
+                          for params, _ in ranked[:keep]]
+            if len(ranked) <= 1:
+                break
+
+    def report_test(self, executor, on_trial):
+        best = self.best_params()
+        if best is None or self.fasttext_manager.test_file is None:
+            return
+        try:
+            result = executor.submit(run_trial, self.trial_args(best), self.fasttext_manager.test_file).result()
+        except Exception as e:
+            print(f"Error evaluating the best parameters on the test file: {e}")
+            return
+        self.store.set_test_result(self.search_id, result)
+        if on_trial is not None:
+            on_trial(dict(result, rung=None, params=best, status="test"))
+
+    def run_rung(self, executor, rung, trials, on_trial, should_stop):
+        validation_file = self.fasttext_manager.validation_file
+        pending = {}
+        remaining = list(trials)
+        results = []
+
+        while remaining or pending:
+            stopping = should_stop is not None and should_stop()
+            while remaining and len(pending) < self.parallel and not stopping:
+                params = remaining.pop(0)
+                pending[executor.submit(run_trial, self.trial_args(params), validation_file)] = params
+            if stopping:
+                remaining.clear()
+                for future in list(pending):
+                    if future.cancel():
+                        del pending[future]
+            if not pending:
+                break
+
+            done, _ = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+            for future in done:
+                params = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    self.store.add_trial(self.search_id, rung, params, "failed", error=str(e))
+                    trial = {"rung": rung, "params": params, "status": "failed", "error": str(e)}
+                else:
+                    self.store.add_trial(self.search_id, rung, params, "completed", result)
+                    results.append((params, result))
+                    trial = dict(result, rung=rung, params=params, status="completed")
+                if on_trial is not None:
+                    on_trial(trial)
+        return results
+
+    def best_params(self):
+        leaderboard = self.store.leaderboard(self.search_id, self.metric, limit=1)
+        return leaderboard[0]["params"] if leaderboard else None
@@ -0,0 +1,367 @@
+import argparse
+import asyncio
+import bisect
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import time
+import numpy as np
+from modules.fasttext_manager import FastTextManager
+from modules.prediction import predict_arrays
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+DEFAULT_MAX_BATCH_SIZE = 256
+DEFAULT_MAX_DELAY_MS = 2.0
+MAX_BODY_BYTES = 16 * 1024 * 1024
+LATENCY_BUCKETS = [0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5]
+BATCH_SIZE_BUCKETS = [1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024]
+
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class RequestError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class SharedHistogram:
+    # Counters live in shared memory created before the workers are forked,
+    # so /metrics reports the totals of every worker.
+    def __init__(self, name, description, buckets):
+        self.name = name
+        self.description = description
+        self.buckets = list(buckets)
+        self.counts = multiprocessing.Array("q", len(self.buckets) + 1)
+        self.total = multiprocessing.Value("d", 0.0, lock=False)
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self.counts.get_lock():
+            self.counts[index] += 1
+            self.total.value += value
+
+    def render(self):
+        with self.counts.get_lock():
+            counts = list(self.counts)
+            total = self.total.value
+
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        cumulative = 0
+        for bucket, count in zip(self.buckets + ["+Inf"], counts):
+            cumulative += count
+            lines.append(f'{self.name}_bucket{{le="{bucket}"}} {cumulative}')
+        lines.append(f"{self.name}_sum {total}")
+        lines.append(f"{self.name}_count {cumulative}")
+        return "\n".join(lines)
+
+
+class SharedCounter:
+    def __init__(self, name, description):
+        self.name = name
+        self.description = description
+        self.value = multiprocessing.Value("q", 0)
+
+    def increment(self, amount=1):
+        with self.value.get_lock():
+            self.value.value += amount
+
+    def render(self):
+        return f"# HELP {self.name} {self.description}\n# TYPE {self.name} counter\n{self.name} {self.value.value}"
+
+
+class ServerMetrics:
+    def __init__(self):
+        self.request_latency = SharedHistogram(
+            "fasttext_request_latency_seconds", "Time spent handling /predict requests.", LATENCY_BUCKETS
+        )
+        self.batch_latency = SharedHistogram(
+            "fasttext_batch_latency_seconds", "Time spent in native batched prediction.", LATENCY_BUCKETS
+        )
+        self.batch_size = SharedHistogram(
+            "fasttext_batch_size_documents", "Number of documents per native prediction call.", BATCH_SIZE_BUCKETS
+        )
+        self.requests = SharedCounter("fasttext_requests_total", "Number of /predict requests.")
+        self.documents = SharedCounter("fasttext_documents_total", "Number of documents predicted.")
+        self.errors = SharedCounter("fasttext_request_errors_total", "Number of requests answered with an error.")
+
+    def render(self):
+        metrics = [self.request_latency, self.batch_latency, self.batch_size, self.requests, self.documents,
+                   self.errors]
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+class MicroBatcher:
+    def __init__(self, model, metrics, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_delay_ms=DEFAULT_MAX_DELAY_MS):
+        self.model = model
+        self.metrics = metrics
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay_ms / 1000.0
+        self.queue = None
+        self.task = None
+
+    def start(self):
+        self.queue = asyncio.Queue()
+        self.task = asyncio.get_running_loop().create_task(self.run())
+
+    async def predict(self, texts, k=1, threshold=0.0):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((texts, k, threshold, future))
+        return await future
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            requests = [await self.queue.get()]
+            size = len(requests[0][0])
+            deadline = loop.time() + self.max_delay
+            while size < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    request = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                requests.append(request)
+                size += len(request[0])
+
+            groups = {}
+            for request in requests:
+                groups.setdefault((request[1], request[2]), []).append(request)
+            for (k, threshold), group in groups.items():
+                self.predict_group(group, k, threshold)
+
+    def predict_group(self, group, k, threshold):
+        texts = [text for request in group for text in request[0]]
+        start = time.perf_counter()
+        try:
+            labels, probs = predict_arrays(self.model, texts, k, threshold)
+        except Exception as e:
+            for request in group:
+                if not request[3].done():
+                    request[3].set_exception(e)
+            return
+        self.metrics.batch_latency.observe(time.perf_counter() - start)
+        self.metrics.batch_size.observe(len(texts))
+        self.metrics.documents.increment(len(texts))
+
+        offset = 0
+        for request in group:
+            count = len(request[0])
+            if not request[3].done():
+                request[3].set_result((labels[offset:offset + count], probs[offset:offset + count]))
+            offset += count
+
+
+class InferenceServer:
+    def __init__(self, fasttext_manager, metrics=None, max_batch_size=DEFAULT_MAX_BATCH_SIZE,
+                 max_delay_ms=DEFAULT_MAX_DELAY_MS):
+        self.fasttext_manager = fasttext_manager
+        self.metrics = metrics or ServerMetrics()
+        self.label_count = len(fasttext_manager.model.labels)
+        self.batcher = MicroBatcher(fasttext_manager.model, self.metrics, max_batch_size, max_delay_ms)
+
+    async def serve(self, sock):
+        self.batcher.start()
+        server = await asyncio.start_server(self.handle_connection, sock=sock)
+        async with server:
+            await server.serve_forever()
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request = await self.read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                status, content_type, payload = await self.route(method, path, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                self.write_response(writer, status, content_type, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except RequestError as e:
+            self.metrics.errors.increment()
+            self.write_response(writer, e.status, "application/json", json.dumps({"error": str(e)}).encode(), False)
+        finally:
+            writer.close()
+
+    async def read_request(self, reader):
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+        parts = request_line.decode("latin-1").split()
+        if len(parts) != 3:
+            raise RequestError(400, "Malformed request line.")
+        method, path, _ = parts
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise RequestError(400, "Invalid Content-Length header.")
+        if length < 0:
+            raise RequestError(400, "Invalid Content-Length header.")
+        if length > MAX_BODY_BYTES:
+            raise RequestError(413, "Request body too large.")
+        body = await reader.readexactly(length) if length else b""
+        return method, path.split("?", 1)[0], headers, body
+
+    def write_response(self, writer, status, content_type, payload, keep_alive):
+        head = (
+            f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + payload)
+
+    async def route(self, method, path, body):
+        if path == "/health":
+            payload = {"status": "ok", "model": self.fasttext_manager.model_path, "pid": os.getpid()}
+            return 200, "application/json", json.dumps(payload).encode()
+        if path == "/metrics":
+            return 200, "text/plain; version=0.0.4", self.metrics.render().encode()
+        if path != "/predict":
+            return self.error(404, f"Unknown path '{path}'.")
+        if method != "POST":
+            return self.error(405, "Use POST for /predict.")
+
+        start = time.perf_counter()
+        self.metrics.requests.increment()
+        try:
+            request = json.loads(body or b"{}")
+            if not isinstance(request, dict):
+                return self.error(400, "The request body must be a JSON object.")
+            single = "text" in request
+            texts = [request["text"]] if single else request.get("texts")
+            if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+                return self.error(400, "Provide 'text' as a string or 'texts' as a list of strings.")
+            k = int(request.get("k", 1))
+            threshold = float(request.get("threshold", 0.0))
+            if k < 1:
+                return self.error(400, "'k' must be at least 1.")
+            # No model returns more labels than it has, and predictions are
+            # allocated as (texts, k) arrays, so a huge k must not reach them.
+            k = min(k, self.label_count)
+        except (ValueError, TypeError) as e:
+            return self.error(400, f"Invalid request: {e}")
+
+        predictions = []
+        if texts:
+            try:
+                labels, probs = await self.batcher.predict(texts, k, threshold)
+            except Exception as e:
+                return self.error(500, f"Prediction failed: {e}")
+        else:
+            labels, probs = np.empty((0, 0), dtype=object), np.empty((0, 0))
+
+        for row_labels, row_probs in zip(labels.tolist(), probs.tolist()):
+            predictions.append({
+                "labels": [label for label in row_labels if label is not None],
+                "probabilities": [prob for label, prob in zip(row_labels, row_probs) if label is not None]
+            })
+        payload = predictions[0] if single else {"predictions": predictions}
+        self.metrics.request_latency.observe(time.perf_counter() - start)
+        return 200, "application/json", json.dumps(payload).encode()
+
+    def error(self, status, message):
+        self.metrics.errors.increment()
+        return status, "application/json", json.dumps({"error": message}).encode()
+
+
+def create_socket(host, port):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(1024)
+    sock.setblocking(False)
+    return sock
+
+
+def run_worker(fasttext_manager, sock, metrics, max_batch_size, max_delay_ms):
+    server = InferenceServer(fasttext_manager, metrics, max_batch_size, max_delay_ms)
+    try:
+        asyncio.run(server.serve(sock))
+    except KeyboardInterrupt:
+        pass
+
+
+def serve(model_path, host=DEFAULT_HOST, port=DEFAULT_PORT, workers=1, max_batch_size=DEFAULT_MAX_BATCH_SIZE,
+          max_delay_ms=DEFAULT_MAX_DELAY_MS):
+    # The model is loaded once in the parent. Forked workers share its pages
+    # copy-on-write, because fastText keeps the model in process memory and
+    # cannot memory-map a .bin or .ftz file.
+    fasttext_manager = FastTextManager()
+    fasttext_manager.load_model(model_path)
+    metrics = ServerMetrics()
+    sock = create_socket(host, port)
+    print(f"Serving {model_path} on http://{host}:{sock.getsockname()[1]} with {workers} worker(s)", flush=True)
+
+    if workers <= 1 or not hasattr(os, "fork"):
+        if workers > 1:
+            print("Pre-forked workers are not available on this platform, running a single worker.")
+        run_worker(fasttext_manager, sock, metrics, max_batch_size, max_delay_ms)
+        return
+
+    children = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            run_worker(fasttext_manager, sock, metrics, max_batch_size, max_delay_ms)
+            os._exit(0)
+        children.append(pid)
+
+    def stop_children(signum, frame):
+        for child in children:
+            try:
+                os.kill(child, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop_children)
+    signal.signal(signal.SIGINT, stop_children)
+    for child in children:
+        while True:
+            try:
+                os.waitpid(child, 0)
+                break
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+    sock.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a trained fastText model over HTTP/JSON.")
+    parser.add_argument("model", help="Path to a .bin or .ftz model.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=1, help="Number of pre-forked worker processes.")
+    parser.add_argument("--max-batch-size", type=int, default=DEFAULT_MAX_BATCH_SIZE,
+                        help="Maximum number of documents per native prediction call.")
+    parser.add_argument("--max-delay-ms", type=float, default=DEFAULT_MAX_DELAY_MS,
+                        help="How long to wait for more requests before predicting a batch.")
+    args = parser.parse_args()
+
+    serve(args.model, args.host, args.port, args.workers, args.max_batch_size, args.max_delay_ms)
+
+
+if __name__ == "__main__":
+    main()
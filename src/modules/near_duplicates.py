@@ -0,0 +1,221 @@
+import multiprocessing
+import os
+import re
+import shutil
+import tempfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = np.uint64(0xFFFFFFFF)
+ENTRY_DTYPE = np.dtype([("key", np.uint64), ("row", np.int64)])
+DIGITS_PATTERN = re.compile(r'\d+')
+NON_WORD_PATTERN = re.compile(r'[^\w]+')
+VERIFY_BLOCK_ROWS = 100000
+
+
+def normalize_text(text):
+    # Case, whitespace, punctuation and digit runs (timestamps, ids) are the
+    # differences scraped copies usually have, so they are folded away
+    # before shingling.
+    if not isinstance(text, str):
+        text = " ".join(text) if isinstance(text, list) else ""
+    text = DIGITS_PATTERN.sub("0", text.lower())
+    return NON_WORD_PATTERN.sub(" ", text).strip()
+
+
+def shingle_hashes(text, shingle_size):
+    text = normalize_text(text)
+    if len(text) <= shingle_size:
+        shingles = {text}
+    else:
+        shingles = {text[i:i + shingle_size] for i in range(len(text) - shingle_size + 1)}
+    # crc32 is stable across processes and runs, unlike the built-in hash().
+    return np.fromiter((zlib.crc32(shingle.encode("utf-8")) for shingle in shingles), dtype=np.uint64,
+                       count=len(shingles))
+
+
+def minhash_signatures(texts, a, b, shingle_size):
+    signatures = np.empty((len(texts), len(a)), dtype=np.uint32)
+    for i, text in enumerate(texts):
+        hashes = shingle_hashes(text, shingle_size)
+        permuted = (hashes[:, None] * a + b) % MERSENNE_PRIME
+        signatures[i] = permuted.min(axis=0) & MAX_HASH
+    return signatures
+
+
+def band_keys(signatures, bands):
+    rows_per_band = signatures.shape[1] // bands
+    keys = np.empty((len(signatures), bands), dtype=np.uint64)
+    for band in range(bands):
+        key = np.full(len(signatures), band + 1, dtype=np.uint64)
+        for column in signatures[:, band * rows_per_band:(band + 1) * rows_per_band].T:
+            key = key * np.uint64(1099511628211) + column.astype(np.uint64)
+        keys[:, band] = key
+    return keys
+
+
+def _signature_chunk(texts, a, b, shingle_size, bands):
+    signatures = minhash_signatures(texts, a, b, shingle_size)
+    # Missing and blank texts all normalize to "" and would share every band,
+    # so they are flagged and kept out of the shards as their own clusters.
+    empty = np.fromiter((not normalize_text(text) for text in texts), dtype=bool, count=len(texts))
+    return signatures, band_keys(signatures, bands), empty
+
+
+def shard_edges(shard_path, signature_path, rows, num_perm, threshold):
+    entries = np.fromfile(shard_path, dtype=ENTRY_DTYPE)
+    if len(entries) < 2:
+        return np.empty((0, 2), dtype=np.int64)
+
+    order = np.argsort(entries["key"], kind="stable")
+    keys = entries["key"][order]
+    members = entries["row"][order]
+    starts = np.r_[True, keys[1:] != keys[:-1]]
+    # Every row in a bucket is paired with the first row of that bucket, so
+    # a bucket of m rows gives m - 1 candidate pairs instead of m^2.
+    heads = members[np.flatnonzero(starts)][np.cumsum(starts) - 1]
+    candidates = heads != members
+    pairs = np.unique(np.stack([heads[candidates], members[candidates]], axis=1), axis=0)
+
+    signatures = np.memmap(signature_path, dtype=np.uint32, mode="r", shape=(rows, num_perm))
+    verified = []
+    for start in range(0, len(pairs), VERIFY_BLOCK_ROWS):
+        block = pairs[start:start + VERIFY_BLOCK_ROWS]
+        similarity = (signatures[block[:, 0]] == signatures[block[:, 1]]).mean(axis=1)
+        verified.append(block[similarity >= threshold])
+    return np.concatenate(verified) if verified else np.empty((0, 2), dtype=np.int64)
+
+
+def merge_clusters(labels, edges):
+    # Vectorized union-find: hook both ends of every edge to the smaller
+    # label and compress paths until nothing changes. Labels always point to
+    # the lowest row of the cluster, so the first occurrence is the root.
+    if len(edges) == 0:
+        return labels
+    left, right = edges[:, 0], edges[:, 1]
+    while True:
+        lowest = np.minimum(labels[labels[left]], labels[labels[right]])
+        previous = labels.copy()
+        np.minimum.at(labels, labels[left], lowest)
+        np.minimum.at(labels, labels[right], lowest)
+        while True:
+            compressed = labels[labels]
+            if np.array_equal(compressed, labels):
+                break
+            labels = compressed
+        if np.array_equal(labels, previous):
+            return labels
+
+
+class NearDuplicateDetector:
+    def __init__(self, threshold=0.8, num_perm=64, bands=16, shingle_size=5, shards=32, chunk_size=100000,
+                 max_workers=None, seed=1, work_dir=None):
+        if num_perm % bands != 0:
+            raise ValueError("num_perm must be divisible by the number of bands.")
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be between 0 and 1.")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.shingle_size = shingle_size
+        self.shards = shards
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.work_dir = work_dir
+
+        rng = np.random.default_rng(seed)
+        # a < 2^29 keeps a * crc32 below 2^61, so the permutation never
+        # overflows uint64 before the modulo.
+        self.a = rng.integers(1, 1 << 29, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+    def find_clusters(self, texts, progress=None):
+        rows = len(texts)
+        labels = np.arange(rows, dtype=np.int64)
+        if rows < 2:
+            return labels
+
+        work_dir = tempfile.mkdtemp(prefix="near_duplicates_", dir=self.work_dir)
+        try:
+            signature_path = os.path.join(work_dir, "signatures.u32")
+            shard_paths = [os.path.join(work_dir, f"shard_{shard}.bin") for shard in range(self.shards)]
+            signatures = np.memmap(signature_path, dtype=np.uint32, mode="w+", shape=(rows, self.num_perm))
+
+            # Stage 1: MinHash signatures and LSH band keys per chunk. Only the
+            # chunks in flight are held in memory; signatures go to a memmap
+            # and band keys are appended to shard files on disk.
+            chunks = [(start, min(start + self.chunk_size, rows)) for start in range(0, rows, self.chunk_size)]
+            texts = texts.iloc if hasattr(texts, "iloc") else texts
+            # The detector runs on a worker thread of the Tk app, and forking a
+            # threaded process can copy a lock that another thread holds, so
+            # workers are spawned fresh.
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context) as executor:
+                in_flight = {}
+                submitted = 0
+                try:
+                    for done, (start, stop) in enumerate(chunks, start=1):
+                        while submitted < len(chunks) and len(in_flight) < self.max_workers * 2:
+                            chunk_start, chunk_stop = chunks[submitted]
+                            in_flight[chunk_start] = executor.submit(
+                                _signature_chunk, list(texts[chunk_start:chunk_stop]), self.a, self.b,
+                                self.shingle_size, self.bands
+                            )
+                            submitted += 1
+                        chunk_signatures, keys, empty = in_flight.pop(start).result()
+                        signatures[start:stop] = chunk_signatures
+                        self._write_shards(shard_paths, keys, start, empty)
+                        self._report(progress, 0.7 * done / len(chunks), f"{stop}/{rows} rows hashed")
+                except BaseException:
+                    executor.shutdown(wait=True, cancel_futures=True)
+                    raise
+            signatures.flush()
+            del signatures
+
+            # Stage 2: each shard is bucketed and verified independently and
+            # its edges are merged straight away, so no edge list for the
+            # whole dataset is ever held in memory.
+            with ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context) as executor:
+                futures = [
+                    executor.submit(shard_edges, path, signature_path, rows, self.num_perm, self.threshold)
+                    for path in shard_paths if os.path.exists(path)
+                ]
+                try:
+                    for done, future in enumerate(futures, start=1):
+                        labels = merge_clusters(labels, future.result())
+                        self._report(progress, 0.7 + 0.3 * done / len(futures), f"{done}/{len(futures)} shards merged")
+                except BaseException:
+                    executor.shutdown(wait=True, cancel_futures=True)
+                    raise
+            return labels
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    def _write_shards(self, shard_paths, keys, offset, empty):
+        kept = np.flatnonzero(~empty)
+        keys = keys[kept]
+        entries = np.empty(keys.size, dtype=ENTRY_DTYPE)
+        entries["key"] = keys.ravel()
+        entries["row"] = np.repeat(offset + kept.astype(np.int64), keys.shape[1])
+        shard_ids = entries["key"] % np.uint64(self.shards)
+        for shard in np.unique(shard_ids):
+            with open(shard_paths[shard], "ab") as shard_file:
+                entries[shard_ids == shard].tofile(shard_file)
+
+    def _report(self, progress, fraction, message):
+        if progress is not None:
+            progress(fraction, message)
+
+
+def cluster_sizes(labels):
+    return np.bincount(labels, minlength=len(labels))[labels]
+
+
+def split_leakage(labels, train_indices, test_indices):
+    # A test row leaks when its cluster also contains a training row.
+    has_train = np.zeros(len(labels), dtype=bool)
+    has_train[labels[train_indices]] = True
+    leaking = np.asarray(test_indices)[has_train[labels[test_indices]]]
+    return leaking, int(len(np.unique(labels[leaking])))
@@ -0,0 +1,120 @@
+import threading
+from collections import OrderedDict
+
+DEFAULT_MODEL = "en_core_web_sm"
+LEMMATIZATION_PIPES = ("tok2vec", "tagger", "attribute_ruler")
+
+_shared_engines = {}
+_shared_engines_lock = threading.Lock()
+
+
+def get_shared_engine(model_name=DEFAULT_MODEL):
+    with _shared_engines_lock:
+        if model_name not in _shared_engines:
+            _shared_engines[model_name] = NlpEngine(model_name)
+        return _shared_engines[model_name]
+
+
+class LemmaCache:
+    def __init__(self, max_size=100000):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+
+    def get(self, key):
+        lemma = self.entries.get(key)
+        if lemma is not None:
+            self.entries.move_to_end(key)
+        return lemma
+
+    def put(self, key, lemma):
+        self.entries[key] = lemma
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class NlpEngine:
+    def __init__(self, model_name=DEFAULT_MODEL, lemma_cache_size=100000):
+        self.model_name = model_name
+        self.lemma_cache = LemmaCache(lemma_cache_size)
+        self._nlp = None
+        self._load_lock = threading.Lock()
+        self._warm_up_thread = None
+
+    @property
+    def nlp(self):
+        if self._nlp is None:
+            self.load()
+        return self._nlp
+
+    def is_loaded(self):
+        return self._nlp is not None
+
+    def load(self):
+        with self._load_lock:
+            if self._nlp is None:
+                import spacy
+                try:
+                    self._nlp = spacy.load(self.model_name)
+                    print(f"spaCy model '{self.model_name}' loaded.")
+                except OSError as e:
+                    print(f"Could not load spaCy model '{self.model_name}', using the tokenizer-only English pipeline: {e}")
+                    self._nlp = spacy.blank("en")
+        return self._nlp
+
+    def warm_up(self):
+        if self._nlp is None and self._warm_up_thread is None:
+            self._warm_up_thread = threading.Thread(target=self.load, daemon=True)
+            self._warm_up_thread.start()
+        return self._warm_up_thread
+
+    def tokenize(self, texts, batch_size=1000, n_process=1):
+        nlp = self.nlp
+        texts = list(texts)
+        if n_process != 1:
+            try:
+                docs = nlp.pipe(
+                    texts,
+                    batch_size=batch_size,
+                    n_process=n_process,
+                    disable=nlp.pipe_names
+                )
+                return [[token.text for token in doc] for doc in docs]
+            except Exception as e:
+                print(f"Multi-process tokenization failed, falling back to tokenizer-only path: {e}")
+
+        return [[token.text for token in doc] for doc in nlp.tokenizer.pipe(texts, batch_size=batch_size)]
+
+    def lemmatize(self, token_lists, batch_size=1000, n_process=1):
+        from spacy.tokens import Doc
+
+        nlp = self.nlp
+        if "lemmatizer" not in nlp.pipe_names:
+            print("The loaded spaCy model has no lemmatizer. Tokens are left unchanged.")
+            return [list(tokens) for tokens in token_lists]
+
+        lemmatizer = nlp.get_pipe("lemmatizer")
+        disabled = [name for name in nlp.pipe_names if name not in LEMMATIZATION_PIPES]
+        docs = (Doc(nlp.vocab, words=list(tokens)) for tokens in token_lists)
+
+        results = []
+        for doc in nlp.pipe(docs, batch_size=batch_size, n_process=n_process, disable=disabled):
+            lemmas = []
+            for token in doc:
+                if token.lemma != 0:
+                    lemmas.append(token.lemma_)
+                    continue
+                key = (token.text, token.pos_)
+                lemma = self.lemma_cache.get(key)
+                if lemma is None:
+                    lemma = lemmatizer.lemmatize(token)[0]
+                    self.lemma_cache.put(key, lemma)
+                lemmas.append(lemma)
+            results.append(lemmas)
+        return results
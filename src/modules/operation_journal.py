@@ -0,0 +1,279 @@
+import functools
+import inspect
+import json
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+DEFAULT_JOURNAL_BUDGET_BYTES = 1024 * 1024 * 1024
+RECIPE_VERSION = 1
+SIZE_SAMPLE_ROWS = 1000
+
+JOURNALED_OPERATIONS = set()
+
+
+def journaled(*column_params, extra_columns=()):
+    # Records a DataManager mutation in its journal. column_params name the
+    # arguments holding the columns the operation changes; without them the
+    # whole frame is snapshotted (operations that drop rows or touch every
+    # column).
+    def decorate(method):
+        signature = inspect.signature(method)
+        JOURNALED_OPERATIONS.add(method.__name__)
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            journal = self.journal
+            if not journal.enabled or journal.depth > 0 or self.data is None:
+                return method(self, *args, **kwargs)
+
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            params = {name: value for name, value in bound.arguments.items() if name not in ("self", "progress")}
+
+            columns = None
+            if column_params:
+                columns = []
+                for name in column_params:
+                    value = params[name]
+                    columns.extend([value] if isinstance(value, str) else list(value))
+                columns.extend(extra_columns)
+
+            snapshot = Snapshot.capture(self.data, columns, splits=split_state(self) if columns is None else None)
+            journal.depth += 1
+            try:
+                result = method(self, *args, **kwargs)
+            finally:
+                journal.depth -= 1
+            journal.record(method.__name__, params, snapshot)
+            return result
+
+        return wrapper
+
+    return decorate
+
+
+def split_state(manager):
+    return manager.train_indices, manager.validation_indices, manager.test_indices, list(manager.folds)
+
+
+def restore_split_state(manager, state):
+    manager.train_indices, manager.validation_indices, manager.test_indices, folds = state
+    manager.folds = list(folds)
+
+
+def estimate_bytes(series):
+    size = int(series.memory_usage(index=False, deep=False))
+    if series.dtype == object and len(series) > 0:
+        # deep=True walks every Python object; a sample is close enough for
+        # budgeting and stays cheap on millions of rows.
+        sample = series.iloc[:SIZE_SAMPLE_ROWS]
+        per_row = sample.memory_usage(index=False, deep=True) / len(sample)
+        size = int(per_row * len(series))
+    return size
+
+
+def to_json_value(value):
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        return float(value)
+    if isinstance(value, (np.ndarray, pd.Index, tuple)):
+        return [to_json_value(item) for item in list(value)]
+    if isinstance(value, list):
+        return [to_json_value(item) for item in value]
+    return value
+
+
+class Snapshot:
+    def __init__(self, frame=None, columns=None, order=None, splits=None):
+        self.frame = frame
+        self.columns = columns
+        self.order = order
+        self.splits = splits
+        self.size = 0
+        self.measure()
+
+    @classmethod
+    def capture(cls, frame, columns=None, splits=None):
+        # With copy-on-write (the app turns it on) a later in-place change
+        # copies the data it touches instead of writing through, so shallow
+        # references are enough. Without it the snapshot has to be a copy.
+        deep = not pd.get_option("mode.copy_on_write")
+        # Frame snapshots also hold the split indices: they are row
+        # positions and only match the rows of the frame they came with.
+        if columns is None:
+            return cls(frame=frame.copy(deep=deep), splits=splits)
+        return cls(
+            columns={column: frame[column].copy(deep=deep) if column in frame.columns else None for column in columns},
+            order=list(frame.columns)
+        )
+
+    def measure(self):
+        if self.frame is not None:
+            self.size = sum(estimate_bytes(self.frame[column]) for column in self.frame.columns)
+        elif self.columns is not None:
+            self.size = sum(estimate_bytes(series) for series in self.columns.values() if series is not None)
+
+    def swap(self, manager):
+        # Puts the snapshot back into the manager and keeps the state it
+        # replaced, so the same call undoes and redoes the step.
+        if self.frame is not None:
+            self.frame, manager.data = manager.data, self.frame
+            current_splits = split_state(manager)
+            if self.splits is not None:
+                restore_split_state(manager, self.splits)
+            else:
+                manager._reset_splits()
+            self.splits = current_splits
+            manager.stats.invalidate()
+        else:
+            current = Snapshot.capture(manager.data, list(self.columns))
+            data = manager.data
+            for column, series in self.columns.items():
+                if series is None:
+                    if column in data.columns:
+                        data = data.drop(columns=[column])
+                else:
+                    data[column] = series
+            order = [column for column in self.order if column in data.columns]
+            order += [column for column in data.columns if column not in order]
+            if order != list(data.columns):
+                data = data[order]
+            manager.data = data
+            manager.stats.invalidate(list(self.columns))
+            self.columns, self.order = current.columns, current.order
+        self.measure()
+
+
+class JournalEntry:
+    def __init__(self, entry_id, operation, params, snapshot):
+        self.entry_id = entry_id
+        self.operation = operation
+        self.params = params
+        self.snapshot = snapshot
+
+    def to_step(self):
+        return {"operation": self.operation, "params": {key: to_json_value(value) for key, value in self.params.items()}}
+
+
+class OperationJournal:
+    def __init__(self, budget_bytes=DEFAULT_JOURNAL_BUDGET_BYTES):
+        self.budget_bytes = budget_bytes
+        self.enabled = True
+        self.entries = []
+        self.cursor = 0
+        self.depth = 0
+        self.source = None
+        self._next_id = 0
+        self._recent = OrderedDict()
+
+    def clear(self, source=None):
+        self.entries = []
+        self.cursor = 0
+        self.source = source
+        self._recent.clear()
+
+    def record(self, operation, params, snapshot):
+        for entry in self.entries[self.cursor:]:
+            self._recent.pop(entry.entry_id, None)
+        del self.entries[self.cursor:]
+
+        self._next_id += 1
+        entry = JournalEntry(self._next_id, operation, params, snapshot)
+        self.entries.append(entry)
+        self.cursor = len(self.entries)
+        self._touch(entry)
+        self._enforce_budget()
+        return entry
+
+    def can_undo(self):
+        return self.cursor > 0 and self.entries[self.cursor - 1].snapshot is not None
+
+    def can_redo(self):
+        return self.cursor < len(self.entries)
+
+    def undo(self, manager):
+        if self.cursor == 0:
+            print("Nothing to undo.")
+            return False
+        entry = self.entries[self.cursor - 1]
+        if entry.snapshot is None:
+            print(f"Cannot undo '{entry.operation}': its snapshot was evicted to stay within the memory budget.")
+            return False
+        entry.snapshot.swap(manager)
+        self.cursor -= 1
+        self._touch(entry)
+        self._enforce_budget()
+        return True
+
+    def redo(self, manager):
+        if self.cursor == len(self.entries):
+            print("Nothing to redo.")
+            return False
+        entry = self.entries[self.cursor]
+        if entry.snapshot is not None:
+            entry.snapshot.swap(manager)
+        else:
+            # The redo state was evicted, so the step is run again and a
+            # fresh snapshot is taken for undoing it.
+            scope = self._scope(entry)
+            entry.snapshot = Snapshot.capture(
+                manager.data, scope, splits=split_state(manager) if scope is None else None
+            )
+            self.depth += 1
+            try:
+                getattr(manager, entry.operation)(**entry.params)
+            finally:
+                self.depth -= 1
+        self.cursor += 1
+        self._touch(entry)
+        self._enforce_budget()
+        return True
+
+    def memory_usage(self):
+        return sum(entry.snapshot.size for entry in self.entries if entry.snapshot is not None)
+
+    def recipe(self):
+        return {
+            "version": RECIPE_VERSION,
+            "source": self.source,
+            "steps": [entry.to_step() for entry in self.entries[:self.cursor]]
+        }
+
+    def save_recipe(self, file_path):
+        with open(file_path, "w", encoding="utf-8") as recipe_file:
+            json.dump(self.recipe(), recipe_file, indent=2)
+        print(f"Recipe with {self.cursor} steps saved to: {file_path}")
+
+    def _scope(self, entry):
+        if entry.snapshot is not None and entry.snapshot.columns is not None:
+            return list(entry.snapshot.columns)
+        return None
+
+    def _touch(self, entry):
+        self._recent[entry.entry_id] = entry
+        self._recent.move_to_end(entry.entry_id)
+
+    def _enforce_budget(self):
+        # Least recently used snapshots go first; their steps stay in the
+        # recipe, but they can no longer be undone by a swap.
+        total = self.memory_usage()
+        for entry_id in list(self._recent):
+            if total <= self.budget_bytes or len(self._recent) <= 1:
+                break
+            entry = self._recent.pop(entry_id)
+            if entry.snapshot is not None:
+                total -= entry.snapshot.size
+                entry.snapshot = None
+
+
+def load_recipe(file_path):
+    with open(file_path, encoding="utf-8") as recipe_file:
+        recipe = json.load(recipe_file)
+    if recipe.get("version") != RECIPE_VERSION:
+        raise ValueError(f"Unsupported recipe version: {recipe.get('version')}")
+    for step in recipe.get("steps", []):
+        if step.get("operation") not in JOURNALED_OPERATIONS:
+            raise ValueError(f"Unknown recipe operation: {step.get('operation')}")
+    return recipe
@@ -0,0 +1,350 @@
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from modules.data_manager import CHUNKABLE_OPERATIONS, DEFAULT_CHUNKSIZE, PYARROW_AVAILABLE, DataManager
+from modules.fasttext_manager import FastTextManager
+from modules.nlp_engine import DEFAULT_MODEL
+from modules.operation_journal import JOURNALED_OPERATIONS, RECIPE_VERSION, to_json_value
+from modules.stage_cache import DEFAULT_CACHE_BYTES, DEFAULT_CACHE_DIR, StageCache, library_versions, stage_key
+
+EXIT_OK = 0
+EXIT_STAGE_FAILED = 1
+EXIT_INVALID_RECIPE = 2
+EXIT_INTERRUPTED = 130
+
+STREAM_EXTENSIONS = ('.csv', '.json', '.jsonl')
+DATA_OPERATIONS = JOURNALED_OPERATIONS | {
+    "split_data",
+    "create_folds",
+    "select_fold",
+    "save_splits",
+    "save_data",
+    "write_chunks",
+}
+MODEL_OPERATIONS = {
+    "set_params",
+    "set_autotune",
+    "set_train_file",
+    "set_test_file",
+    "set_validation_file",
+    "train_model",
+    "train_with_progress",
+    "evaluate_model",
+    "load_model",
+    "save_model",
+    "quantize_preview",
+    "save_quantized_model",
+    "predict_file",
+}
+# These report failure by returning None instead of False.
+NONE_ON_FAILURE = {"evaluate_model", "quantize_preview", "predict_file"}
+# Model steps that read the split files written earlier in the recipe.
+SPLIT_READING_OPERATIONS = {"train_model", "train_with_progress", "evaluate_model", "quantize_preview"}
+
+_chunk_worker = None
+
+
+def _init_chunk_worker(nlp_model):
+    global _chunk_worker
+    _chunk_worker = DataManager(nlp_model)
+    _chunk_worker.journal.enabled = False
+
+
+def _process_chunk(chunk, operations):
+    return next(_chunk_worker.process_chunks([chunk], operations))
+
+
+def load_pipeline(file_path):
+    with open(file_path, encoding="utf-8") as recipe_file:
+        recipe = json.load(recipe_file)
+    validate_pipeline(recipe)
+    return recipe
+
+
+def validate_pipeline(recipe):
+    # Pipelines use the recipe format saved from the GUI journal. Steps run
+    # on DataManager unless they set "manager": "fasttext".
+    if recipe.get("version") != RECIPE_VERSION:
+        raise ValueError(f"Unsupported recipe version: {recipe.get('version')}")
+    for step in recipe.get("steps", []):
+        manager = step.get("manager", "data")
+        operations = MODEL_OPERATIONS if manager == "fasttext" else DATA_OPERATIONS
+        if manager not in ("data", "fasttext"):
+            raise ValueError(f"Unknown recipe manager: {manager}")
+        if step.get("operation") not in operations:
+            raise ValueError(f"Unknown {manager} operation: {step.get('operation')}")
+        if not isinstance(step.get("params", {}), dict):
+            raise ValueError(f"Parameters of '{step['operation']}' must be an object.")
+
+    # fastText reads its input files as plain text, so gzip splits cannot be
+    # trained or evaluated on.
+    steps = recipe.get("steps", [])
+    reads_splits = any(
+        step.get("manager") == "fasttext" and step["operation"] in SPLIT_READING_OPERATIONS for step in steps
+    )
+    for step in steps:
+        if reads_splits and step["operation"] == "save_splits" and _compressed_splits(step.get("params", {})):
+            raise ValueError("Compressed splits cannot be used for training. Remove 'compress' and '.gz' from "
+                             "'save_splits' or train on uncompressed files.")
+
+
+def _compressed_splits(params):
+    paths = [params.get("train_file_path"), params.get("test_file_path"), params.get("validation_file_path")]
+    return bool(params.get("compress")) or any(path and path.endswith(".gz") for path in paths)
+
+
+class PipelineRunner:
+    def __init__(self, recipe, source=None, chunksize=None, workers=1, data_manager=None, fasttext_manager=None,
+                 cache=None):
+        self.recipe = recipe
+        self.source = source or recipe.get("source")
+        self.chunksize = chunksize or recipe.get("chunksize")
+        self.workers = max(1, workers or 1)
+        self.data_manager = data_manager or DataManager(recipe.get("nlp_model", DEFAULT_MODEL))
+        self.fasttext_manager = fasttext_manager or FastTextManager()
+        self.data_manager.journal.enabled = False
+        self.cache = cache
+        self.stage_keys = []
+        self.timings = []
+
+    def run(self):
+        steps = list(self.recipe.get("steps", []))
+        if not self.source:
+            print("Error: The recipe has no source file. Pass one with --source.")
+            return EXIT_INVALID_RECIPE
+
+        started = time.perf_counter()
+        try:
+            self.stage_keys = self._stage_keys(steps) if self.cache is not None else []
+            position = self._load_cached(steps)
+            if position is None:
+                position = self._load_source(steps)
+                if position is None:
+                    return EXIT_STAGE_FAILED
+
+            for position in range(position, len(steps)):
+                step = steps[position]
+                if not self._run_stage(step["operation"], self._run_step, step):
+                    return EXIT_STAGE_FAILED
+                self._store(position + 1)
+            return EXIT_OK
+        except KeyboardInterrupt:
+            print("Pipeline interrupted.")
+            return EXIT_INTERRUPTED
+        finally:
+            print(f"Pipeline finished in {time.perf_counter() - started:.2f}s")
+
+    def _run_stage(self, name, function, *args):
+        print(f"[{len(self.timings) + 1}] {name}...", flush=True)
+        started = time.perf_counter()
+        timing = {"stage": name, "status": "completed"}
+        try:
+            result = function(*args)
+            if result is False:
+                timing["status"] = "failed"
+            elif isinstance(result, dict):
+                timing["result"] = {key: value for key, value in result.items() if isinstance(value, (int, float))}
+        except KeyboardInterrupt:
+            timing["status"] = "interrupted"
+            raise
+        except Exception as e:
+            print(f"Error in stage '{name}': {e}")
+            timing["status"] = "failed"
+        finally:
+            timing["seconds"] = round(time.perf_counter() - started, 4)
+            if self.data_manager.data is not None:
+                timing["rows"] = len(self.data_manager.data)
+            self.timings.append(timing)
+            print(f"[{len(self.timings)}] {name} {timing['status']} in {timing['seconds']:.2f}s", flush=True)
+        return timing["status"] == "completed"
+
+    def _load_source(self, steps):
+        streamed = self._streamed_prefix(steps)
+        if not streamed:
+            if not self._run_stage("load_data", self._load):
+                return None
+            self._store(0)
+            return 0
+
+        if not self._run_stage("stream", self._stream, steps[:streamed], steps[streamed:streamed + 1]):
+            return None
+        if streamed < len(steps) and steps[streamed]["operation"] == "write_chunks":
+            return streamed + 1
+        self._store(streamed)
+        return streamed
+
+    def _stage_keys(self, steps):
+        # keys[i] names the frame after the first i steps. Only the leading
+        # steps that just transform the frame are cached; splits, files
+        # and the model are not part of a cached frame.
+        if not os.path.exists(self.source):
+            return []
+        versions = library_versions(self.data_manager.nlp_engine.model_name)
+        chunksize = self.chunksize if self.source.endswith(STREAM_EXTENSIONS) else None
+        keys = [stage_key(self.cache.file_digest(self.source), "load_data", {"chunksize": chunksize}, versions)]
+        for step in steps:
+            if step.get("manager", "data") != "data" or step["operation"] not in JOURNALED_OPERATIONS:
+                break
+            params = {key: to_json_value(value) for key, value in step.get("params", {}).items()}
+            keys.append(stage_key(keys[-1], step["operation"], params, versions))
+        return keys
+
+    def _load_cached(self, steps):
+        for position in reversed(range(len(self.stage_keys))):
+            if not self.cache.contains(self.stage_keys[position]):
+                continue
+            started = time.perf_counter()
+            frame = self.cache.get(self.stage_keys[position])
+            if frame is None:
+                continue
+            self.data_manager.set_data(frame)
+            name = steps[position - 1]["operation"] if position else "load_data"
+            timing = {"stage": name, "status": "cached", "steps": position,
+                      "seconds": round(time.perf_counter() - started, 4), "rows": len(frame)}
+            self.timings.append(timing)
+            print(f"[{len(self.timings)}] {name} loaded from cache ({position} steps skipped) "
+                  f"in {timing['seconds']:.2f}s", flush=True)
+            return position
+        return None
+
+    def _store(self, position):
+        if position >= len(self.stage_keys) or self.data_manager.data is None:
+            return
+        if not self.cache.contains(self.stage_keys[position]):
+            try:
+                self.cache.put(self.stage_keys[position], self.data_manager.data)
+            except Exception as e:
+                print(f"Could not cache stage output: {e}")
+
+    def _load(self):
+        chunksize = self.chunksize if self.source.endswith(STREAM_EXTENSIONS) else None
+        return self.data_manager.load_data(self.source, chunksize=chunksize)
+
+    def _streamed_prefix(self, steps):
+        # The leading chunkable steps are applied while the source is read,
+        # so they only ever hold a few chunks instead of the whole file.
+        if not self.chunksize or not self.source.endswith(STREAM_EXTENSIONS):
+            return 0
+        count = 0
+        for step in steps:
+            if step.get("manager", "data") != "data" or step["operation"] not in CHUNKABLE_OPERATIONS:
+                break
+            count += 1
+        return count
+
+    def _stream(self, steps, following):
+        operations = [(step["operation"], step.get("params", {})) for step in steps]
+        chunks = self.data_manager.iter_chunks(self.source, self.chunksize or DEFAULT_CHUNKSIZE)
+        if chunks is None:
+            return False
+
+        processed = self._process_chunks(chunks, operations)
+        if following and following[0]["operation"] == "write_chunks":
+            # Nothing later needs the whole frame, so the chunks go straight
+            # to the output file.
+            return self.data_manager.write_chunks(processed, **following[0].get("params", {})) > 0
+
+        self.data_manager.set_data(self.data_manager.concat_chunks(processed))
+        return True
+
+    def _process_chunks(self, chunks, operations):
+        if self.workers == 1:
+            yield from self.data_manager.process_chunks(chunks, operations)
+            return
+
+        # Results are yielded in file order; at most two chunks per worker
+        # are read ahead so memory stays bounded on large files.
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_chunk_worker,
+                                 initargs=(self.data_manager.nlp_engine.model_name,)) as executor:
+            in_flight = deque()
+            try:
+                for chunk in chunks:
+                    in_flight.append(executor.submit(_process_chunk, chunk, operations))
+                    if len(in_flight) >= self.workers * 2:
+                        yield in_flight.popleft().result()
+                while in_flight:
+                    yield in_flight.popleft().result()
+            except BaseException:
+                executor.shutdown(wait=True, cancel_futures=True)
+                raise
+
+    def _run_step(self, step):
+        operation = step["operation"]
+        params = dict(step.get("params", {}))
+        if step.get("manager", "data") == "fasttext":
+            result = getattr(self.fasttext_manager, operation)(**params)
+            if operation in NONE_ON_FAILURE and result is None:
+                return False
+            return result
+
+        if self.data_manager.data is None:
+            print(f"Error: '{operation}' needs the dataset, but it was streamed to a file.")
+            return False
+        if operation == "write_chunks":
+            return self.data_manager.write_chunks([self.data_manager.data], **params) > 0
+
+        result = getattr(self.data_manager, operation)(**params)
+        if operation == "save_splits":
+            return result and self._use_splits(params)
+        return result
+
+    def _use_splits(self, params):
+        # Split files written by the recipe become the training, test and
+        # validation files of the model steps that follow.
+        train_file, test_file = params.get("train_file_path"), params.get("test_file_path")
+        self.fasttext_manager.set_train_file(train_file)
+        self.fasttext_manager.set_test_file(test_file)
+        if params.get("validation_file_path") and self.data_manager.validation_indices is not None:
+            self.fasttext_manager.set_validation_file(params["validation_file_path"])
+        return True
+
+    def report(self, exit_code):
+        return {
+            "recipe_source": self.source,
+            "exit_code": exit_code,
+            "total_seconds": round(sum(timing["seconds"] for timing in self.timings), 4),
+            "stages": self.timings,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a data preparation and fastText training recipe without the GUI.")
+    parser.add_argument("recipe", help="Path to a JSON recipe.")
+    parser.add_argument("--source", help="Input data file. Overrides the source stored in the recipe.")
+    parser.add_argument("--chunksize", type=int,
+                        help="Stream CSV/JSON input in chunks of this many rows through the leading chunkable steps.")
+    parser.add_argument("--workers", type=int, default=1, help="Number of processes for streamed chunks.")
+    parser.add_argument("--report", help="Write per-stage timings and the exit code to this JSON file.")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Directory for cached stage outputs.")
+    parser.add_argument("--cache-size-mb", type=int, default=DEFAULT_CACHE_BYTES // (1024 * 1024),
+                        help="Least recently used stage outputs are evicted above this size.")
+    parser.add_argument("--no-cache", action="store_true", help="Recompute every stage without reading or writing the cache.")
+    args = parser.parse_args()
+
+    try:
+        recipe = load_pipeline(args.recipe)
+    except (OSError, ValueError) as e:
+        print(f"Invalid recipe: {e}")
+        sys.exit(EXIT_INVALID_RECIPE)
+
+    cache = None
+    if not args.no_cache:
+        if PYARROW_AVAILABLE:
+            cache = StageCache(args.cache_dir, args.cache_size_mb * 1024 * 1024)
+        else:
+            print("Stage cache disabled: it requires pyarrow.")
+
+    runner = PipelineRunner(recipe, source=args.source, chunksize=args.chunksize, workers=args.workers, cache=cache)
+    exit_code = runner.run()
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as report_file:
+            json.dump(runner.report(exit_code), report_file, indent=2)
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
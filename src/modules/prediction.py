@@ -0,0 +1,19 @@
+import numpy as np
+
+
+def predict_arrays(model, texts, k=1, threshold=0.0):
+    lines = ["" if text is None else str(text).replace("\n", " ") for text in texts]
+    labels, probs = model.predict(lines, k=k, threshold=threshold)
+
+    width = k if k > 0 else len(model.labels)
+    label_array = np.full((len(lines), width), None, dtype=object)
+    prob_array = np.full((len(lines), width), np.nan, dtype=np.float32)
+    if all(len(row) == width for row in labels):
+        if lines:
+            label_array[:] = labels
+            prob_array[:] = np.concatenate(probs).reshape(len(lines), width)
+    else:
+        for row, (row_labels, row_probs) in enumerate(zip(labels, probs)):
+            label_array[row, :len(row_labels)] = row_labels
+            prob_array[row, :len(row_probs)] = row_probs
+    return label_array, prob_array
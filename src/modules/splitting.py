@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+
+def _shuffled_groups(n, labels, rng):
+    if labels is None:
+        codes = np.zeros(n, dtype=np.int64)
+    else:
+        codes, _ = pd.factorize(labels, use_na_sentinel=False)
+        codes = codes.astype(np.int64, copy=False)
+
+    permutation = rng.permutation(n)
+    positions = permutation[np.argsort(codes[permutation], kind="stable")]
+    sorted_codes = codes[positions]
+    counts = np.bincount(sorted_codes) if n else np.zeros(0, dtype=np.int64)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    ranks = np.arange(n) - starts[sorted_codes]
+    return positions, sorted_codes, ranks, counts
+
+
+def split_indices(n, ratios, labels=None, seed=1):
+    if any(ratio < 0 for ratio in ratios) or sum(ratios) > 1:
+        raise ValueError("Split ratios must be non-negative and sum to at most 1.")
+
+    rng = np.random.default_rng(seed)
+    positions, sorted_codes, ranks, counts = _shuffled_groups(n, labels, rng)
+    boundaries = np.round(np.outer(counts, np.cumsum(ratios))).astype(np.int64)
+
+    parts = np.zeros(n, dtype=np.int8)
+    for column in range(boundaries.shape[1]):
+        parts += ranks >= boundaries[sorted_codes, column]
+
+    result = []
+    for part in range(len(ratios) + 1):
+        indices = positions[parts == part]
+        result.append(indices[rng.permutation(len(indices))])
+    return result
+
+
+def kfold_indices(n, k, labels=None, seed=1):
+    if k < 2:
+        raise ValueError("The number of folds must be at least 2.")
+
+    rng = np.random.default_rng(seed)
+    positions, _, ranks, _ = _shuffled_groups(n, labels, rng)
+    folds = ranks % k
+
+    result = []
+    for fold in range(k):
+        train = positions[folds != fold]
+        test = positions[folds == fold]
+        result.append((train[rng.permutation(len(train))], test[rng.permutation(len(test))]))
+    return result
@@ -0,0 +1,148 @@
+import hashlib
+import importlib.metadata
+import json
+import os
+import platform
+import tempfile
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "fasttext_project", "stages")
+DEFAULT_CACHE_BYTES = 5 * 1024 * 1024 * 1024
+CACHE_FORMAT_VERSION = 1
+CACHE_EXTENSION = ".arrow"
+FILE_DIGESTS_NAME = "file_digests.json"
+HASH_BLOCK_BYTES = 1024 * 1024
+VERSIONED_PACKAGES = ("numpy", "pandas", "pyarrow", "spacy")
+
+
+def library_versions(nlp_model=None):
+    versions = {"python": platform.python_version(), "cache_format": CACHE_FORMAT_VERSION}
+    packages = list(VERSIONED_PACKAGES) + ([nlp_model] if nlp_model else [])
+    for package in packages:
+        try:
+            versions[package] = importlib.metadata.version(package)
+        except importlib.metadata.PackageNotFoundError:
+            versions[package] = None
+    return versions
+
+
+def stage_key(parent_key, operation, params, versions):
+    payload = json.dumps(
+        {"parent": parent_key, "operation": operation, "params": params, "versions": versions},
+        sort_keys=True, default=str
+    )
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=20).hexdigest()
+
+
+class StageCache:
+    # Stage outputs are Arrow files named by a key chained from the input
+    # file digest and every operation applied before them, so a change to
+    # one step only misses the cache from that step on. The file mtime is
+    # the last use and the oldest files are evicted past the size cap.
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_CACHE_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def file_digest(self, file_path):
+        # Hashing a multi-GB input on every run is not free either, so the
+        # digest is reused while the file size and mtime are unchanged.
+        stat = os.stat(file_path)
+        path = os.path.abspath(file_path)
+        digests = self._read_file_digests()
+        known = digests.get(path)
+        if known and known["size"] == stat.st_size and known["mtime_ns"] == stat.st_mtime_ns:
+            return known["digest"]
+
+        digest = hashlib.blake2b(digest_size=20)
+        with open(file_path, "rb") as input_file:
+            for block in iter(lambda: input_file.read(HASH_BLOCK_BYTES), b""):
+                digest.update(block)
+        digests[path] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "digest": digest.hexdigest()}
+        self._write_json(os.path.join(self.cache_dir, FILE_DIGESTS_NAME), digests)
+        return digests[path]["digest"]
+
+    def contains(self, key):
+        return os.path.exists(self._path(key))
+
+    def get(self, key):
+        from pyarrow import feather
+
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            frame = feather.read_table(path).to_pandas()
+        except Exception as e:
+            print(f"Discarding unreadable cache entry {key}: {e}")
+            self._remove(path)
+            return None
+        os.utime(path)
+        return frame
+
+    def put(self, key, frame):
+        import pyarrow as pa
+        from pyarrow import feather
+
+        # Written to a temporary file first, so an interrupted run never
+        # leaves a truncated entry behind under a valid key.
+        handle, temp_path = tempfile.mkstemp(suffix=".tmp", dir=self.cache_dir)
+        os.close(handle)
+        try:
+            feather.write_feather(pa.Table.from_pandas(frame), temp_path)
+            if os.path.getsize(temp_path) > self.max_bytes:
+                print("Stage output is larger than the cache size limit, not caching it.")
+                return False
+            os.replace(temp_path, self._path(key))
+        finally:
+            self._remove(temp_path)
+        self.evict(keep=key)
+        return True
+
+    def entries(self):
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(CACHE_EXTENSION):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return sorted(entries)
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, keep=None):
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        kept_path = self._path(keep) if keep else None
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path != kept_path:
+                self._remove(path)
+                total -= size
+
+    def clear(self):
+        for _, _, path in self.entries():
+            self._remove(path)
+        self._remove(os.path.join(self.cache_dir, FILE_DIGESTS_NAME))
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + CACHE_EXTENSION)
+
+    def _read_file_digests(self):
+        try:
+            with open(os.path.join(self.cache_dir, FILE_DIGESTS_NAME), encoding="utf-8") as digests_file:
+                return json.load(digests_file)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_json(self, file_path, value):
+        temp_path = file_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as output_file:
+            json.dump(value, output_file)
+        os.replace(temp_path, file_path)
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,140 @@
+import itertools
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+_shared_executor = None
+_shared_executor_lock = threading.Lock()
+
+
+def get_shared_executor():
+    global _shared_executor
+    with _shared_executor_lock:
+        if _shared_executor is None:
+            _shared_executor = TaskExecutor()
+        return _shared_executor
+
+
+class TaskCancelled(Exception):
+    pass
+
+
+class Task:
+    def __init__(self, task_id, name):
+        self.task_id = task_id
+        self.name = name
+        self.status = QUEUED
+        self.fraction = 0.0
+        self.message = ""
+        self.result = None
+        self.error = None
+        self.events = queue.Queue()
+        self._cancel_event = threading.Event()
+
+    def is_active(self):
+        return self.status in (QUEUED, RUNNING)
+
+    def cancel(self):
+        if not self.is_active():
+            return False
+        self._cancel_event.set()
+        return True
+
+    def cancel_requested(self):
+        return self._cancel_event.is_set()
+
+    def report(self, fraction=None, message=None):
+        # Passed to the operation as its progress callback; raising here is
+        # how a cancel request reaches the code running in the worker.
+        if self._cancel_event.is_set():
+            raise TaskCancelled(f"{self.name} was cancelled.")
+        if fraction is not None:
+            self.fraction = min(max(float(fraction), 0.0), 1.0)
+        if message is not None:
+            self.message = message
+        self._emit({"type": "progress", "fraction": self.fraction, "message": self.message})
+
+    def get_events(self):
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def _emit(self, event):
+        self.events.put(dict(event, task_id=self.task_id, name=self.name))
+
+
+class TaskExecutor:
+    # DataManager mutates a single DataFrame in place, so tasks run on one
+    # worker by default and are applied in the order they were submitted.
+    def __init__(self, max_workers=1):
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="data-task")
+        self.tasks = {}
+        self._task_ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def submit(self, function, *args, name=None, **kwargs):
+        with self._lock:
+            task = Task(next(self._task_ids), name or getattr(function, "__name__", "Task"))
+            self.tasks[task.task_id] = task
+        task._emit({"type": "queued"})
+        self.pool.submit(self._run, task, function, args, kwargs)
+        return task
+
+    def cancel(self, task_id):
+        task = self.tasks.get(task_id)
+        return task is not None and task.cancel()
+
+    def cancel_all(self):
+        return [task.task_id for task in self.active_tasks() if task.cancel()]
+
+    def active_tasks(self):
+        return [task for task in self.tasks.values() if task.is_active()]
+
+    def shutdown(self, wait=False):
+        self.cancel_all()
+        self.pool.shutdown(wait=wait)
+
+    def _run(self, task, function, args, kwargs):
+        try:
+            if task.cancel_requested():
+                raise TaskCancelled(f"{task.name} was cancelled before it started.")
+            task.status = RUNNING
+            task._emit({"type": "started"})
+            task.result = function(*args, progress=task.report, **kwargs)
+            task.fraction = 1.0
+            task.status = COMPLETED
+        except TaskCancelled as e:
+            task.status = CANCELLED
+            task.message = str(e)
+        except Exception as e:
+            task.status = FAILED
+            task.error = e
+            task.message = f"Error running {task.name}: {e}"
+            print(task.message)
+        finally:
+            with self._lock:
+                self.tasks.pop(task.task_id, None)
+            task._emit({"type": "finished", "status": task.status, "message": task.message})
+
+
+def step_progress(progress, step, steps):
+    # Maps the 0..1 progress of one step of a multi-step task (for example
+    # one column out of several) onto that step's share of the whole task.
+    if progress is None:
+        return None
+
+    def report(fraction=None, message=None):
+        if fraction is not None:
+            fraction = (step + fraction) / steps
+        progress(fraction, message)
+
+    return report
@@ -0,0 +1,67 @@
+import re
+import pandas as pd
+
+EXCESS_SPACES_PATTERN = re.compile(r'\s{2,}')
+
+CLEANING_OPERATIONS = {
+    "normalize_case": [("lower", None)],
+    "remove_special_chars": [("delete", r'[^a-zA-Z0-9\s]'), ("collapse", None)],
+    "remove_numbers": [("delete", r'\d+'), ("collapse", None)],
+    "remove_excess_spaces": [("collapse", None)],
+}
+
+
+def compile_pipeline(operations):
+    steps = []
+    collapse = False
+    for operation in operations:
+        if operation not in CLEANING_OPERATIONS:
+            raise ValueError(f"Unknown cleaning operation '{operation}'.")
+        for kind, pattern in CLEANING_OPERATIONS[operation]:
+            if kind == "collapse":
+                collapse = True
+            elif kind == "delete" and steps and steps[-1][0] == "delete":
+                steps[-1] = ("delete", f"{steps[-1][1]}|{pattern}")
+            else:
+                steps.append((kind, pattern))
+
+    # Deletions never remove whitespace and every deletion is followed by a
+    # collapse, so a single collapse at the end gives the same result as
+    # collapsing after each operation.
+    if collapse:
+        steps.append(("collapse", None))
+    return steps
+
+
+def build_transform(steps):
+    functions = []
+    for kind, pattern in steps:
+        if kind == "lower":
+            functions.append(str.lower)
+        elif kind == "delete":
+            functions.append(lambda text, regex=re.compile(pattern): regex.sub('', text))
+        elif kind == "collapse":
+            functions.append(lambda text: EXCESS_SPACES_PATTERN.sub(' ', text))
+
+    def transform(text):
+        for function in functions:
+            text = function(text)
+        return text
+
+    return transform
+
+
+def apply_pipeline(series, steps):
+    if getattr(series.dtype, "storage", None) == "pyarrow":
+        for kind, pattern in steps:
+            if kind == "lower":
+                series = series.str.lower()
+            elif kind == "delete":
+                series = series.str.replace(pattern, '', regex=True)
+            elif kind == "collapse":
+                series = series.str.replace(EXCESS_SPACES_PATTERN.pattern, ' ', regex=True)
+        return series
+
+    transform = build_transform(steps)
+    values = [transform(value) if isinstance(value, str) else value for value in series.tolist()]
+    return pd.Series(values, index=series.index, dtype=series.dtype, name=series.name)
@@ -0,0 +1,161 @@
+import itertools
+import multiprocessing
+import os
+import queue
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+import fasttext
+from modules.evaluation import evaluate, get_evaluation_set
+from modules.training_runner import run_training
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+def evaluate_job_model(model_path, evaluation_files, label_prefix):
+    model = fasttext.load_model(model_path)
+    evaluations = {}
+    for name, file_path in evaluation_files.items():
+        results = evaluate(model, get_evaluation_set(file_path, label_prefix))
+        # test() reports precision at k, which this app has always shown as accuracy.
+        results["Accuracy"] = results["Precision"]
+        evaluations[name] = results
+    return evaluations
+
+
+class TrainingJob:
+    def __init__(self, job_id, args, model_path, evaluation_files=None, label=None):
+        self.job_id = job_id
+        self.args = args
+        self.model_path = model_path
+        self.evaluation_files = evaluation_files or {}
+        self.label = label or f"Job {job_id}"
+        self.status = QUEUED
+        self.message = ""
+        self.results = {}
+        self.cancel_requested = False
+
+    def is_active(self):
+        return self.status in (QUEUED, RUNNING)
+
+
+class TrainingJobQueue:
+    def __init__(self, output_dir=None):
+        self.output_dir = output_dir or tempfile.mkdtemp(prefix="fasttext_jobs_")
+        self.events = queue.Queue()
+        self.jobs = {}
+        self._pending = queue.Queue()
+        self._job_ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._worker = None
+        self._evaluator = None
+
+    def submit(self, args, evaluation_files=None, label=None):
+        with self._lock:
+            job_id = next(self._job_ids)
+            model_path = os.path.join(self.output_dir, f"model_{job_id}.bin")
+            job = TrainingJob(job_id, dict(args), model_path, evaluation_files, label)
+            self.jobs[job_id] = job
+            self._emit(job, {"type": "queued"})
+            self._pending.put(job)
+
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run_jobs, daemon=True)
+                self._worker.start()
+        return job
+
+    def cancel(self, job_id):
+        job = self.jobs.get(job_id)
+        if job is None or not job.is_active():
+            return False
+        job.cancel_requested = True
+        return True
+
+    def cancel_all(self):
+        return [job.job_id for job in self.active_jobs() if self.cancel(job.job_id)]
+
+    def active_jobs(self):
+        return [job for job in self.jobs.values() if job.is_active()]
+
+    def get_events(self):
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def discard_model(self, job):
+        if os.path.exists(job.model_path):
+            os.remove(job.model_path)
+
+    def shutdown(self):
+        self.cancel_all()
+        if self._evaluator is not None:
+            self._evaluator.shutdown(wait=False, cancel_futures=True)
+            self._evaluator = None
+        shutil.rmtree(self.output_dir, ignore_errors=True)
+
+    def _emit(self, job, event):
+        self.events.put(dict(event, job_id=job.job_id, label=job.label))
+
+    def _run_jobs(self):
+        while True:
+            try:
+                job = self._pending.get(timeout=1)
+            except queue.Empty:
+                with self._lock:
+                    if self._pending.empty():
+                        self._worker = None
+                        return
+                continue
+
+            if job.cancel_requested:
+                self._finish(job, CANCELLED, "Training cancelled before it started.")
+                continue
+
+            job.status = RUNNING
+            self._emit(job, {"type": "started", "epochs": job.args.get("epoch")})
+
+            def on_event(event, job=job):
+                if event["type"] == "evaluation":
+                    job.results[event["name"]] = event["results"]
+                self._emit(job, event)
+
+            try:
+                status, message = run_training(
+                    job.args,
+                    job.model_path,
+                    on_event=on_event,
+                    should_stop=lambda job=job: job.cancel_requested
+                )
+                if status == COMPLETED and job.evaluation_files:
+                    self._evaluate(job, on_event)
+            except Exception as e:
+                status, message = FAILED, f"Error running training job: {e}"
+            self._finish(job, status, message)
+
+    def _evaluate(self, job, on_event):
+        # Evaluation holds the GIL, so it runs outside the app process too.
+        # The evaluation process lives as long as the queue, which keeps the
+        # parsed evaluation sets cached across jobs: retraining for every
+        # epoch parses the train and test files once, not once per epoch.
+        if self._evaluator is None:
+            self._evaluator = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+        evaluations = self._evaluator.submit(
+            evaluate_job_model, job.model_path, job.evaluation_files, job.args.get("label", "__label__")
+        ).result()
+        for name, results in evaluations.items():
+            on_event({"type": "evaluation", "name": name, "results": results})
+
+    def _finish(self, job, status, message):
+        job.status = status
+        job.message = message
+        if status != COMPLETED and os.path.exists(job.model_path):
+            os.remove(job.model_path)
+        self._emit(job, {"type": "finished", "status": status, "message": message, "results": job.results})
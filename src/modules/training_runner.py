@@ -0,0 +1,95 @@
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+WORKER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "training_worker.py")
+PROGRESS_PATTERN = re.compile(
+    r"Progress:\s*([\d.]+)%\s+words/sec/thread:\s*(-?\d+)\s+lr:\s*(-?[\d.]+)\s+avg\.loss:\s*(\S+)"
+)
+
+
+def parse_progress(line):
+    match = PROGRESS_PATTERN.search(line)
+    if match is None:
+        return None
+    return {
+        "type": "progress",
+        "progress": float(match.group(1)) / 100.0,
+        "words_per_sec": int(match.group(2)),
+        "lr": float(match.group(3)),
+        "loss": float(match.group(4))
+    }
+
+
+def _emit(on_event, event):
+    if on_event is not None:
+        on_event(event)
+
+
+def _read_output(stream, epochs, on_event, messages):
+    buffer = b""
+    reported_epochs = 0
+    while True:
+        chunk = stream.read1(4096) if hasattr(stream, "read1") else stream.read(4096)
+        if not chunk:
+            break
+        buffer += chunk
+        *lines, buffer = re.split(rb"[\r\n]", buffer)
+        for raw_line in lines:
+            line = raw_line.decode("utf-8", errors="replace").strip()
+            if not line:
+                continue
+            event = parse_progress(line)
+            if event is None:
+                messages.append(line)
+                _emit(on_event, {"type": "log", "message": line})
+                continue
+
+            _emit(on_event, event)
+            if epochs:
+                # fastText only prints progress now and then, so one sample
+                # can cross several epoch boundaries. It is reported once,
+                # at its real position, rather than repeated for every
+                # boundary with a loss that was never measured there.
+                completed = min(epochs, int(event["progress"] * epochs + 1e-6))
+                if completed > reported_epochs:
+                    reported_epochs = completed
+                    _emit(on_event, dict(event, type="epoch", epoch=completed, epochs=epochs,
+                                         position=event["progress"] * epochs))
+
+
+def run_training(args, model_path, on_event=None, should_stop=None, poll_interval=0.1):
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False, encoding="utf-8") as job_file:
+        json.dump({"args": args}, job_file)
+
+    messages = []
+    epochs = None if args.get("autotuneValidationFile") else args.get("epoch")
+    try:
+        process = subprocess.Popen(
+            [sys.executable, WORKER_PATH, job_file.name, model_path],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE
+        )
+        reader = threading.Thread(target=_read_output, args=(process.stderr, epochs, on_event, messages), daemon=True)
+        reader.start()
+
+        while process.poll() is None:
+            if should_stop is not None and should_stop():
+                process.kill()
+                process.wait()
+                reader.join()
+                return "cancelled", "Training cancelled."
+            time.sleep(poll_interval)
+
+        reader.join()
+        if process.returncode != 0:
+            errors = [message for message in messages if message.startswith("Error")]
+            return "failed", errors[-1] if errors else f"Training process exited with code {process.returncode}."
+        return "completed", "Training completed."
+    finally:
+        os.remove(job_file.name)
@@ -0,0 +1,22 @@
+import json
+import sys
+import fasttext
+
+
+def main():
+    job_path, model_path = sys.argv[1], sys.argv[2]
+    with open(job_path, encoding="utf-8") as job_file:
+        job = json.load(job_file)
+    args = job["args"]
+    args["verbose"] = max(2, args.get("verbose", 2))
+
+    try:
+        model = fasttext.train_supervised(**args)
+        model.save_model(model_path)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr, flush=True)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,83 @@
 import customtkinter as ctk
+from tkinter import TclError
+from modules.task_executor import get_shared_executor
+
+POLL_INTERVAL_MS = 100
 
 class ProgressDialog(ctk.CTkToplevel):
-    def __init__(self, master, title="Processing", message="Please wait...", **kwargs):
+    def __init__(self, master, title="Processing", message="Please wait...", on_cancel=None, **kwargs):
         super().__init__(master, **kwargs)
         self.title(title)
-        self.geometry("300x100")
+        self.geometry("360x150" if on_cancel else "360x110")
         self.transient(master)
         self.resizable(False, False)
-        
+        self.task = None
+        self.on_finished = None
+
         self.label = ctk.CTkLabel(self, text=message)
-        self.label.pack(pady=20)
+        self.label.pack(pady=(15, 5))
+
+        self.progress_bar = ctk.CTkProgressBar(self, mode="determinate", width=300)
+        self.progress_bar.set(0)
+        self.progress_bar.pack(pady=5)
+
+        self.percent_label = ctk.CTkLabel(self, text="")
+        self.percent_label.pack()
+
+        self.cancel_button = None
+        if on_cancel:
+            self.cancel_button = ctk.CTkButton(self, text="Cancel", fg_color="#c24c4c", hover_color="#9c3636", command=on_cancel)
+            self.cancel_button.pack(pady=(5, 10))
+            self.protocol("WM_DELETE_WINDOW", on_cancel)
 
         self.update_idletasks()
 
+    def set_progress(self, fraction=None, message=None):
+        if fraction is not None:
+            self.progress_bar.set(fraction)
+            self.percent_label.configure(text=f"{fraction * 100:.0f}%")
+        if message:
+            self.label.configure(text=message)
+
+    def track(self, task, on_finished=None):
+        self.task = task
+        self.on_finished = on_finished
+        try:
+            self.grab_set()
+        except TclError:
+            pass
+        self.after(POLL_INTERVAL_MS, self.poll_task)
+
+    def poll_task(self):
+        finished = None
+        for event in self.task.get_events():
+            if event["type"] == "progress":
+                self.set_progress(event["fraction"], event["message"])
+            elif event["type"] == "finished":
+                finished = event
+
+        if finished is None:
+            self.after(POLL_INTERVAL_MS, self.poll_task)
+            return
+
+        self.stop_progress()
+        if self.on_finished:
+            self.on_finished(self.task)
+
+    def cancel_task(self):
+        if self.task is not None and self.task.cancel():
+            self.label.configure(text="Cancelling...")
+            if self.cancel_button is not None:
+                self.cancel_button.configure(state="disabled")
+
     def stop_progress(self):
         self.destroy()
+
+
+def run_in_background(master, function, *args, title="Processing", message="Please wait...", on_finished=None, **kwargs):
+    # Runs a DataManager operation on the shared task executor and shows its
+    # progress; on_finished is called on the Tk thread with the finished task.
+    dialog = ProgressDialog(master, title=title, message=message, on_cancel=lambda: dialog.cancel_task())
+    task = get_shared_executor().submit(function, *args, name=title, **kwargs)
+    dialog.track(task, on_finished)
+    return task
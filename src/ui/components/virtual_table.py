@@ -0,0 +1,175 @@
+import customtkinter as ctk
+import numpy as np
+import pandas as pd
+from tkinter import ttk
+
+
+class VirtualTable(ctk.CTkFrame):
+    def __init__(self, master, data_frame=None, empty_message="No data available", visible_rows=15, buffer_rows=200,
+                 show_index=False, index_label="Index", **kwargs):
+        super().__init__(master, **kwargs)
+
+        self.empty_message = empty_message
+        self.visible_rows = visible_rows
+        self.buffer_rows = buffer_rows
+        self.show_index = show_index
+        self.index_label = index_label
+
+        self.data_frame = None
+        self.positions = None
+        self.headers = []
+        self.order = None
+        self.sort_column = None
+        self.sort_ascending = True
+        self.offset = 0
+        self.block_start = 0
+        self.block = []
+
+        self.table_frame = ctk.CTkFrame(self)
+        self.table_frame.pack(fill="both", expand=True)
+
+        self.table = ttk.Treeview(self.table_frame, show="headings", height=visible_rows)
+        self.table.pack(side="left", fill="both", expand=True)
+
+        self.scrollbar = ttk.Scrollbar(self.table_frame, orient="vertical", command=self.on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.table.bind("<MouseWheel>", self.on_mouse_wheel)
+        self.table.bind("<Button-4>", lambda event: self.scroll_to(self.offset - 3))
+        self.table.bind("<Button-5>", lambda event: self.scroll_to(self.offset + 3))
+
+        self.paging_frame = ctk.CTkFrame(self, fg_color="transparent")
+        self.paging_frame.pack(fill="x")
+
+        self.previous_button = ctk.CTkButton(self.paging_frame, text="Previous Page", width=110,
+                                             command=lambda: self.scroll_to(self.offset - self.visible_rows))
+        self.previous_button.pack(side="left", padx=5, pady=5)
+
+        self.next_button = ctk.CTkButton(self.paging_frame, text="Next Page", width=110,
+                                         command=lambda: self.scroll_to(self.offset + self.visible_rows))
+        self.next_button.pack(side="right", padx=5, pady=5)
+
+        self.position_label = ctk.CTkLabel(self.paging_frame, text="")
+        self.position_label.pack(side="left", expand=True)
+
+        self.display_frame(data_frame)
+
+    def display_frame(self, data_frame, positions=None):
+        # positions selects rows of data_frame by position without copying
+        # them out (e.g. a split of the working dataset); only the rows on
+        # screen are ever taken from the frame.
+        if positions is not None:
+            positions = np.asarray(positions)
+
+        self.data_frame = data_frame
+        self.positions = positions
+        self.order = None
+        self.sort_column = None
+        self.sort_ascending = True
+        self.offset = 0
+        self.block = []
+
+        self.table.delete(*self.table.get_children())
+        if data_frame is None or data_frame.empty or self.row_count() == 0:
+            self.table["columns"] = ("Message",)
+            self.table.heading("Message", text="")
+            self.table.column("Message", minwidth=200, anchor="center")
+            self.table.insert("", "end", values=(self.empty_message,))
+            self.scrollbar.set(0, 1)
+            self.position_label.configure(text="")
+            return
+
+        headers = [str(column) for column in data_frame.columns]
+        if self.show_index:
+            headers.insert(0, self.index_label)
+        self.headers = headers
+        self.table["columns"] = headers
+        for position, header in enumerate(headers):
+            self.table.heading(header, text=header, command=lambda position=position: self.sort_by(position))
+            self.table.column(header, minwidth=100, width=150, stretch=True)
+        self.render()
+
+    def display_data(self, data_list):
+        self.display_frame(pd.DataFrame(data_list) if data_list else None)
+
+    def row_count(self):
+        if self.data_frame is None:
+            return 0
+        return len(self.positions) if self.positions is not None else len(self.data_frame)
+
+    def column_values(self, position):
+        rows = self.positions if self.positions is not None else slice(None)
+        if self.show_index:
+            if position == 0:
+                return pd.Series(self.data_frame.index[rows])
+            position -= 1
+        return self.data_frame.iloc[rows, position]
+
+    def sort_by(self, position):
+        if self.sort_column == position:
+            self.sort_ascending = not self.sort_ascending
+        else:
+            self.sort_column = position
+            self.sort_ascending = True
+
+        values = self.column_values(position).reset_index(drop=True)
+        try:
+            sorted_values = values.sort_values(ascending=self.sort_ascending, kind="stable", na_position="last")
+        except TypeError:
+            sorted_values = values.astype(str).sort_values(ascending=self.sort_ascending, kind="stable")
+        self.order = sorted_values.index.to_numpy()
+
+        for index, header in enumerate(self.headers):
+            arrow = (" ▲" if self.sort_ascending else " ▼") if index == position else ""
+            self.table.heading(header, text=f"{header}{arrow}")
+        self.block = []
+        self.scroll_to(0)
+
+    def scroll_to(self, offset):
+        if self.row_count() == 0:
+            return
+        max_offset = max(0, self.row_count() - self.visible_rows)
+        self.offset = int(min(max(offset, 0), max_offset))
+        self.render()
+
+    def on_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            self.scroll_to(float(value) * self.row_count())
+        elif action == "scroll":
+            step = self.visible_rows if unit == "pages" else 1
+            self.scroll_to(self.offset + int(value) * step)
+
+    def on_mouse_wheel(self, event):
+        self.scroll_to(self.offset - int(np.sign(event.delta)) * 3)
+        return "break"
+
+    def load_block(self, start):
+        # Formats a window of rows around the viewport so small scroll steps
+        # do not go back to pandas for every redraw.
+        start = max(0, start - self.buffer_rows // 2)
+        stop = min(self.row_count(), start + self.visible_rows + self.buffer_rows)
+        positions = np.arange(start, stop) if self.order is None else self.order[start:stop]
+        if self.positions is not None:
+            positions = self.positions[positions]
+        window = self.data_frame.iloc[positions]
+        if self.show_index:
+            window = window.rename_axis(self.index_label).reset_index()
+        window = window.astype(object).where(window.notna(), "")
+        self.block_start = start
+        self.block = list(window.itertuples(index=False, name=None))
+
+    def render(self):
+        if self.row_count() == 0:
+            return
+
+        stop = min(self.offset + self.visible_rows, self.row_count())
+        if not self.block or self.offset < self.block_start or stop > self.block_start + len(self.block):
+            self.load_block(self.offset)
+
+        self.table.delete(*self.table.get_children())
+        for values in self.block[self.offset - self.block_start:stop - self.block_start]:
+            self.table.insert("", "end", values=values)
+
+        total = self.row_count()
+        self.scrollbar.set(self.offset / total, stop / total)
+        self.position_label.configure(text=f"Rows {self.offset + 1}-{stop} of {total}")
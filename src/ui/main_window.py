@@ -1,9 +1,12 @@
 import customtkinter as ctk
+from tkinter import filedialog
 from .components.sidebar import Sidebar
 from .components.navigation_bar import NavigationBar
+from .components.progress_dialog import run_in_background
 from .views import *
 from modules.data_manager import DataManager
 from modules.fasttext_manager import FastTextManager
+from modules.task_executor import COMPLETED
 
 
 class MainWindow(ctk.CTkFrame):
@@ -43,11 +46,28 @@ class MainWindow(ctk.CTkFrame):
         self.navigation_bar.place(relx=0, rely=0, relwidth=1.0, relheight=0.1)
         self.navigation_bar.set_next_enabled(False)
 
+        self.undo_button = ctk.CTkButton(self, text="Undo", fg_color="#6c757d", command=self.undo_step)
+        self.undo_button.place(relx=0.01, rely=0.7, relwidth=0.085, relheight=0.04)
+
+        self.redo_button = ctk.CTkButton(self, text="Redo", fg_color="#6c757d", command=self.redo_step)
+        self.redo_button.place(relx=0.105, rely=0.7, relwidth=0.085, relheight=0.04)
+
+        self.save_recipe_button = ctk.CTkButton(self, text="Save Recipe", fg_color="#6c757d", command=self.save_recipe)
+        self.save_recipe_button.place(relx=0.01, rely=0.75, relwidth=0.085, relheight=0.04)
+
+        self.replay_recipe_button = ctk.CTkButton(self, text="Replay Recipe", fg_color="#6c757d", command=self.replay_recipe)
+        self.replay_recipe_button.place(relx=0.105, rely=0.75, relwidth=0.085, relheight=0.04)
+
         self.load_model_button = ctk.CTkButton(
             self, text="Load Model", fg_color="#4CAF50", command=self.open_load_model_view
         )
         self.load_model_button.place(relx=0.01, rely=0.8, relwidth=0.18, relheight=0.04)
 
+        self.search_button = ctk.CTkButton(
+            self, text="Hyperparameter Search", fg_color="#4CAF50", command=self.open_hyperparameter_search_view
+        )
+        self.search_button.place(relx=0.01, rely=0.85, relwidth=0.18, relheight=0.04)
+
         self.current_frame = None
         self.switch_frame(self.current_index)
 
@@ -83,6 +103,8 @@ class MainWindow(ctk.CTkFrame):
 
         if isinstance(self.current_frame, (DataCleaningView, TextProcessingView, LabelPreparationView)):
             self.navigation_bar.set_next_enabled(True)
+        if isinstance(self.current_frame, ModelExportView):
+            self.current_frame.update_export_state()
 
         self.sidebar.highlight_step(index)
 
@@ -105,3 +127,73 @@ class MainWindow(ctk.CTkFrame):
         self.current_frame = load_model_view
         self.current_frame.place(relx=0, rely=0.1, relwidth=1.0, relheight=0.9)
         self.navigation_bar.update_title("Load Pretrained Model")
+
+    def open_hyperparameter_search_view(self):
+        search_view = HyperparameterSearchView(
+            master=self.container,
+            fasttext_manager=self.fasttext_manager
+        )
+        if self.current_frame is not None:
+            self.current_frame.place_forget()
+
+        self.current_frame = search_view
+        self.current_frame.place(relx=0, rely=0.1, relwidth=1.0, relheight=0.9)
+        self.navigation_bar.update_title("Hyperparameter Search")
+
+    def close(self):
+        # Stops queued training jobs and removes their temporary model files.
+        self.fasttext_manager.shutdown()
+        self.master.destroy()
+
+    # Undo and redo go through the same single-worker executor as the data
+    # operations, so they never swap the frame under a running task.
+    def undo_step(self):
+        run_in_background(
+            self, self.data_manager.undo, title="Undo", message="Restoring the previous step...",
+            on_finished=self.refresh_after_journal_step
+        )
+
+    def redo_step(self):
+        run_in_background(
+            self, self.data_manager.redo, title="Redo", message="Reapplying the step...",
+            on_finished=self.refresh_after_journal_step
+        )
+
+    def refresh_after_journal_step(self, task):
+        if task.status == COMPLETED and task.result:
+            self.refresh_data_views()
+
+    def save_recipe(self):
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".json", filetypes=[("Recipe Files", "*.json")], title="Save Recipe"
+        )
+        if file_path:
+            self.data_manager.save_recipe(file_path)
+
+    def replay_recipe(self):
+        recipe_path = filedialog.askopenfilename(filetypes=[("Recipe Files", "*.json")], title="Select Recipe")
+        if not recipe_path:
+            return
+        file_path = filedialog.askopenfilename(title="Select Data File to Replay the Recipe On")
+        if not file_path:
+            return
+        run_in_background(
+            self, self.data_manager.replay_recipe, recipe_path, file_path,
+            title="Replaying Recipe", message="Loading data and replaying steps...",
+            on_finished=lambda task: self.refresh_data_views() if task.status == COMPLETED else None
+        )
+
+    def refresh_data_views(self):
+        # Data views render the DataManager state when they are built, so
+        # they are rebuilt after the data is swapped underneath them.
+        for index in list(self.view_instances):
+            if self.view_instances[index] is not self.current_frame and self.steps[index][1] not in [
+                ModelConfigurationView, ModelTrainingView, ModelExportView
+            ]:
+                self.view_instances.pop(index).destroy()
+
+        if self.current_index in self.view_instances and self.view_instances[self.current_index] is self.current_frame:
+            if self.steps[self.current_index][1] not in [ModelConfigurationView, ModelTrainingView, ModelExportView]:
+                self.view_instances.pop(self.current_index).destroy()
+                self.current_frame = None
+                self.switch_frame(self.current_index)
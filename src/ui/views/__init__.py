@@ -8,3 +8,4 @@ from .model_configuration_view import ModelConfigurationView
 from .model_training_view import ModelTrainingView
 from .model_export_view import ModelExportView
 from .load_model_view import LoadModelView
+from .hyperparameter_search_view import HyperparameterSearchView
@@ -1,6 +1,7 @@
 import customtkinter as ctk
-from ..components.universal_table import UniversalTable
-from ..components.progress_dialog import ProgressDialog
+from modules.task_executor import COMPLETED
+from ..components.virtual_table import VirtualTable
+from ..components.progress_dialog import run_in_background
 
 class DataCleaningView(ctk.CTkScrollableFrame):
     def __init__(self, master, data_manager=None, navigation_bar=None, **kwargs):
@@ -12,7 +13,7 @@ class DataCleaningView(ctk.CTkScrollableFrame):
         self.missing_label = ctk.CTkLabel(self, text="Missing Values", font=("Arial", 16, "bold"))
         self.missing_label.pack(pady=(10, 5))
 
-        self.missing_details_table = UniversalTable(self, data_list=[], empty_message="No missing values")
+        self.missing_details_table = VirtualTable(self, empty_message="No missing values", show_index=True)
         self.missing_details_table.pack(pady=5, fill="both", expand=True)
 
         self.missing_info_label = ctk.CTkLabel(self, text="Total records with missing values: 0", font=("Arial", 12))
@@ -61,7 +62,7 @@ class DataCleaningView(ctk.CTkScrollableFrame):
         self.duplicates_label = ctk.CTkLabel(self, text="Duplicate Records", font=("Arial", 16, "bold"))
         self.duplicates_label.pack(pady=(20, 5))
 
-        self.duplicates_table = UniversalTable(self, data_list=[], empty_message="No duplicate records found")
+        self.duplicates_table = VirtualTable(self, empty_message="No duplicate records found")
         self.duplicates_table.pack(pady=5, fill="both", expand=True)
 
         self.duplicates_info_label = ctk.CTkLabel(self, text="Total duplicate records: 0", font=("Arial", 12))
@@ -70,6 +71,42 @@ class DataCleaningView(ctk.CTkScrollableFrame):
         self.remove_duplicates_button = ctk.CTkButton(self, text="Remove Duplicates", command=self.remove_duplicates, fg_color="#c24c4c", hover_color="#9c3636")
         self.remove_duplicates_button.pack(pady=10, fill="x", expand=True)
 
+        self.near_duplicates_label = ctk.CTkLabel(self, text="Near Duplicate Records", font=("Arial", 16, "bold"))
+        self.near_duplicates_label.pack(pady=(20, 5))
+
+        self.near_duplicates_frame = ctk.CTkFrame(self, fg_color="#2B2B2B")
+        self.near_duplicates_frame.pack(pady=10, fill="x", expand=True)
+
+        self.near_column_var = ctk.StringVar()
+        self.near_threshold_var = ctk.StringVar(value="0.8")
+
+        self.near_column_label = ctk.CTkLabel(self.near_duplicates_frame, text="Text Column:")
+        self.near_column_label.pack(side="left", padx=5)
+
+        self.near_column_select = ctk.CTkOptionMenu(self.near_duplicates_frame, variable=self.near_column_var, values=[])
+        self.near_column_select.pack(side="left", padx=5)
+
+        self.near_threshold_label = ctk.CTkLabel(self.near_duplicates_frame, text="Similarity:")
+        self.near_threshold_label.pack(side="left", padx=5)
+
+        self.near_threshold_entry = ctk.CTkEntry(self.near_duplicates_frame, textvariable=self.near_threshold_var, width=60)
+        self.near_threshold_entry.pack(side="left", padx=5)
+
+        self.find_near_button = ctk.CTkButton(self.near_duplicates_frame, text="Find", command=self.find_near_duplicates)
+        self.find_near_button.pack(side="left", padx=5)
+
+        self.flag_near_button = ctk.CTkButton(self.near_duplicates_frame, text="Flag", command=self.flag_near_duplicates)
+        self.flag_near_button.pack(side="left", padx=5)
+
+        self.remove_near_button = ctk.CTkButton(self.near_duplicates_frame, text="Remove", command=self.remove_near_duplicates, fg_color="#c24c4c", hover_color="#9c3636")
+        self.remove_near_button.pack(side="left", padx=5)
+
+        self.near_duplicates_table = VirtualTable(self, empty_message="No near duplicate records found")
+        self.near_duplicates_table.pack(pady=5, fill="both", expand=True)
+
+        self.near_duplicates_info_label = ctk.CTkLabel(self, text="", font=("Arial", 12))
+        self.near_duplicates_info_label.pack(pady=(5, 10))
+
         self.display_missing_details()
         self.display_duplicates()
         self.populate_column_options()
@@ -77,25 +114,24 @@ class DataCleaningView(ctk.CTkScrollableFrame):
     def populate_column_options(self):
         columns = [col for col in self.data_manager.get_data().columns]
         self.column_select.configure(values=columns)
+        self.near_column_select.configure(values=columns)
         if columns:
             self.column_var.set(columns[0])
+        if columns and self.near_column_var.get() not in columns:
+            self.near_column_var.set(columns[0])
 
     def display_missing_details(self):        
         total_records = len(self.data_manager.get_data())
-        missing_rows = self.data_manager.get_data()[self.data_manager.get_data().isnull().any(axis=1)]
-        missing_count = len(missing_rows)
+        missing_count = self.data_manager.get_missing_values_count()
         
         if missing_count > 0:
-            missing_rows = missing_rows.reset_index().rename(columns={"index": "Index"})
-            missing_details = missing_rows.to_dict("records")
-            
-            self.missing_details_table.display_data(missing_details)
+            self.missing_details_table.display_frame(self.data_manager.get_missing_rows())
             self.missing_info_label.configure(text=f"Total records with missing values: {missing_count}/{total_records}")
             self.fill_above_button.configure(state="normal")
             self.fill_below_button.configure(state="normal")
             self.remove_missing_button.configure(state="normal")
         else:
-            self.missing_details_table.display_data([{"Column": "No missing values", "Index": ""}])
+            self.missing_details_table.display_frame(None)
             self.missing_info_label.configure(text=f"Total records with missing values: 0/{total_records}")
             self.fill_above_button.configure(state="disabled")
             self.fill_below_button.configure(state="disabled")
@@ -108,32 +144,34 @@ class DataCleaningView(ctk.CTkScrollableFrame):
         duplicates_count = len(duplicates)
         
         if not duplicates.empty:
-            duplicates_data = duplicates.to_dict("records")
-            self.duplicates_table.display_data(duplicates_data)
+            self.duplicates_table.display_frame(duplicates)
             self.duplicates_info_label.configure(text=f"Total duplicate records: {duplicates_count}/{total_records}")
             self.remove_duplicates_button.configure(state="normal")
         else:
-            self.duplicates_table.display_data([{"Message": "No duplicate records found"}])
+            self.duplicates_table.display_frame(None)
             self.duplicates_info_label.configure(text=f"Total duplicate records: 0/{total_records}")
             self.remove_duplicates_button.configure(state="disabled")
 
     def fill_missing_from_above(self):
-        progress_dialog = ProgressDialog(self, title="Filling Missing Values", message="Filling missing values from above...")
-        self.data_manager.fill_missing_from_above()
-        progress_dialog.stop_progress()
-        self.display_missing_details()
+        run_in_background(
+            self, self.data_manager.fill_missing_from_above,
+            title="Filling Missing Values", message="Filling missing values from above...",
+            on_finished=lambda task: self.display_missing_details()
+        )
 
     def fill_missing_from_below(self):
-        progress_dialog = ProgressDialog(self, title="Filling Missing Values", message="Filling missing values from below...")
-        self.data_manager.fill_missing_from_below()
-        progress_dialog.stop_progress()
-        self.display_missing_details()
+        run_in_background(
+            self, self.data_manager.fill_missing_from_below,
+            title="Filling Missing Values", message="Filling missing values from below...",
+            on_finished=lambda task: self.display_missing_details()
+        )
 
     def remove_missing_values(self):
-        progress_dialog = ProgressDialog(self, title="Removing Missing Values", message="Removing missing values...")
-        self.data_manager.drop_missing_values()
-        progress_dialog.stop_progress()
-        self.display_missing_details()
+        run_in_background(
+            self, self.data_manager.drop_missing_values,
+            title="Removing Missing Values", message="Removing missing values...",
+            on_finished=lambda task: self.display_missing_details()
+        )
 
     def apply_manual_entry(self):
         column = self.column_var.get()
@@ -148,7 +186,69 @@ class DataCleaningView(ctk.CTkScrollableFrame):
             print("Invalid index value. Please enter a numeric index.")
 
     def remove_duplicates(self):
-        progress_dialog = ProgressDialog(self, title="Removing Duplicates", message="Removing duplicate records...")
-        self.data_manager.remove_duplicates()
-        progress_dialog.stop_progress()
+        run_in_background(
+            self, self.data_manager.remove_duplicates,
+            title="Removing Duplicates", message="Removing duplicate records...",
+            on_finished=lambda task: self.display_duplicates()
+        )
+
+    def near_duplicate_threshold(self):
+        try:
+            threshold = float(self.near_threshold_var.get())
+            if not 0 < threshold <= 1:
+                raise ValueError
+            return threshold
+        except ValueError:
+            self.near_duplicates_info_label.configure(text="Similarity must be a number between 0 and 1.")
+            return None
+
+    def find_near_duplicates(self):
+        threshold = self.near_duplicate_threshold()
+        if threshold is None:
+            return
+        run_in_background(
+            self, self.data_manager.get_near_duplicates, self.near_column_var.get(), threshold,
+            title="Finding Near Duplicates", message="Hashing and bucketing texts...",
+            on_finished=self.near_duplicates_found
+        )
+
+    def near_duplicates_found(self, task):
+        if task.status != COMPLETED:
+            return
+        clusters = task.result
+        if clusters.empty:
+            self.near_duplicates_table.display_frame(None)
+            self.near_duplicates_info_label.configure(text="No near duplicate records found")
+            return
+        self.near_duplicates_table.display_frame(clusters)
+        self.near_duplicates_info_label.configure(
+            text=f"{len(clusters)} records in {clusters['near_duplicate_cluster'].nunique()} near duplicate clusters"
+        )
+
+    def flag_near_duplicates(self):
+        threshold = self.near_duplicate_threshold()
+        if threshold is None:
+            return
+        run_in_background(
+            self, self.data_manager.flag_near_duplicates, self.near_column_var.get(), threshold,
+            title="Flagging Near Duplicates", message="Hashing and bucketing texts...",
+            on_finished=lambda task: self.near_duplicates_changed(task, "Flagged")
+        )
+
+    def remove_near_duplicates(self):
+        threshold = self.near_duplicate_threshold()
+        if threshold is None:
+            return
+        run_in_background(
+            self, self.data_manager.remove_near_duplicates, self.near_column_var.get(), threshold,
+            title="Removing Near Duplicates", message="Hashing and bucketing texts...",
+            on_finished=lambda task: self.near_duplicates_changed(task, "Removed")
+        )
+
+    def near_duplicates_changed(self, task, verb):
+        if task.status == COMPLETED:
+            self.near_duplicates_info_label.configure(text=f"{verb} {task.result} near duplicate records")
+        self.near_duplicates_table.display_frame(None)
+        self.populate_column_options()
+        self.display_missing_details()
         self.display_duplicates()
@@ -90,10 +90,10 @@ class DataExplorationView(ctk.CTkScrollableFrame):
 
     def show_text_length_distribution(self):
         column = self.column_var.get()
-        if column and column in self.data_manager.get_data():
-            text_lengths = self.data_manager.get_data()[column].str.len()
+        text_lengths = self.data_manager.get_text_lengths(column) if column else None
+        if text_lengths is not None:
             plt.figure(figsize=(8, 4))
-            plt.hist(text_lengths, bins=30, color='skyblue', edgecolor='black')
+            plt.hist(text_lengths.dropna().astype(float), bins=30, color='skyblue', edgecolor='black')
             plt.title(f"Text Length Distribution for '{column}'")
             plt.xlabel("Text Length")
             plt.ylabel("Frequency")
@@ -1,7 +1,11 @@
+import os
 import customtkinter as ctk
 from tkinter import filedialog, ttk
-from modules.data_manager import DataManager
-from ..components.progress_dialog import ProgressDialog
+from modules.data_manager import DataManager, DEFAULT_CHUNKSIZE
+from modules.task_executor import CANCELLED, COMPLETED
+from ..components.progress_dialog import run_in_background
+
+CHUNKED_LOADING_THRESHOLD_BYTES = 256 * 1024 * 1024
 
 class DataLoadingView(ctk.CTkFrame):
     def __init__(self, master, data_manager=None, navigation_bar=None, on_data_loaded=None, **kwargs):
@@ -35,26 +39,39 @@ class DataLoadingView(ctk.CTkFrame):
     def load_data(self):
         file_path = filedialog.askopenfilename(
             title="Select Data File", 
-            filetypes=[("CSV and JSON Files", "*.csv *.json"), ("CSV Files", "*.csv"), ("JSON Files", "*.json"), ("All Files", "*.*")]
+            filetypes=[
+                ("Supported Files", "*.csv *.json *.jsonl *.parquet *.pq *.feather *.arrow"),
+                ("CSV Files", "*.csv"),
+                ("JSON Files", "*.json *.jsonl"),
+                ("Parquet Files", "*.parquet *.pq"),
+                ("Feather Files", "*.feather *.arrow"),
+                ("All Files", "*.*")
+            ]
         )
         if file_path:
             self.show_progress_dialog(file_path)
 
     def show_progress_dialog(self, file_path):
-        progress_dialog = ProgressDialog(self, title="Loading Data", message="Loading data, please wait...")
-        self.after(100, lambda: self.run_data_loading(progress_dialog, file_path))
-        
-    def run_data_loading(self, progress_dialog, file_path):
-        success = self.data_manager.load_data(file_path)
-        progress_dialog.stop_progress()
-        
-        if success:
+        chunksize = None
+        if os.path.exists(file_path) and os.path.getsize(file_path) > CHUNKED_LOADING_THRESHOLD_BYTES:
+            chunksize = DEFAULT_CHUNKSIZE
+        run_in_background(
+            self, self.data_manager.load_data, file_path, chunksize=chunksize,
+            title="Loading Data", message="Loading data, please wait...",
+            on_finished=lambda task: self.data_loading_finished(task, file_path)
+        )
+
+    def data_loading_finished(self, task, file_path):
+        if task.status == COMPLETED and task.result:
             self.status_label.configure(text=f"Loaded: {file_path}", text_color="green")
             self.display_data_in_table()
+            self.data_manager.warm_up_nlp()
             if self.navigation_bar:
                 self.navigation_bar.set_next_enabled(True) 
             if self.on_data_loaded:
                 self.on_data_loaded(file_path)
+        elif task.status == CANCELLED:
+            self.status_label.configure(text="Loading cancelled", text_color="grey")
         else:
             self.status_label.configure(text="Failed to load data", text_color="red")
             if self.navigation_bar:
@@ -1,7 +1,8 @@
 import customtkinter as ctk
 from tkinter import filedialog
-from ..components.universal_table import UniversalTable
-from ..components.progress_dialog import ProgressDialog
+from modules.task_executor import COMPLETED
+from ..components.virtual_table import VirtualTable
+from ..components.progress_dialog import run_in_background
 
 class DataSplittingView(ctk.CTkScrollableFrame):
     def __init__(self, master, data_manager=None, navigation_bar=None, **kwargs):
@@ -25,27 +26,83 @@ class DataSplittingView(ctk.CTkScrollableFrame):
         self.split_ratio_entry.pack(side="left", padx=5)
         self.split_ratio_entry.bind("<KeyRelease>", self.update_slider_from_entry)
 
+        self.options_frame = ctk.CTkFrame(self, fg_color="#1E1E1E")
+        self.options_frame.pack(pady=5, fill="x", expand=True)
+
+        self.stratify_label = ctk.CTkLabel(self.options_frame, text="Stratify by")
+        self.stratify_label.pack(side="left", padx=5)
+
+        self.stratify_var = ctk.StringVar(value="None")
+        self.stratify_select = ctk.CTkOptionMenu(self.options_frame, variable=self.stratify_var, values=["None"])
+        self.stratify_select.pack(side="left", padx=5)
+
+        self.validation_label = ctk.CTkLabel(self.options_frame, text="Validation (%)")
+        self.validation_label.pack(side="left", padx=5)
+
+        self.validation_entry = ctk.CTkEntry(self.options_frame, width=50)
+        self.validation_entry.insert(0, "0")
+        self.validation_entry.pack(side="left", padx=5)
+
+        self.seed_label = ctk.CTkLabel(self.options_frame, text="Seed")
+        self.seed_label.pack(side="left", padx=5)
+
+        self.seed_entry = ctk.CTkEntry(self.options_frame, width=60)
+        self.seed_entry.insert(0, "1")
+        self.seed_entry.pack(side="left", padx=5)
+
         self.split_button = ctk.CTkButton(self, text="Split Data", command=self.split_data)
         self.split_button.pack(pady=5, fill="x", expand=True)
 
         self.records_label = ctk.CTkLabel(self, text="Total Records: 0")
         self.records_label.pack(pady=(5, 10))
 
-        self.train_data_label = ctk.CTkLabel(self, text="Training Data Sample")
+        self.train_data_label = ctk.CTkLabel(self, text="Training Data")
         self.train_data_label.pack(pady=(10, 5))
-        self.train_data_table = UniversalTable(self, data_list=[], empty_message="No training data available")
+        self.train_data_table = VirtualTable(self, empty_message="No training data available")
         self.train_data_table.pack(pady=5, fill="both", expand=True)
 
-        self.test_data_label = ctk.CTkLabel(self, text="Testing Data Sample")
+        self.test_data_label = ctk.CTkLabel(self, text="Testing Data")
         self.test_data_label.pack(pady=(10, 5))
-        self.test_data_table = UniversalTable(self, data_list=[], empty_message="No testing data available")
+        self.test_data_table = VirtualTable(self, empty_message="No testing data available")
         self.test_data_table.pack(pady=5, fill="both", expand=True)
 
+        self.leakage_frame = ctk.CTkFrame(self, fg_color="#1E1E1E")
+        self.leakage_frame.pack(pady=5, fill="x", expand=True)
+
+        self.leakage_column_label = ctk.CTkLabel(self.leakage_frame, text="Leakage check column")
+        self.leakage_column_label.pack(side="left", padx=5)
+
+        self.leakage_column_var = ctk.StringVar()
+        self.leakage_column_select = ctk.CTkOptionMenu(self.leakage_frame, variable=self.leakage_column_var, values=[])
+        self.leakage_column_select.pack(side="left", padx=5)
+
+        self.leakage_button = ctk.CTkButton(self.leakage_frame, text="Check Train/Test Leakage", command=lambda: self.check_leakage(False))
+        self.leakage_button.pack(side="left", padx=5)
+
+        self.remove_leakage_button = ctk.CTkButton(self.leakage_frame, text="Drop Leaking Test Rows", command=lambda: self.check_leakage(True), fg_color="#c24c4c", hover_color="#9c3636")
+        self.remove_leakage_button.pack(side="left", padx=5)
+
+        self.leakage_label = ctk.CTkLabel(self, text="")
+        self.leakage_label.pack(pady=(5, 10))
+
+        self.compress_var = ctk.BooleanVar(value=False)
+        self.compress_checkbox = ctk.CTkCheckBox(self, text="Compress output (gzip)", variable=self.compress_var)
+        self.compress_checkbox.pack(pady=(10, 0))
+
         self.save_button = ctk.CTkButton(self, text="Save Splits to Files", command=self.save_splits)
         self.save_button.pack(pady=10, fill="x", expand=True)
 
         self.display_record_count()
-        
+        self.populate_stratify_options()
+
+    def populate_stratify_options(self):
+        data = self.data_manager.get_data()
+        columns = list(data.columns) if data is not None else []
+        self.stratify_select.configure(values=["None"] + columns)
+        self.leakage_column_select.configure(values=columns)
+        if columns:
+            self.leakage_column_var.set("fasttext_line" if "fasttext_line" in columns else columns[0])
+
     def update_split_entry(self, value):
         self.split_ratio_entry.delete(0, "end")
         self.split_ratio_entry.insert(0, str(int(float(value))))
@@ -63,31 +120,72 @@ class DataSplittingView(ctk.CTkScrollableFrame):
             split_ratio = float(self.split_ratio_entry.get()) / 100.0
             if not 0 < split_ratio < 1:
                 raise ValueError("Split ratio must be between 1 and 99.")
+            validation_ratio = float(self.validation_entry.get() or 0) / 100.0
+            if not 0 <= validation_ratio < 1 - split_ratio:
+                raise ValueError("Validation ratio must leave room for the test set.")
+            seed = int(self.seed_entry.get() or 1)
+            stratify_column = self.stratify_var.get()
+            if stratify_column == "None":
+                stratify_column = None
+
+            run_in_background(
+                self, self.data_manager.split_data, split_ratio, validation_ratio, stratify_column, seed,
+                title="Splitting Data", message="Splitting data into training and testing sets...",
+                on_finished=self.split_finished
+            )
+        except ValueError as e:
+            print(f"Invalid split ratio: {e}")
 
-            progress_dialog = ProgressDialog(self, title="Splitting Data", message="Splitting data into training and testing sets...")
-            self.data_manager.split_data(split_ratio)
-            progress_dialog.stop_progress()
+    def split_finished(self, task):
+        if task.status == COMPLETED:
+            self.display_train_test_samples()
 
+    def check_leakage(self, remove):
+        if self.data_manager.train_indices is None:
+            self.leakage_label.configure(text="Split the data before checking for leakage.")
+            return
+        run_in_background(
+            self, self.data_manager.check_split_leakage, self.leakage_column_var.get(), remove=remove,
+            title="Checking Leakage", message="Looking for near duplicates across the splits...",
+            on_finished=self.leakage_checked
+        )
+
+    def leakage_checked(self, task):
+        if task.status != COMPLETED or not task.result:
+            return
+        results = task.result
+        text = (f"{results['Leaking test rows']} of {results['Test rows']} test rows have a near duplicate "
+                f"in the training data ({results['Leaking test clusters']} clusters)")
+        if results["Leaking validation rows"]:
+            text += f", {results['Leaking validation rows']} validation rows"
+        if "Removed rows" in results:
+            text += f". Dropped {results['Removed rows']} rows from the evaluation splits."
             self.display_train_test_samples()
-        except ValueError as e:
-            print(f"Invalid split ratio: {e}")
+        self.leakage_label.configure(text=text)
 
     def display_record_count(self):
         total_records = len(self.data_manager.get_data()) if self.data_manager.get_data() is not None else 0
         self.records_label.configure(text=f"Total Records: {total_records}")
 
     def display_train_test_samples(self):
-        train_sample = self.data_manager.get_train_data().head(500).to_dict("records")
-        test_sample = self.data_manager.get_test_data().head(500).to_dict("records")
-        self.train_data_table.display_data(train_sample)
-        self.test_data_table.display_data(test_sample)
+        data = self.data_manager.get_data()
+        for table, indices in ((self.train_data_table, self.data_manager.train_indices),
+                               (self.test_data_table, self.data_manager.test_indices)):
+            table.display_frame(data if indices is not None else None, indices)
 
     def save_splits(self):
-        train_file_path = filedialog.asksaveasfilename(defaultextension=".txt", title="Save Training Data")
-        test_file_path = filedialog.asksaveasfilename(defaultextension=".txt", title="Save Testing Data")
+        compress = self.compress_var.get()
+        extension = ".txt.gz" if compress else ".txt"
+        train_file_path = filedialog.asksaveasfilename(defaultextension=extension, title="Save Training Data")
+        test_file_path = filedialog.asksaveasfilename(defaultextension=extension, title="Save Testing Data")
+        validation_file_path = None
+        if self.data_manager.validation_indices is not None:
+            validation_file_path = filedialog.asksaveasfilename(defaultextension=extension, title="Save Validation Data")
         self.navigation_bar.set_next_enabled(True) 
         
         if train_file_path and test_file_path:
-            progress_dialog = ProgressDialog(self, title="Saving Splits", message="Saving training and testing data to files...")
-            self.data_manager.save_splits(train_file_path, test_file_path)
-            progress_dialog.stop_progress()
+            run_in_background(
+                self, self.data_manager.save_splits, train_file_path, test_file_path,
+                compress=compress, validation_file_path=validation_file_path,
+                title="Saving Splits", message="Saving training and testing data to files..."
+            )
@@ -0,0 +1,180 @@
+import customtkinter as ctk
+import queue
+import threading
+from modules.hyperparameter_search import HyperparameterSearch, SearchResultsStore, SEARCH_METRICS, SEARCH_STRATEGIES
+from modules.fasttext_manager import available_cores
+from ..components.universal_table import UniversalTable
+
+POLL_INTERVAL_MS = 200
+
+
+class HyperparameterSearchView(ctk.CTkScrollableFrame):
+    def __init__(self, master, fasttext_manager=None, navigation_bar=None, **kwargs):
+        super().__init__(master, fg_color="#1E1E1E", **kwargs)
+
+        self.fasttext_manager = fasttext_manager
+        self.navigation_bar = navigation_bar
+        self.store = SearchResultsStore()
+        self.search = None
+        self.search_thread = None
+        self.stop_search = False
+        self.events = queue.Queue()
+
+        self.create_ui()
+        self.show_leaderboard()
+
+    def create_ui(self):
+        title_label = ctk.CTkLabel(self, text="Hyperparameter Search", font=("Arial", 18, "bold"), text_color="white")
+        title_label.pack(pady=(20, 10))
+
+        self.info_label = ctk.CTkLabel(
+            self, text="Searches lr, epoch, dim, wordNgrams, loss and minCount, scoring trials on the validation file.",
+            text_color="grey", font=("Arial", 14)
+        )
+        self.info_label.pack(pady=10)
+
+        options_frame = ctk.CTkFrame(self, fg_color="#1E1E1E")
+        options_frame.pack(pady=5)
+
+        ctk.CTkLabel(options_frame, text="Strategy").grid(row=0, column=0, padx=5, pady=5, sticky="w")
+        self.strategy_var = ctk.StringVar(value="successive_halving")
+        ctk.CTkOptionMenu(options_frame, variable=self.strategy_var, values=SEARCH_STRATEGIES).grid(
+            row=0, column=1, padx=5, pady=5
+        )
+
+        ctk.CTkLabel(options_frame, text="Metric").grid(row=0, column=2, padx=5, pady=5, sticky="w")
+        self.metric_var = ctk.StringVar(value="f1")
+        ctk.CTkOptionMenu(options_frame, variable=self.metric_var, values=SEARCH_METRICS).grid(
+            row=0, column=3, padx=5, pady=5
+        )
+
+        ctk.CTkLabel(options_frame, text="Trials").grid(row=1, column=0, padx=5, pady=5, sticky="w")
+        self.trials_entry = ctk.CTkEntry(options_frame, width=80)
+        self.trials_entry.insert(0, "27")
+        self.trials_entry.grid(row=1, column=1, padx=5, pady=5)
+
+        ctk.CTkLabel(options_frame, text="Parallel Trials").grid(row=1, column=2, padx=5, pady=5, sticky="w")
+        self.parallel_entry = ctk.CTkEntry(options_frame, width=80)
+        self.parallel_entry.insert(0, str(available_cores()))
+        self.parallel_entry.grid(row=1, column=3, padx=5, pady=5)
+
+        self.start_button = ctk.CTkButton(self, text="Start Search", fg_color="#4CAF50", command=self.start_search)
+        self.start_button.pack(pady=10)
+
+        self.stop_button = ctk.CTkButton(self, text="Stop Search", fg_color="#FF5733", command=self.stop_search_button, state="disabled")
+        self.stop_button.pack(pady=10)
+
+        self.progress_label = ctk.CTkLabel(self, text="", text_color="white")
+        self.progress_label.pack(pady=5)
+
+        leaderboard_label = ctk.CTkLabel(self, text="Leaderboard", font=("Arial", 14, "bold"), text_color="white")
+        leaderboard_label.pack(pady=(10, 5))
+
+        self.leaderboard_table = UniversalTable(self, data_list=[], empty_message="No search results yet")
+        self.leaderboard_table.pack(pady=5, fill="both", expand=True)
+
+        self.apply_button = ctk.CTkButton(self, text="Apply Best Parameters", command=self.apply_best_params)
+        self.apply_button.pack(pady=10)
+
+    def start_search(self):
+        if self.fasttext_manager.train_file is None or self.fasttext_manager.validation_file is None:
+            self.info_label.configure(text="Set the train and validation files in Model Configuration before searching.", text_color="red")
+            return
+
+        try:
+            trials = int(self.trials_entry.get())
+            parallel = int(self.parallel_entry.get())
+            self.search = HyperparameterSearch(
+                self.fasttext_manager,
+                strategy=self.strategy_var.get(),
+                trials=trials,
+                parallel=parallel,
+                metric=self.metric_var.get(),
+                store=self.store
+            )
+        except ValueError as e:
+            self.info_label.configure(text=f"Invalid search settings: {e}", text_color="red")
+            return
+
+        self.stop_search = False
+        self.start_button.configure(state="disabled")
+        self.stop_button.configure(state="normal")
+        self.progress_label.configure(text="Search running...")
+
+        self.search_thread = threading.Thread(target=self.run_search, daemon=True)
+        self.search_thread.start()
+        self.after(POLL_INTERVAL_MS, self.poll_events)
+
+    def run_search(self):
+        try:
+            self.search.run(on_trial=self.events.put, should_stop=lambda: self.stop_search)
+        except Exception as e:
+            self.events.put({"status": "error", "error": str(e)})
+        self.events.put({"status": "finished"})
+
+    def stop_search_button(self):
+        self.stop_search = True
+        self.progress_label.configure(text="Stopping after the running trials finish...")
+
+    def poll_events(self):
+        finished = False
+        trials_seen = False
+        while True:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                break
+
+            if event["status"] == "finished":
+                finished = True
+            elif event["status"] == "error":
+                self.info_label.configure(text=f"Search failed: {event['error']}", text_color="red")
+            elif event["status"] == "test":
+                self.info_label.configure(
+                    text=f"Best parameters on the test file: precision {event['precision']:.4f}, "
+                         f"recall {event['recall']:.4f}, F1 {event['f1']:.4f}",
+                    text_color="green"
+                )
+            else:
+                trials_seen = True
+                score = event.get(self.search.metric)
+                score_text = f"{score:.4f}" if score is not None else event.get("error", "")
+                self.progress_label.configure(
+                    text=f"Rung {event['rung']} trial {event['status']}: {event['params']} -> {score_text}"
+                )
+
+        if trials_seen or finished:
+            self.show_leaderboard()
+
+        if finished:
+            self.start_button.configure(state="normal")
+            self.stop_button.configure(state="disabled")
+            self.progress_label.configure(text="Search finished." if not self.stop_search else "Search stopped.")
+        else:
+            self.after(POLL_INTERVAL_MS, self.poll_events)
+
+    def show_leaderboard(self):
+        search_id = self.search.search_id if self.search is not None else None
+        metric = self.metric_var.get()
+        rows = []
+        for rank, entry in enumerate(self.store.leaderboard(search_id, metric), start=1):
+            rows.append({
+                "Rank": rank,
+                "Rung": entry["rung"],
+                "Parameters": ", ".join(f"{key}={value}" for key, value in entry["params"].items()),
+                "Precision": f"{entry['precision']:.4f}",
+                "Recall": f"{entry['recall']:.4f}",
+                "F1": f"{entry['f1']:.4f}",
+                "Time (s)": f"{entry['duration']:.1f}"
+            })
+        self.leaderboard_table.display_data(rows)
+
+    def apply_best_params(self):
+        search_id = self.search.search_id if self.search is not None else None
+        leaderboard = self.store.leaderboard(search_id, self.metric_var.get(), limit=1)
+        if not leaderboard:
+            self.info_label.configure(text="No completed trials to apply.", text_color="red")
+            return
+
+        self.fasttext_manager.set_params(leaderboard[0]["params"])
+        self.info_label.configure(text=f"Applied parameters: {leaderboard[0]['params']}", text_color="green")
@@ -1,6 +1,6 @@
 import customtkinter as ctk
 from ..components.universal_table import UniversalTable
-from ..components.progress_dialog import ProgressDialog
+from ..components.progress_dialog import run_in_background
 
 class LabelPreparationView(ctk.CTkScrollableFrame):
     def __init__(self, master, data_manager=None, navigation_bar=None, **kwargs):
@@ -34,12 +34,11 @@ class LabelPreparationView(ctk.CTkScrollableFrame):
 
     def add_fasttext_prefix(self):
         column = self.column_var.get()
-        progress_dialog = ProgressDialog(self, title="Adding fastText Prefix", message="Adding __label__ prefix to labels...")
-        
-        self.data_manager.add_fasttext_prefix(column)
-        
-        progress_dialog.stop_progress()
-        self.display_processed_data()
+        run_in_background(
+            self, self.data_manager.add_fasttext_prefix, column,
+            title="Adding fastText Prefix", message="Adding __label__ prefix to labels...",
+            on_finished=lambda task: self.display_processed_data()
+        )
 
     def display_processed_data(self):
         processed_data = self.data_manager.get_data().head(50).to_dict("records")
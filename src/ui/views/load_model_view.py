@@ -83,5 +83,16 @@ class LoadModelView(ctk.CTkScrollableFrame):
             self.log_message(f"Number of Examples: {num_examples}")
             self.log_message(f"Accuracy: {accuracy:.4f}")
             self.log_message(f"Recall: {recall:.4f}")
+            self.log_message(f"Precision: {results.get('Precision', 0):.4f}")
+            self.log_message(f"F1: {results.get('F1', 0):.4f}")
+
+            per_label = results.get("Per Label")
+            if per_label is not None:
+                self.log_message("Per Label Results:")
+                for row in per_label.sort_values("Support", ascending=False).itertuples(index=False):
+                    self.log_message(
+                        f"{row.Label}: precision {row.Precision:.4f}, recall {row.Recall:.4f}, "
+                        f"F1 {row.F1:.4f}, support {row.Support}"
+                    )
         except Exception as e:
             self.log_message(f"Failed to evaluate model: {e}")
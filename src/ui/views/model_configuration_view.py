@@ -1,6 +1,6 @@
 import customtkinter as ctk
 from tkinter import filedialog
-from modules.fasttext_manager import FastTextManager
+from modules.fasttext_manager import FastTextManager, available_cores
 
 class ModelConfigurationView(ctk.CTkFrame):
     def __init__(self, master, fasttext_manager=None, navigation_bar=None, **kwargs):
@@ -11,6 +11,7 @@ class ModelConfigurationView(ctk.CTkFrame):
         
         self.train_data_path = None
         self.test_data_path = None
+        self.validation_data_path = None
         
         self.param_entries = {}
         self.default_values = {
@@ -19,10 +20,19 @@ class ModelConfigurationView(ctk.CTkFrame):
             "Dimension": ("100", "Size of word vectors", "int"),
             "Word N-Grams": ("2", "Max n-grams length", "int"),
             "Loss Function": ("softmax", "Type of loss function", None),
-            "Min Count": ("1", "Minimum count of word occurrences", "int")
+            "Min Count": ("1", "Minimum count of word occurrences", "int"),
+            "Min Label Count": ("0", "Minimum count of label occurrences", "int"),
+            "Context Window": ("5", "Size of the context window", "int"),
+            "Min Char N-Gram": ("0", "Min length of char n-grams", "int"),
+            "Max Char N-Gram": ("0", "Max length of char n-grams", "int"),
+            "Negatives Sampled": ("5", "Number of negatives sampled", "int"),
+            "Buckets": ("2000000", "Number of hash buckets", "int"),
+            "Threads": (str(available_cores()), "Number of training threads", "int"),
+            "LR Update Rate": ("100", "Rate of learning rate updates", "int"),
+            "Sampling Threshold": ("0.0001", "Sampling threshold", "float")
         }
 
-        self.loss_options = ["softmax", "ova"]
+        self.loss_options = ["softmax", "ova", "ns", "hs"]
         self.parameters_added = False
         self.save_button = None 
 
@@ -52,14 +62,23 @@ class ModelConfigurationView(ctk.CTkFrame):
         train_btn.pack(side="right", padx=(5, 10))
 
         test_frame = ctk.CTkFrame(self, fg_color="#2b2b2b", corner_radius=8)
-        test_frame.pack(fill="x", padx=20, pady=(5, 20))
+        test_frame.pack(fill="x", padx=20, pady=5)
 
         ctk.CTkLabel(test_frame, text="Testing Data Path:", text_color="white").pack(side="left", padx=(10, 5))
         self.test_path_label = ctk.CTkLabel(test_frame, text="Not Selected", text_color="grey")
         self.test_path_label.pack(side="left", expand=True, padx=(5, 5))
         test_btn = ctk.CTkButton(test_frame, text="Browse", command=self.select_test_data)
         test_btn.pack(side="right", padx=(5, 10))
-        
+
+        validation_frame = ctk.CTkFrame(self, fg_color="#2b2b2b", corner_radius=8)
+        validation_frame.pack(fill="x", padx=20, pady=(5, 20))
+
+        ctk.CTkLabel(validation_frame, text="Validation Data Path (optional):", text_color="white").pack(side="left", padx=(10, 5))
+        self.validation_path_label = ctk.CTkLabel(validation_frame, text="Not Selected", text_color="grey")
+        self.validation_path_label.pack(side="left", expand=True, padx=(5, 5))
+        validation_btn = ctk.CTkButton(validation_frame, text="Browse", command=self.select_validation_data)
+        validation_btn.pack(side="right", padx=(5, 10))
+
         self.confirm_button = ctk.CTkButton(self, text="Confirm Paths", fg_color="#4CAF50", command=self.confirm_paths)
         self.confirm_button.pack(pady=(10, 20))
 
@@ -100,6 +119,20 @@ class ModelConfigurationView(ctk.CTkFrame):
 
         self.table_frame.grid_columnconfigure(1, weight=1)
 
+        self.autotune_frame = ctk.CTkFrame(self.param_section, fg_color="#333333", corner_radius=8)
+        self.autotune_frame.pack(fill="x", padx=10, pady=(10, 5))
+
+        self.autotune_var = ctk.BooleanVar(value=self.fasttext_manager.autotune)
+        self.autotune_checkbox = ctk.CTkCheckBox(
+            self.autotune_frame, text="Autotune on the validation file", variable=self.autotune_var
+        )
+        self.autotune_checkbox.pack(side="left", padx=10, pady=5)
+
+        ctk.CTkLabel(self.autotune_frame, text="Time budget (s):", text_color="white").pack(side="left", padx=(10, 5))
+        self.autotune_duration_entry = ctk.CTkEntry(self.autotune_frame, width=80)
+        self.autotune_duration_entry.insert(0, str(self.fasttext_manager.autotune_duration))
+        self.autotune_duration_entry.pack(side="left", padx=5, pady=5)
+
         self.save_button = ctk.CTkButton(self.param_section, text="Save Parameters", fg_color="#4CAF50", command=self.save_parameters)
         self.save_button.pack(pady=(20, 10))
 
@@ -109,6 +142,7 @@ class ModelConfigurationView(ctk.CTkFrame):
         if self.train_data_path and self.test_data_path:
             self.fasttext_manager.set_train_file(self.train_data_path)
             self.fasttext_manager.set_test_file(self.test_data_path)
+            self.fasttext_manager.set_validation_file(self.validation_data_path)
             self.status_label.configure(text="Paths confirmed successfully!", text_color="green")
             self.param_section.pack(fill="both", expand=True, padx=20, pady=(10, 20))
             self.setup_parameter_table()
@@ -129,8 +163,17 @@ class ModelConfigurationView(ctk.CTkFrame):
                     self.status_label.configure(text=f"Invalid value for {key}. Must be a float.", text_color="red")
                     return
             params[key] = value
-        
+
+        autotune_duration = self.autotune_duration_entry.get()
+        if self.autotune_var.get() and not autotune_duration.isdigit():
+            self.status_label.configure(text="Invalid autotune time budget. Must be an integer.", text_color="red")
+            return
+        if self.autotune_var.get() and not self.fasttext_manager.validation_file:
+            self.status_label.configure(text="Autotune needs a validation data file.", text_color="red")
+            return
+
         self.fasttext_manager.set_params(params)
+        self.fasttext_manager.set_autotune(self.autotune_var.get(), autotune_duration if autotune_duration.isdigit() else None)
         self.status_label.configure(text="Parameters saved successfully!", text_color="green")
         self.navigation_bar.set_next_enabled(True)
 
@@ -145,3 +188,10 @@ class ModelConfigurationView(ctk.CTkFrame):
         if file_path:
             self.test_data_path = file_path
             self.test_path_label.configure(text=file_path, text_color="green")
+
+    def select_validation_data(self):
+        file_path = filedialog.askopenfilename(title="Select Validation Data File", filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")])
+        if file_path:
+            self.validation_data_path = file_path
+            self.validation_path_label.configure(text=file_path, text_color="green")
+            self.fasttext_manager.set_validation_file(file_path)
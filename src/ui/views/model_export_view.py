@@ -1,6 +1,9 @@
 import customtkinter as ctk
 from tkinter import filedialog
 from modules.fasttext_manager import FastTextManager
+from modules.task_executor import CANCELLED, COMPLETED
+from ..components.progress_dialog import run_in_background
+from ..components.universal_table import UniversalTable
 
 class ModelExportView(ctk.CTkScrollableFrame):
     def __init__(self, master, fasttext_manager=None, navigation_bar=None, **kwargs):
@@ -17,6 +20,47 @@ class ModelExportView(ctk.CTkScrollableFrame):
         self.status_label = ctk.CTkLabel(self, text="", text_color="green")
         self.status_label.pack(pady=(10, 5))
 
+        self.quantize_label = ctk.CTkLabel(self, text="Quantization", font=("Arial", 14, "bold"))
+        self.quantize_label.pack(pady=(20, 5))
+
+        self.quantize_frame = ctk.CTkFrame(self, fg_color="#1E1E1E")
+        self.quantize_frame.pack(pady=5)
+
+        self.cutoff_label = ctk.CTkLabel(self.quantize_frame, text="Cutoff (0 = keep all words)")
+        self.cutoff_label.grid(row=0, column=0, padx=5, pady=5, sticky="w")
+        self.cutoff_entry = ctk.CTkEntry(self.quantize_frame, width=100)
+        self.cutoff_entry.insert(0, "0")
+        self.cutoff_entry.grid(row=0, column=1, padx=5, pady=5)
+
+        self.dsub_label = ctk.CTkLabel(self.quantize_frame, text="Sub-vector Size (dsub)")
+        self.dsub_label.grid(row=1, column=0, padx=5, pady=5, sticky="w")
+        self.dsub_entry = ctk.CTkEntry(self.quantize_frame, width=100)
+        self.dsub_entry.insert(0, "2")
+        self.dsub_entry.grid(row=1, column=1, padx=5, pady=5)
+
+        self.qnorm_var = ctk.BooleanVar(value=False)
+        self.qnorm_checkbox = ctk.CTkCheckBox(self.quantize_frame, text="Quantize norm (qnorm)", variable=self.qnorm_var)
+        self.qnorm_checkbox.grid(row=2, column=0, padx=5, pady=5, sticky="w")
+
+        self.qout_var = ctk.BooleanVar(value=False)
+        self.qout_checkbox = ctk.CTkCheckBox(self.quantize_frame, text="Quantize classifier (qout)", variable=self.qout_var)
+        self.qout_checkbox.grid(row=2, column=1, padx=5, pady=5, sticky="w")
+
+        self.retrain_var = ctk.BooleanVar(value=False)
+        self.retrain_checkbox = ctk.CTkCheckBox(self.quantize_frame, text="Retrain after cutoff", variable=self.retrain_var)
+        self.retrain_checkbox.grid(row=3, column=0, padx=5, pady=5, sticky="w")
+
+        self.preview_button = ctk.CTkButton(self, text="Preview Quantization", command=self.preview_quantization)
+        self.preview_button.pack(pady=(10, 5))
+
+        self.quantize_table = UniversalTable(self, data_list=[], empty_message="Run a preview to compare the models")
+        self.quantize_table.pack(pady=5, fill="both", expand=True)
+
+        self.export_quantized_button = ctk.CTkButton(
+            self, text="Export Quantized Model (.ftz)", command=self.save_quantized_model, state="disabled"
+        )
+        self.export_quantized_button.pack(pady=(5, 10))
+
     def save_model(self):
         if self.fasttext_manager is None or self.fasttext_manager.model is None:
             self.status_label.configure(text="No trained model to save.", text_color="red")
@@ -33,4 +77,87 @@ class ModelExportView(ctk.CTkScrollableFrame):
                 self.fasttext_manager.save_model(file_path)
                 self.status_label.configure(text="Model saved successfully.", text_color="green")
             except Exception as e:
-                self.status_label.configure(text=f"Error: {e}", text_color="red")
\ No newline at end of file
+                self.status_label.configure(text=f"Error: {e}", text_color="red")
+
+    def preview_quantization(self):
+        if self.fasttext_manager is None or self.fasttext_manager.model is None:
+            self.status_label.configure(text="No trained model to quantize.", text_color="red")
+            return
+
+        try:
+            cutoff = int(self.cutoff_entry.get() or 0)
+            dsub = int(self.dsub_entry.get() or 2)
+        except ValueError:
+            self.status_label.configure(text="Cutoff and dsub must be whole numbers.", text_color="red")
+            return
+
+        self.export_quantized_button.configure(state="disabled")
+        self.preview_button.configure(state="disabled")
+        run_in_background(
+            self, self.fasttext_manager.quantize_preview,
+            cutoff=cutoff,
+            qnorm=self.qnorm_var.get(),
+            retrain=self.retrain_var.get(),
+            dsub=dsub,
+            qout=self.qout_var.get(),
+            title="Quantizing Model", message="Quantizing and evaluating the model...",
+            on_finished=self.show_quantization_report
+        )
+
+    def show_quantization_report(self, task):
+        self.preview_button.configure(state="normal")
+        if task.status == CANCELLED:
+            self.status_label.configure(text="Quantization cancelled.", text_color="red")
+            return
+        report = task.result if task.status == COMPLETED else None
+        if report is None:
+            self.status_label.configure(text="Quantization failed. Check logs for details.", text_color="red")
+            return
+
+        self.quantize_table.display_data(self.format_report(report))
+        self.export_quantized_button.configure(state="normal")
+        self.status_label.configure(text="Quantization preview ready.", text_color="green")
+
+    def update_export_state(self):
+        # The quantized model is dropped whenever the manager's model is
+        # replaced, so a preview of an earlier model cannot be exported.
+        state = "normal" if self.fasttext_manager.quantized_model is not None else "disabled"
+        self.export_quantized_button.configure(state=state)
+
+    def format_report(self, report):
+        original = report["Original"]
+        quantized = report["Quantized"]
+        rows = [{
+            "Metric": "Size (MB)",
+            "Original": f"{original['Size'] / 1024 / 1024:.2f}",
+            "Quantized": f"{quantized['Size'] / 1024 / 1024:.2f}",
+            "Change": f"{(quantized['Size'] / original['Size'] - 1) * 100:+.1f}%"
+        }, {
+            "Metric": "Load Time (s)",
+            "Original": f"{original['Load Time']:.3f}",
+            "Quantized": f"{quantized['Load Time']:.3f}",
+            "Change": f"{quantized['Load Time'] - original['Load Time']:+.3f}"
+        }]
+        for metric in ("Accuracy", "Recall"):
+            if metric in original:
+                rows.append({
+                    "Metric": metric,
+                    "Original": f"{original[metric]:.4f}",
+                    "Quantized": f"{quantized[metric]:.4f}",
+                    "Change": f"{quantized[metric] - original[metric]:+.4f}"
+                })
+        return rows
+
+    def save_quantized_model(self):
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".ftz",
+            filetypes=[("Quantized FastText Model", "*.ftz"), ("All Files", "*.*")],
+            title="Export Quantized Model"
+        )
+
+        if file_path:
+            try:
+                self.fasttext_manager.save_quantized_model(file_path)
+                self.status_label.configure(text="Quantized model saved successfully.", text_color="green")
+            except Exception as e:
+                self.status_label.configure(text=f"Error: {e}", text_color="red")
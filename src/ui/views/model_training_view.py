@@ -1,11 +1,12 @@
 import customtkinter as ctk
-import threading
 import time
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import matplotlib.pyplot as plt
 from modules.fasttext_manager import FastTextManager
 from ..components.universal_table import UniversalTable
 
+POLL_INTERVAL_MS = 100
+
 
 class ModelTrainingView(ctk.CTkScrollableFrame):
     def __init__(self, master, fasttext_manager=None, navigation_bar=None, **kwargs):
@@ -13,11 +14,15 @@ class ModelTrainingView(ctk.CTkScrollableFrame):
 
         self.fasttext_manager = fasttext_manager or FastTextManager()
         self.navigation_bar = navigation_bar
-        self.training_thread = None
-        self.stop_training = False
+        self.poll_id = None
+        self.job_start_time = None
+        self.curve_jobs = {}
         self.current_epoch = 0
         self.total_epochs = self.fasttext_manager.params.get("epoch", 5)
 
+        self.epoch_losses = []
+        self.loss_positions = []
+        self.accuracy_epochs = []
         self.epoch_accuracies_train = []
         self.epoch_accuracies_test = []
 
@@ -37,6 +42,14 @@ class ModelTrainingView(ctk.CTkScrollableFrame):
         self.epoch_label = ctk.CTkLabel(self, text="Epoch: 0 / 0", text_color="white", font=("Arial", 12))
         self.epoch_label.pack(pady=5)
 
+        self.retrain_per_epoch_var = ctk.BooleanVar(value=False)
+        self.retrain_per_epoch_checkbox = ctk.CTkCheckBox(
+            self,
+            text="Retrain for each epoch (slow accuracy curve)",
+            variable=self.retrain_per_epoch_var
+        )
+        self.retrain_per_epoch_checkbox.pack(pady=5)
+
         self.start_button = ctk.CTkButton(self, text="Start Training", fg_color="#4CAF50", command=self.start_training)
         self.start_button.pack(pady=10)
 
@@ -49,21 +62,11 @@ class ModelTrainingView(ctk.CTkScrollableFrame):
         self.log_textbox = ctk.CTkTextbox(self, height=200, wrap="word", font=("Arial", 12), text_color="white")
         self.log_textbox.pack(fill="both", padx=20, pady=(0, 10))
 
-        plot_label = ctk.CTkLabel(self, text="Accuracy Plots", font=("Arial", 14, "bold"), text_color="white")
+        plot_label = ctk.CTkLabel(self, text="Training Plots", font=("Arial", 14, "bold"), text_color="white")
         plot_label.pack(pady=(10, 5))
 
         self.figure, (self.ax_train, self.ax_test) = plt.subplots(1, 2, figsize=(12, 4))
-        self.ax_train.set_title("Training Accuracy by Epoch")
-        self.ax_train.set_xlabel("Epoch")
-        self.ax_train.set_ylabel("Accuracy")
-        self.ax_train.set_ylim(0, 1)
-        self.ax_train.grid(True)
-
-        self.ax_test.set_title("Test Accuracy by Epoch")
-        self.ax_test.set_xlabel("Epoch")
-        self.ax_test.set_ylabel("Accuracy")
-        self.ax_test.set_ylim(0, 1)
-        self.ax_test.grid(True)
+        self.setup_axes()
 
         self.canvas = FigureCanvasTkAgg(self.figure, self)
         self.canvas_widget = self.canvas.get_tk_widget()
@@ -86,102 +89,157 @@ class ModelTrainingView(ctk.CTkScrollableFrame):
         self.log_textbox.see("end")
 
     def start_training(self):
-        self.start_button.configure(state="disabled")
         self.stop_button.configure(state="normal")
-        self.info_label.configure(text="Training in progress...", text_color="blue")
-        self.progress_bar.set(0)
-        self.current_epoch = 0
-        self.stop_training = False
-        self.total_epochs = self.fasttext_manager.params.get("epoch", 5)
-        self.epoch_label.configure(text=f"Epoch: 0 / {self.total_epochs}")
-        self.log_textbox.delete("1.0", "end")
-        self.epoch_accuracies_train.clear()
-        self.epoch_accuracies_test.clear()
+        retrain_per_epoch = self.retrain_per_epoch_var.get()
+        total_epochs = self.fasttext_manager.params.get("epoch", 5)
+
+        if self.fasttext_manager.job_queue is None or not self.fasttext_manager.job_queue.active_jobs():
+            self.log_textbox.delete("1.0", "end")
+            self.reset_plot_data()
+
+        if retrain_per_epoch:
+            self.reset_plot_data()
+            self.total_epochs = total_epochs
+            for epoch in range(1, total_epochs + 1):
+                job = self.fasttext_manager.submit_training_job(label=f"Retrain {epoch}/{total_epochs}", epoch=epoch)
+                if job is None:
+                    self.training_failed()
+                    return
+                self.curve_jobs[job.job_id] = epoch
+        else:
+            job = self.fasttext_manager.submit_training_job(label=f"Training run ({total_epochs} epochs)")
+            if job is None:
+                self.training_failed()
+                return
 
-        self.training_thread = threading.Thread(target=self.run_training)
-        self.training_thread.start()
+        self.update_queue_label()
+        if self.poll_id is None:
+            self.poll_id = self.after(POLL_INTERVAL_MS, self.poll_events)
 
     def stop_training_button(self):
-        self.stop_training = True
+        if self.fasttext_manager.job_queue is not None:
+            self.fasttext_manager.job_queue.cancel_all()
         self.log_message("Stopping training...")
 
-    def run_training(self):
-        start_time_total = time.time()
-
-        for epoch in range(1, self.total_epochs + 1):
-            if self.stop_training:
-                self.log_message("Training stopped by user.")
-                break
-
-            start_time_epoch = time.time()
-            self.log_message(f"Starting Epoch {epoch}...")
-            success = self.fasttext_manager.train_model()
-
-            if not success:
-                self.after(0, self.training_failed)
-                return
-
-            end_time_epoch = time.time()
-            epoch_time = end_time_epoch - start_time_epoch
-            self.current_epoch = epoch
-            progress = epoch / self.total_epochs
-            self.log_message(f"Epoch {epoch} completed in {epoch_time:.2f} seconds.")
-
-            train_results = self.fasttext_manager.evaluate_model(training=True)
-            test_results = self.fasttext_manager.evaluate_model(training=False)
-
-            train_accuracy = train_results.get("Accuracy", 0)
-            test_accuracy = test_results.get("Accuracy", 0)
+    def reset_plot_data(self):
+        self.curve_jobs.clear()
+        self.clear_run_data()
 
-            self.epoch_accuracies_train.append(train_accuracy)
-            self.epoch_accuracies_test.append(test_accuracy)
-
-            self.log_message(f"Training Accuracy after Epoch {epoch}: {train_accuracy:.4f}")
-            self.log_message(f"Test Accuracy after Epoch {epoch}: {test_accuracy:.4f}")
+    def clear_run_data(self):
+        self.epoch_losses.clear()
+        self.loss_positions.clear()
+        self.accuracy_epochs.clear()
+        self.epoch_accuracies_train.clear()
+        self.epoch_accuracies_test.clear()
+        self.update_plots()
 
-            self.after(0, lambda e=epoch, p=progress, t=epoch_time: self.update_progress(e, p, t))
-            self.after(0, self.update_plots)
+    def update_queue_label(self):
+        active_jobs = self.fasttext_manager.job_queue.active_jobs()
+        if active_jobs:
+            self.info_label.configure(text=f"Training in progress... ({len(active_jobs)} job(s) in queue)", text_color="blue")
 
-        end_time_total = time.time()
-        total_training_time = end_time_total - start_time_total
+    def poll_events(self):
+        job_queue = self.fasttext_manager.job_queue
+        for event in job_queue.get_events():
+            self.handle_event(job_queue.jobs[event["job_id"]], event)
 
-        final_test_results = self.fasttext_manager.evaluate_model(training=False)
-        if self.stop_training:
-            self.log_message(f"Training stopped. Displaying results for completed epochs...")
+        if job_queue.active_jobs():
+            self.poll_id = self.after(POLL_INTERVAL_MS, self.poll_events)
         else:
-            self.log_message(f"Total training time: {total_training_time:.2f} seconds.")
-            self.log_message("Evaluation completed. Displaying results...")
-
-        self.after(0, lambda: self.show_results(final_test_results, total_training_time))
-        self.after(0, self.training_finished)
+            self.poll_id = None
+            self.training_finished()
+
+    def handle_event(self, job, event):
+        event_type = event["type"]
+        curve_epoch = self.curve_jobs.get(job.job_id)
+
+        if event_type == "queued":
+            self.log_message(f"{job.label} queued.")
+        elif event_type == "started":
+            self.job_start_time = time.time()
+            self.log_message(f"{job.label} started.")
+            if curve_epoch is None:
+                self.total_epochs = event["epochs"] or self.fasttext_manager.params.get("epoch", 5)
+                self.progress_bar.set(0)
+                self.epoch_label.configure(text=f"Epoch: 0 / {self.total_epochs}")
+                self.clear_run_data()
+        elif event_type == "log":
+            self.log_message(event["message"])
+        elif event_type == "epoch" and curve_epoch is None:
+            epoch = event["epoch"]
+            self.current_epoch = epoch
+            self.epoch_losses.append(event["loss"])
+            self.loss_positions.append(event["position"])
+            self.log_message(f"Epoch {epoch} completed - loss: {event['loss']:.4f}, "
+                             f"words/sec/thread: {event['words_per_sec']}")
+            self.update_progress(epoch, epoch / self.total_epochs, time.time() - self.job_start_time)
+            self.update_plots()
+        elif event_type == "finished":
+            self.job_finished(job, event, curve_epoch)
+            self.update_queue_label()
+
+    def job_finished(self, job, event, curve_epoch):
+        elapsed = time.time() - self.job_start_time if self.job_start_time else 0
+        if event["status"] == "cancelled":
+            self.log_message(f"{job.label}: training stopped by user.")
+            return
+        if event["status"] != "completed" or not self.fasttext_manager.load_job_model(job):
+            self.log_message(f"{job.label}: {event['message']}")
+            self.training_failed()
+            return
+
+        results = event["results"]
+        epoch = curve_epoch or self.total_epochs
+        self.record_accuracies(epoch, results.get("train"), results.get("test"))
+        self.log_message(f"{job.label} finished in {elapsed:.2f} seconds.")
+        self.update_progress(epoch, epoch / self.total_epochs, elapsed)
+        self.update_plots()
+        self.show_results(results.get("test"), elapsed)
+
+    def record_accuracies(self, epoch, train_results, test_results):
+        train_accuracy = train_results.get("Accuracy", 0) if train_results else 0
+        test_accuracy = test_results.get("Accuracy", 0) if test_results else 0
+
+        self.accuracy_epochs.append(epoch)
+        self.epoch_accuracies_train.append(train_accuracy)
+        self.epoch_accuracies_test.append(test_accuracy)
+
+        self.log_message(f"Training Accuracy after Epoch {epoch}: {train_accuracy:.4f}")
+        self.log_message(f"Test Accuracy after Epoch {epoch}: {test_accuracy:.4f}")
 
     def training_finished(self):
         self.stop_button.configure(state="disabled")
         self.start_button.configure(state="normal")
         self.info_label.configure(text="Training stopped or completed.", text_color="green")
-        self.navigation_bar.set_next_enabled(True)
+        self.navigation_bar.set_next_enabled(self.fasttext_manager.model is not None)
 
     def update_progress(self, epoch, progress, epoch_time):
         self.progress_bar.set(progress)
         self.epoch_label.configure(text=f"Epoch: {epoch} / {self.total_epochs} - Time: {epoch_time:.2f} sec")
         self.info_label.configure(text=f"Epoch {epoch} completed in {epoch_time:.2f} seconds", text_color="yellow")
 
-    def update_plots(self):
-        self.ax_train.clear()
-        self.ax_train.set_title("Training Accuracy by Epoch")
+    def setup_axes(self):
+        self.ax_train.set_title("Training Loss by Epoch")
         self.ax_train.set_xlabel("Epoch")
-        self.ax_train.set_ylabel("Accuracy")
-        self.ax_train.set_ylim(0, 1)
+        self.ax_train.set_ylabel("Loss")
         self.ax_train.grid(True)
-        self.ax_train.plot(range(1, len(self.epoch_accuracies_train) + 1), self.epoch_accuracies_train, marker="o", linestyle="-", color="b")
 
-        self.ax_test.clear()
-        self.ax_test.set_title("Test Accuracy by Epoch")
+        self.ax_test.set_title("Accuracy by Epoch")
         self.ax_test.set_xlabel("Epoch")
         self.ax_test.set_ylabel("Accuracy")
         self.ax_test.set_ylim(0, 1)
         self.ax_test.grid(True)
-        self.ax_test.plot(range(1, len(self.epoch_accuracies_test) + 1), self.epoch_accuracies_test, marker="o", linestyle="-", color="r")
+
+    def update_plots(self):
+        self.ax_train.clear()
+        self.ax_test.clear()
+        self.setup_axes()
+
+        self.ax_train.plot(self.loss_positions, self.epoch_losses, marker="o", linestyle="-", color="b")
+        self.ax_test.plot(self.accuracy_epochs, self.epoch_accuracies_train, marker="o", linestyle="-", color="b", label="Train")
+        self.ax_test.plot(self.accuracy_epochs, self.epoch_accuracies_test, marker="o", linestyle="-", color="r", label="Test")
+        if self.accuracy_epochs:
+            self.ax_test.legend()
 
         self.canvas.draw()
 
@@ -208,4 +266,3 @@ class ModelTrainingView(ctk.CTkScrollableFrame):
         self.log_message("Training failed. Check logs for details.")
         self.info_label.configure(text="Training failed. Check logs for details.", text_color="red")
         self.start_button.configure(state="normal")
-        self.stop_button.configure(state="disabled")
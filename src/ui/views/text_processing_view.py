@@ -1,6 +1,8 @@
 import customtkinter as ctk
+from tkinter import filedialog
+from modules.task_executor import COMPLETED, step_progress
 from ..components.universal_table import UniversalTable
-from ..components.progress_dialog import ProgressDialog
+from ..components.progress_dialog import run_in_background
 
 class TextProcessingView(ctk.CTkScrollableFrame):
     def __init__(self, master, data_manager=None, navigation_bar=None, **kwargs):
@@ -39,6 +41,26 @@ class TextProcessingView(ctk.CTkScrollableFrame):
         )
         self.remove_numbers_button.pack(side="left", padx=5, fill="x", expand=True)
 
+        self.pipeline_frame = ctk.CTkFrame(self, fg_color="#2B2B2B")
+        self.pipeline_frame.pack(pady=5, fill="x", expand=True)
+
+        self.pipeline_vars = {}
+        for operation, label in [
+            ("normalize_case", "Normalize Case"),
+            ("remove_special_chars", "Special Characters"),
+            ("remove_numbers", "Numbers"),
+            ("remove_excess_spaces", "Excess Spaces")
+        ]:
+            var = ctk.BooleanVar(value=False)
+            checkbox = ctk.CTkCheckBox(self.pipeline_frame, text=label, variable=var)
+            checkbox.pack(side="left", padx=5, pady=5)
+            self.pipeline_vars[operation] = var
+
+        self.run_pipeline_button = ctk.CTkButton(
+            self.pipeline_frame, text="Run Cleaning Pipeline", command=self.run_cleaning_pipeline
+        )
+        self.run_pipeline_button.pack(side="right", padx=5, pady=5)
+
         self.tokenize_button = ctk.CTkButton(self, text="Tokenize Text", command=self.tokenize_text)
         self.tokenize_button.pack(pady=5, fill="x", expand=True)
 
@@ -59,6 +81,9 @@ class TextProcessingView(ctk.CTkScrollableFrame):
         self.processed_data_table = UniversalTable(self, data_list=[], empty_message="No processed data to display")
         self.processed_data_table.pack(pady=5, fill="both", expand=True)
 
+        self.save_dataset_button = ctk.CTkButton(self, text="Save Working Dataset", command=self.save_working_dataset)
+        self.save_dataset_button.pack(pady=5, fill="x", expand=True)
+
         self.populate_column_options()
         self.display_processed_data()
 
@@ -71,58 +96,81 @@ class TextProcessingView(ctk.CTkScrollableFrame):
     def normalize_case(self):
         column = self.column_var.get()
         columns_to_process = self._get_columns_to_process(column)
-        progress_dialog = ProgressDialog(self, title="Normalizing Case", message="Normalizing text case...")
-        for col in columns_to_process:
-            self.data_manager.normalize_case(col)
-        progress_dialog.stop_progress()
-        self.display_processed_data()
+        run_in_background(
+            self, self.data_manager.apply_cleaning_pipeline, columns_to_process, ["normalize_case"],
+            title="Normalizing Case", message="Normalizing text case...",
+            on_finished=lambda task: self.display_processed_data()
+        )
 
     def remove_special_characters(self):
         column = self.column_var.get()
         columns_to_process = self._get_columns_to_process(column)
-        progress_dialog = ProgressDialog(self, title="Removing Special Characters", message="Removing special characters...")
-        for col in columns_to_process:
-            self.data_manager.remove_special_chars(col)
-        progress_dialog.stop_progress()
-        self.display_processed_data()
+        run_in_background(
+            self, self.data_manager.apply_cleaning_pipeline, columns_to_process, ["remove_special_chars"],
+            title="Removing Special Characters", message="Removing special characters...",
+            on_finished=lambda task: self.display_processed_data()
+        )
 
     def remove_numbers(self):
         column = self.column_var.get()
         columns_to_process = self._get_columns_to_process(column)
-        progress_dialog = ProgressDialog(self, title="Removing Numbers", message="Removing numbers from text...")
-        for col in columns_to_process:
-            self.data_manager.remove_numbers(col)
-        progress_dialog.stop_progress()
-        self.display_processed_data()
+        run_in_background(
+            self, self.data_manager.apply_cleaning_pipeline, columns_to_process, ["remove_numbers"],
+            title="Removing Numbers", message="Removing numbers from text...",
+            on_finished=lambda task: self.display_processed_data()
+        )
+
+    def run_cleaning_pipeline(self):
+        operations = [operation for operation, var in self.pipeline_vars.items() if var.get()]
+        if not operations:
+            return
+        columns_to_process = self._get_columns_to_process(self.column_var.get())
+        run_in_background(
+            self, self.data_manager.apply_cleaning_pipeline, columns_to_process, operations,
+            title="Cleaning Text", message="Running cleaning pipeline...",
+            on_finished=lambda task: self.display_processed_data()
+        )
 
     def tokenize_text(self):
         column = self.column_var.get()
         columns_to_process = self._get_columns_to_process(column)
-        progress_dialog = ProgressDialog(self, title="Tokenizing Text", message="Tokenizing text...")
-        for col in columns_to_process:
-            self.data_manager.tokenize(col)
-        progress_dialog.stop_progress()
+        self._run_per_column(
+            self.data_manager.tokenize, columns_to_process,
+            title="Tokenizing Text", message="Tokenizing text...", on_finished=self.tokenize_finished
+        )
 
-        self.is_tokenized = True
+    def tokenize_finished(self, task):
+        if task.status == COMPLETED:
+            self.is_tokenized = True
         self.display_processed_data()
 
     def remove_stopwords(self):
         column = self.column_var.get()
         columns_to_process = self._get_columns_to_process(column)
-        progress_dialog = ProgressDialog(self, title="Removing Stopwords", message="Removing stopwords...")
-        for col in columns_to_process:
-            self.data_manager.remove_stopwords(col)
-        progress_dialog.stop_progress()
-        self.display_processed_data()
+        self._run_per_column(
+            self.data_manager.remove_stopwords, columns_to_process,
+            title="Removing Stopwords", message="Removing stopwords..."
+        )
 
     def lemmatize_text(self):
         column = self.column_var.get()
         columns_to_process = self._get_columns_to_process(column)
-        progress_dialog = ProgressDialog(self, title="Lemmatizing Text", message="Lemmatizing text...")
-        for col in columns_to_process:
-            self.data_manager.lemmatize_column(col)
-        progress_dialog.stop_progress()
-        self.display_processed_data()
+        self._run_per_column(
+            self.data_manager.lemmatize_column, columns_to_process,
+            title="Lemmatizing Text", message="Lemmatizing text..."
+        )
+
+    def save_working_dataset(self):
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".parquet",
+            filetypes=[("Parquet Files", "*.parquet"), ("Feather Files", "*.feather"), ("All Files", "*.*")],
+            title="Save Working Dataset"
+        )
+        if file_path:
+            run_in_background(
+                self, self.data_manager.save_data, file_path,
+                title="Saving Dataset", message="Saving working dataset..."
+            )
 
     def display_processed_data(self):
         if self.data_manager.data is not None:
@@ -136,3 +184,15 @@ class TextProcessingView(ctk.CTkScrollableFrame):
             return self.data_manager.get_data().columns
         else:
             return [column]
+
+    def _run_per_column(self, operation, columns, title, message, on_finished=None):
+        columns = list(columns)
+
+        def run(progress):
+            for step, col in enumerate(columns):
+                operation(col, progress=step_progress(progress, step, len(columns)))
+
+        run_in_background(
+            self, run, title=title, message=message,
+            on_finished=on_finished or (lambda task: self.display_processed_data())
+        )